@@ -1,17 +1,52 @@
 import os
+import io
+import csv
 import json
-import zipfile
-from datetime import datetime
-from io import BytesIO
+import base64
+import binascii
+import hmac
+import math
+import re
+import time
+import uuid
+import random
+import unicodedata
+import mimetypes
+from collections import Counter
+from datetime import date, datetime, timedelta
 from functools import wraps
-from flask import Flask, render_template, request, jsonify, send_file, url_for, flash, redirect, session, abort
+import click
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+from flask import Flask, Response, current_app, g, has_request_context, render_template, request, jsonify, send_file, url_for, flash, redirect, session, abort, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
-from flask_mail import Mail, Message
+from flask_sqlalchemy.pagination import Pagination
+from flask_sqlalchemy.session import Session as FlaskSession
+from markupsafe import Markup, escape
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import IntegrityError, OperationalError
 from flask_cors import CORS
-from flask_migrate import Migrate
-from werkzeug.utils import secure_filename
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.exceptions import HTTPException
+from werkzeug.http import dump_options_header, http_date
+from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.utils import safe_join, secure_filename
 from werkzeug.security import generate_password_hash, check_password_hash
 from config import config
+import search_index
+import document_store
+import resumable_upload
+import previews
+import text_extraction
+import metrics
+import bulk_import
+import ingestion_journal
+import rate_limit
+import assets
+import page_cache
+from zip_stream import prefetch_entries, stream_zip
+from xlsx_stream import stream_xlsx
+from upload_pipeline import StreamingUpload, UploadRequest, matches_signature
 import logging
 from pathlib import Path
 
@@ -19,10 +54,24 @@ from pathlib import Path
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class RoutingSession(FlaskSession):
+    """Session qui envoie les lectures des vues @read_replica vers le moteur de lecture.
+    
+    Les écritures (flush, UPDATE/DELETE en masse) restent sur le primaire,
+    comme tout le reste du trafic.
+    """
+    
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and not getattr(clause, 'is_dml', False)
+                and has_request_context() and g.get('lecture_replica')):
+            engine = current_app.extensions.get('read_engine')
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
 # Initialisation des extensions
-db = SQLAlchemy()
-mail = Mail()
-migrate = Migrate()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # Modèle Candidature
 class Candidature(db.Model):
@@ -45,10 +94,26 @@ class Candidature(db.Model):
     # Informations supplémentaires
     competences_marketing = db.Column(db.Text)
     
+    # Texte extrait du CV et de la lettre, indexé pour la recherche (NULL: pas encore traité)
+    texte_documents = db.deferred(db.Column(db.Text))
+    
     # Métadonnées
-    date_soumission = db.Column(db.DateTime, default=datetime.utcnow)
+    date_soumission = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     statut = db.Column(db.String(50), default='Nouvelle')  # Nouvelle, En revue, Contacté, Rejeté
     notes_admin = db.Column(db.Text)
+    # Référence remise au candidat par le mode journal (INGESTION_MODE), avant l'insertion
+    reference_depot = db.Column(db.String(32), unique=True, index=True)
+    
+    # Index de la liste admin (tri date_soumission DESC, id DESC, filtre par statut)
+    __table_args__ = (
+        db.Index('ix_candidatures_statut_date_id', 'statut', 'date_soumission', 'id'),
+        db.Index('ix_candidatures_date_id', 'date_soumission', 'id'),
+    )
+    
+    @property
+    def reference(self):
+        """Référence communiquée au candidat: celle du dépôt (mode journal), sinon CAND000123"""
+        return self.reference_depot or f"CAND{self.id:06d}"
     
     def to_dict(self):
         return {
@@ -59,12 +124,265 @@ class Candidature(db.Model):
             'ville': self.ville,
             'date_soumission': self.date_soumission.isoformat() if self.date_soumission else None,
             'statut': self.statut,
+            'reference': self.reference,
             'has_cv': bool(self.cv_path),
             'has_lettre': bool(self.lettre_motivation_path),
             'has_portfolio': bool(self.portfolio_fichier_path)
         }
 
 
+# Compteurs de candidatures par statut, tenus à jour dans les transactions d'écriture.
+# Chaque statut est réparti sur plusieurs lignes (slot) pour que les inserts
+# concurrents ne se bloquent pas tous sur la même ligne.
+class CompteurStatut(db.Model):
+    __tablename__ = 'compteurs_statut'
+    
+    statut = db.Column(db.String(50), primary_key=True)
+    slot = db.Column(db.Integer, primary_key=True, default=0)
+    total = db.Column(db.Integer, nullable=False, default=0)
+
+
+# Agrégat quotidien (jour × statut × ville) lu par les statistiques
+class StatistiqueJour(db.Model):
+    __tablename__ = 'stats_quotidiennes'
+    
+    jour = db.Column(db.Date, primary_key=True)
+    statut = db.Column(db.String(50), primary_key=True)
+    ville = db.Column(db.String(100), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+
+
+# Contenus du stockage par empreinte (UPLOAD_FOLDER/documents/ab/cd/<sha256>.<ext>)
+# `total` compte les champs de candidature qui référencent le contenu.
+class Document(db.Model):
+    __tablename__ = 'documents'
+    
+    chemin = db.Column(db.String(255), primary_key=True)
+    sha256 = db.Column(db.String(64), nullable=False, index=True)
+    taille = db.Column(db.BigInteger)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    date_creation = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# Texte extrait d'un contenu, par empreinte: un même fichier n'est traité qu'une fois
+class TexteDocument(db.Model):
+    __tablename__ = 'textes_documents'
+    
+    sha256 = db.Column(db.String(64), primary_key=True)
+    statut = db.Column(db.String(20), nullable=False)  # ok, vide, non_supporte, erreur
+    texte = db.Column(db.Text)
+    date_extraction = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# File d'attente des emails sortants (drainée par `flask mail-worker`)
+class EmailQueue(db.Model):
+    __tablename__ = 'email_queue'
+
+    id = db.Column(db.Integer, primary_key=True)
+    subject = db.Column(db.String(255), nullable=False)
+    sender = db.Column(db.String(255))
+    recipients = db.Column(db.Text, nullable=False)  # Liste JSON
+    body = db.Column(db.Text)
+
+    # Livraison
+    statut = db.Column(db.String(20), default='pending', index=True)  # pending, sending, sent, dead
+    tentatives = db.Column(db.Integer, default=0, nullable=False)
+    prochaine_tentative = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    verrouille_le = db.Column(db.DateTime)
+    verrouille_par = db.Column(db.String(32))
+    derniere_erreur = db.Column(db.Text)
+
+    date_creation = db.Column(db.DateTime, default=datetime.utcnow)
+    date_envoi = db.Column(db.DateTime)
+
+    def to_message(self):
+        from flask_mail import Message
+        return Message(
+            subject=self.subject,
+            recipients=json.loads(self.recipients),
+            body=self.body,
+            sender=self.sender
+        )
+
+
+# Points de reprise de `flask candidatures-import`, validés avec chaque lot inséré
+class ImportCandidatures(db.Model):
+    __tablename__ = 'imports_candidatures'
+    
+    source = db.Column(db.String(255), primary_key=True)  # empreinte sha256 du contenu importé
+    fichier = db.Column(db.String(255), index=True)  # chemin du fichier, pour détecter une modification
+    position = db.Column(db.Integer, nullable=False, default=0)  # dernière ligne traitée
+    inserees = db.Column(db.Integer, nullable=False, default=0)
+    rejetees = db.Column(db.Integer, nullable=False, default=0)
+    termine = db.Column(db.Boolean, nullable=False, default=False)
+    date_maj = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# Statuts proposés dans l'administration
+STATUTS = ('Nouvelle', 'En revue', 'Contacté', 'Rejeté')
+
+
+# Colonnes nécessaires à to_dict (les champs Text ne sont pas chargés)
+API_COLUMNS = (
+    Candidature.id, Candidature.nom_complet, Candidature.email, Candidature.telephone,
+    Candidature.ville, Candidature.date_soumission, Candidature.statut, Candidature.reference_depot,
+    Candidature.cv_path, Candidature.lettre_motivation_path, Candidature.portfolio_fichier_path
+)
+
+
+# Colonnes de l'export CSV/XLSX de la liste admin
+EXPORT_COLUMNS = (
+    ('ID', lambda c: c.id),
+    ('Référence', lambda c: c.reference),
+    ('Nom complet', lambda c: c.nom_complet),
+    ('Email', lambda c: c.email),
+    ('Téléphone', lambda c: c.telephone),
+    ('Ville', lambda c: c.ville),
+    ('Date de soumission', lambda c: c.date_soumission.strftime('%d/%m/%Y %H:%M')),
+    ('Statut', lambda c: c.statut),
+    ('Lien portfolio', lambda c: c.portfolio_lien),
+    ('Lettre de motivation', lambda c: c.lettre_motivation_text),
+    ('Compétences', lambda c: c.competences_marketing),
+    ('Notes admin', lambda c: c.notes_admin),
+    ('CV', lambda c: 'oui' if c.cv_path else 'non'),
+    ('Lettre (fichier)', lambda c: 'oui' if c.lettre_motivation_path else 'non'),
+    ('Portfolio (fichier)', lambda c: 'oui' if c.portfolio_fichier_path else 'non'),
+)
+
+
+def reference_filter(term):
+    """Filtre exact si la recherche est une référence candidat (DEP-... ou CAND000123), sinon None"""
+    term = (term or '').strip().upper()
+    if term.startswith('DEP-'):
+        return Candidature.reference_depot == term
+    if term.startswith('CAND') and term[4:].isdigit():
+        return db.and_(Candidature.id == int(term[4:]), Candidature.reference_depot.is_(None))
+    return None
+
+
+def zip_component(nom):
+    """Nom utilisable comme un seul élément de chemin dans une archive (ni séparateur, ni '..')"""
+    nom = re.sub(r'[\x00-\x1f/\\]', '_', nom or '').strip().lstrip('.')
+    return nom or 'candidature'
+
+
+def csv_safe(value):
+    """Neutraliser les cellules interprétées comme formules par les tableurs"""
+    if isinstance(value, str) and value[:1] in ('=', '+', '-', '@', '\t', '\r'):
+        return "'" + value
+    return value
+
+
+# Pagination par curseur (keyset) sur (date_soumission, id) décroissants
+KEYSET_ORDER = (Candidature.date_soumission.desc(), Candidature.id.desc())
+KEYSET_ORDER_ASC = (Candidature.date_soumission.asc(), Candidature.id.asc())
+
+
+def encode_cursor(candidature):
+    raw = json.dumps([candidature.date_soumission.isoformat(), candidature.id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        date_iso, id_curseur = json.loads(raw)
+        return datetime.fromisoformat(date_iso), int(id_curseur)
+    except (TypeError, ValueError, binascii.Error) as e:
+        raise ValueError(f"Curseur invalide: {cursor}") from e
+
+
+def keyset_before(date_curseur, id_curseur):
+    """Lignes situées après le curseur dans l'ordre date_soumission DESC, id DESC"""
+    return db.or_(
+        Candidature.date_soumission < date_curseur,
+        db.and_(Candidature.date_soumission == date_curseur, Candidature.id < id_curseur)
+    )
+
+
+def keyset_after(date_curseur, id_curseur):
+    """Lignes situées avant le curseur dans l'ordre date_soumission DESC, id DESC"""
+    return db.or_(
+        Candidature.date_soumission > date_curseur,
+        db.and_(Candidature.date_soumission == date_curseur, Candidature.id > id_curseur)
+    )
+
+
+class KeysetPagination(Pagination):
+    """Pagination de la liste admin, compatible avec le template existant.
+    
+    Avec un curseur (after/before), la page est lue par keyset sur l'index
+    (date_soumission, id): la page 500 coûte autant que la page 1. Sans curseur,
+    ou quand la recherche trie par pertinence, on retombe sur un OFFSET.
+    Le total est fourni par l'appelant (compteur en cache) au lieu d'un COUNT(*).
+    """
+    
+    def _query_items(self):
+        query = self._query_args['query']
+        after = self._query_args.get('after')
+        before = self._query_args.get('before')
+        
+        if not self._query_args.get('keyset'):
+            after = before = None
+        
+        if before:
+            rows = query.order_by(None).filter(keyset_after(*before)).order_by(
+                *KEYSET_ORDER_ASC
+            ).limit(self.per_page + 1).all()
+            self._has_prev = len(rows) > self.per_page
+            self._has_next = True
+            if not self._has_prev:
+                self.page = 1
+            return rows[:self.per_page][::-1]
+        
+        if after:
+            query = query.filter(keyset_before(*after))
+        else:
+            query = query.offset((self.page - 1) * self.per_page)
+        
+        rows = query.limit(self.per_page + 1).all()
+        self._has_prev = bool(after) or self.page > 1
+        self._has_next = len(rows) > self.per_page
+        return rows[:self.per_page]
+    
+    def _query_count(self):
+        return self._query_args.get('total')
+    
+    @property
+    def has_prev(self):
+        return self._has_prev
+    
+    @property
+    def has_next(self):
+        return self._has_next
+    
+    @property
+    def pages(self):
+        # Le total en cache peut être en retard sur la page courante
+        return max(super().pages, self.page + 1 if self._has_next else self.page)
+    
+    @property
+    def prev_cursor(self):
+        if self._query_args.get('keyset') and self.items:
+            return encode_cursor(self.items[0])
+        return None
+    
+    @property
+    def next_cursor(self):
+        if self._query_args.get('keyset') and self.items:
+            return encode_cursor(self.items[-1])
+        return None
+
+
+def include_in_migrations(obj, name, type_, reflected, compare_to):
+    """Exclure de l'autogénération les objets gérés par search_index"""
+    if type_ == 'table' and name.startswith(search_index.FTS_TABLE):
+        return False
+    if type_ == 'column' and name == 'search_vector':
+        return False
+    return True
+
+
 # Décorateur pour protéger les routes admin
 def admin_required(f):
     @wraps(f)
@@ -75,23 +393,265 @@ def admin_required(f):
     return decorated_function
 
 
+def read_replica(f):
+    """Servir les lectures de la vue par le moteur de lecture (réplica ou pool SQLite en lecture seule).
+    
+    Juste après une écriture de l'administrateur (mark_recent_write), ses
+    lectures restent sur le primaire pour qu'il voie ses modifications.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if session.get('primaire_jusqua', 0) <= time.time():
+            g.lecture_replica = True
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def current_assets_manifest():
+    """Manifeste des bundles utilisé par les pages, ou None (sources servies séparément)"""
+    if current_app.debug and current_app.config['ASSETS_BUNDLES']:
+        # Développement: build relu à chaque page, ignoré dès qu'une source est plus récente
+        if assets.is_stale(current_app.static_folder):
+            return None
+        return assets.load_manifest(current_app.static_folder)
+    return current_app.extensions['assets_manifest']
+
+
+# Configuration affichée par les pages publiques: toute modification change la clé du cache
+PAGE_CACHE_CONFIG = ('DATE_LIMITE', 'EMAIL_CONTACT', 'EMAIL_SUPPORT', 'APPLICATION_NAME')
+
+
+def cached_page(f):
+    """Servir la page depuis le cache des pages publiques (PAGE_CACHE) aux visiteurs anonymes.
+    
+    La page ne doit dépendre que de la date du jour et de PAGE_CACHE_CONFIG.
+    Elle est rendue une fois par jour et par worker, puis servie en gzip avec
+    un ETag (304 quand le navigateur a déjà cette version). Les requêtes avec
+    une session (administrateur, messages flash) sont rendues normalement.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        cache = current_app.extensions.get('page_cache')
+        route = request.endpoint
+        if cache is None or session:
+            metrics.PAGE_CACHE.labels(route, 'bypass').inc()
+            return f(*args, **kwargs)
+        
+        # Même manifeste que asset_tags: un nouveau build donne une nouvelle clé
+        manifeste = current_assets_manifest() or {}
+        cle = (
+            route,
+            request.script_root,
+            datetime.now().date(),
+            tuple(current_app.config[nom] for nom in PAGE_CACHE_CONFIG),
+            tuple(sorted(manifeste.items())),
+        )
+        entree = cache.get(cle)
+        if entree is None:
+            response = current_app.make_response(f(*args, **kwargs))
+            # Redirection, erreur ou page qui a écrit dans la session: pas de mise en cache
+            if response.status_code != 200 or response.is_streamed or session.modified:
+                metrics.PAGE_CACHE.labels(route, 'bypass').inc()
+                return response
+            entree = page_cache.make_entry(response)
+            cache.set(cle, entree)
+            metrics.PAGE_CACHE.labels(route, 'miss').inc()
+        else:
+            metrics.PAGE_CACHE.labels(route, 'hit').inc()
+        return page_cache.respond(entree, request, current_app.config['PAGE_CACHE_MAX_AGE'])
+    return decorated_function
+
+
+def mark_recent_write():
+    """Garder les lectures de cette session sur le primaire le temps que le réplica rattrape l'écriture"""
+    delai = current_app.config['READ_AFTER_WRITE_WINDOW']
+    if delai and current_app.extensions.get('read_engine') is not None:
+        session['primaire_jusqua'] = time.time() + delai
+
+
+def create_read_engine(app):
+    """Moteur des lectures de l'administration, ou None (tout sur le primaire).
+    
+    DATABASE_READ_URL désigne un réplica. Sans réplica, une base SQLite fichier
+    passe en mode WAL et reçoit un pool de connexions en lecture seule sur le
+    même fichier: les lectures ne bloquent plus les insertions (et inversement).
+    Aucune connexion n'est ouverte ici: le mode WAL est activé à la première
+    connexion du primaire (gunicorn --preload, démarrage sans base).
+    """
+    url = app.config['SQLALCHEMY_READ_URI']
+    if url:
+        engine = create_engine(url, pool_pre_ping=True)
+    elif db.engine.dialect.name == 'sqlite' and app.config['SQLITE_READ_POOL']:
+        chemin = db.engine.url.database
+        if not chemin or chemin == ':memory:' or chemin.startswith('file:'):
+            return None
+        
+        @event.listens_for(db.engine, 'connect')
+        def enable_wal(dbapi_connection, connection_record):
+            # Persistant dans le fichier (sans effet une fois activé), pour les connexions de tous les workers
+            try:
+                dbapi_connection.execute('PRAGMA journal_mode=WAL')
+            except Exception as e:
+                # Base verrouillée par un autre processus: nouvel essai à la prochaine connexion
+                logger.warning(f"Activation du mode WAL impossible: {str(e)}")
+        
+        engine = create_engine(
+            f"sqlite:///file:{quote(os.path.abspath(chemin))}?mode=ro&uri=true",
+            connect_args={'timeout': 30}
+        )
+        
+        @event.listens_for(engine, 'connect')
+        def set_query_only(dbapi_connection, connection_record):
+            dbapi_connection.execute('PRAGMA query_only=1')
+    else:
+        return None
+    
+    metrics.instrument_engine(engine)
+    return engine
+
+
+def process_pool(max_workers):
+    """Pool de processus 'spawn': les enfants ne reçoivent pas une copie du processus (connexions, threads).
+    
+    multiprocessing n'est importé qu'au premier pool (démarrage des workers web).
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+def compile_templates(app):
+    """Compiler tous les templates (cache mémoire et cache de bytecode); retourne leur nombre.
+    
+    Avec TEMPLATES_PRECOMPILE et `gunicorn --preload`, le processus maître les
+    compile une fois et les workers en héritent à la création.
+    """
+    noms = app.jinja_env.list_templates(extensions=['html'])
+    for nom in noms:
+        app.jinja_env.get_template(nom)
+    return len(noms)
+
+
+def mail_extension(app):
+    """État Flask-Mail, initialisé au premier envoi.
+    
+    Les workers web ne font que mettre les emails en file: smtplib et
+    Flask-Mail ne sont chargés que par `flask mail-worker`.
+    """
+    if 'mail' not in app.extensions:
+        from flask_mail import Mail
+        Mail(app)
+    return app.extensions['mail']
+
+
 def create_app(config_name='default'):
     """Factory pour créer l'application Flask"""
     app = Flask(__name__)
+    app.request_class = UploadRequest
     
     # Charger la configuration
     app.config.from_object(config[config_name])
     config[config_name].init_app(app)
     
-    # Initialiser les extensions
+    if app.config['TRUSTED_PROXY_HOPS']:
+        # Derrière le proxy, remote_addr serait la même adresse pour tous les candidats
+        hops = app.config['TRUSTED_PROXY_HOPS']
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+    
+    # Initialiser les extensions (Flask-Mail: au premier envoi, voir mail_extension)
     db.init_app(app)
-    mail.init_app(app)
-    migrate.init_app(app, db)
     CORS(app)
+    if click.get_current_context(silent=True) is not None:
+        # Commandes `flask db ...`: Flask-Migrate (et alembic) ne sont chargés que par la CLI,
+        # jamais par les workers gunicorn
+        from flask_migrate import Migrate
+        Migrate(app, db, include_object=include_in_migrations)
+    
+    if app.config['JINJA_BYTECODE_CACHE_DIR']:
+        # Templates compilés partagés entre workers et redémarrages
+        os.makedirs(app.config['JINJA_BYTECODE_CACHE_DIR'], exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(app.config['JINJA_BYTECODE_CACHE_DIR'])
     
-    # Créer les tables si elles n'existent pas
     with app.app_context():
-        db.create_all()
+        if app.config['SCHEMA_AUTO_CREATE']:
+            # Créer les tables si elles n'existent pas (sinon: `flask db upgrade` uniquement)
+            db.create_all()
+            with db.engine.begin() as connection:
+                app.extensions['search_backend'] = search_index.install(connection)
+        metrics.instrument_engine(db.engine)
+        app.extensions['read_engine'] = create_read_engine(app)
+        # Aucune connexion ouverte ne doit être héritée par les workers (gunicorn --preload)
+        db.engine.dispose()
+        if app.extensions['read_engine'] is not None:
+            app.extensions['read_engine'].dispose()
+    
+    if app.config['TEMPLATES_PRECOMPILE']:
+        compile_templates(app)
+    
+    if app.config['INGESTION_MODE'] == 'journal':
+        ingestion_journal.ensure_dirs(app.config['INGESTION_JOURNAL_DIR'])
+    
+    # Styles et scripts construits par `flask assets-build` (sinon: sources servies séparément)
+    app.extensions['assets_manifest'] = assets.load_manifest(app.static_folder) if app.config['ASSETS_BUNDLES'] else None
+    
+    # Pages publiques rendues, par route et par jour (voir cached_page)
+    app.extensions['page_cache'] = page_cache.PageCache(app.config['PAGE_CACHE_MAX_ENTRIES']) if app.config['PAGE_CACHE'] else None
+    
+    # Instrumentation: durée par route (jusqu'à la fin du streaming), requêtes SQL, requêtes lentes
+    @app.before_request
+    def start_request_metrics():
+        g.metrics = metrics.RequestMetrics()
+    
+    @app.after_request
+    def record_request_metrics(response):
+        suivi = g.get('metrics')
+        if suivi is None:
+            return response
+        route = request.endpoint or 'inconnue'
+        method = request.method
+        chemin = request.full_path.rstrip('?')
+        # Pas de référence à `response` dans la fermeture (cycle retardant sa libération)
+        status = response.status_code
+        
+        def terminer():
+            duree = suivi.finish(route, method, status)
+            if duree >= app.config['SLOW_REQUEST_THRESHOLD']:
+                logger.warning(
+                    f"Requête lente: {method} {chemin} -> {status} en {duree * 1000:.0f} ms; "
+                    f"{suivi.summary()}"
+                )
+        
+        if response.direct_passthrough:
+            # Fichier transmis tel quel au serveur (wsgi.file_wrapper): sa fermeture n'est pas
+            # signalée à l'application, la durée s'arrête à la remise de la réponse
+            terminer()
+        else:
+            response.call_on_close(terminer)
+        return response
+    
+    # Variables communes aux templates admin
+    @app.context_processor
+    def inject_template_globals():
+        return {
+            'now': datetime.utcnow(),
+            'datetime': datetime,
+            'date_limite': app.config['DATE_LIMITE']
+        }
+    
+    @app.template_filter('nl2br')
+    def nl2br(value):
+        """Convertir les retours à la ligne en <br> après échappement"""
+        if not value:
+            return ''
+        return Markup('<br>\n').join(escape(value).splitlines())
+    
+    @app.template_global()
+    def asset_tags(bundle):
+        """Balises d'un bundle: fichier construit (nom haché) si disponible, sinon ses sources"""
+        manifeste = current_assets_manifest()
+        if manifeste and bundle in manifeste:
+            return assets.tags(bundle, [url_for('asset_file', filename=manifeste[bundle])])
+        return assets.tags(bundle, [url_for('static', filename=source) for source in assets.BUNDLES[bundle]])
     
     # Helper functions - CORRIGÉ
     def allowed_file(filename):
@@ -103,7 +663,7 @@ def create_app(config_name='default'):
         return extension in app.config['ALLOWED_EXTENSIONS']
     
     def save_file(file, nom_candidat, type_document):
-        """Sauvegarder un fichier uploadé"""
+        """Sauvegarder un fichier uploadé dans le stockage par empreinte; retourne son chemin"""
         if not file or not file.filename:
             logger.warning(f"Aucun fichier fourni pour {type_document}")
             return None
@@ -116,70 +676,423 @@ def create_app(config_name='default'):
             return None
         
         try:
-            # Créer un nom de fichier unique
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
-            nom_simplifie = ''.join(c for c in nom_candidat if c.isalnum() or c in (' ', '_')).strip().replace(' ', '_')
-            if not nom_simplifie:
-                nom_simplifie = 'candidat'
-            
             # Conserver l'extension originale
             extension = original_name.rsplit('.', 1)[-1].lower()
-            new_filename = f"{timestamp}_{nom_simplifie}_{type_document}.{extension}"
-            
-            # Créer le dossier si inexistant
             upload_folder = app.config['UPLOAD_FOLDER']
-            os.makedirs(upload_folder, exist_ok=True)
             
-            # Chemin complet
-            filepath = os.path.join(upload_folder, new_filename)
+            stream = file.stream
+            if not isinstance(stream, StreamingUpload):
+                # Flux reçu hors du pipeline de streaming: recopié pour être haché
+                received = StreamingUpload(upload_folder)
+                stream.seek(0)
+                for chunk in iter(lambda: stream.read(64 * 1024), b''):
+                    received.write(chunk)
+                stream = received
             
-            # Sauvegarder
-            file.save(filepath)
-            
-            # Vérifier que le fichier a été correctement sauvegardé
-            if os.path.exists(filepath):
-                file_size = os.path.getsize(filepath)
-                logger.info(f"Fichier sauvegardé avec succès: {new_filename} ({file_size} bytes)")
-                return new_filename
-            else:
-                logger.error(f"Échec de sauvegarde: {filepath} n'existe pas")
+            # Octets déjà écrits, hachés et comptés pendant la réception
+            if not matches_signature(extension, stream.head):
+                stream.close()
+                logger.error(f"Contenu non conforme à l'extension .{extension}: {original_name}")
                 return None
+            
+            chemin, nouveau = document_store.commit_upload(stream, upload_folder, extension)
+            # Écritures pendant la réception, puis fsync et renommage
+            metrics.observe_file_io('upload', stream.size, stream.io_seconds)
+            logger.info(
+                f"Fichier {type_document} de {nom_candidat} sauvegardé: {chemin} "
+                f"({stream.size} bytes{'' if nouveau else ', contenu déjà présent'})"
+            )
+            return chemin
                 
         except Exception as e:
             logger.error(f"Erreur lors de la sauvegarde du fichier {original_name}: {str(e)}", exc_info=True)
             return None
     
+    def search_backend():
+        """Index plein texte disponible ('fts5', 'postgresql' ou None)"""
+        if 'search_backend' not in app.extensions:
+            app.extensions['search_backend'] = search_index.detect_backend(db.session.connection())
+        return app.extensions['search_backend']
+    
+    def filtered_candidatures_query(statut=None, search=None):
+        """Requête triée des candidatures selon les filtres de la liste admin.
+        
+        Avec une recherche, les résultats sont classés par pertinence puis par date.
+        """
+        query = Candidature.query
+        
+        if statut and statut != 'all':
+            query = query.filter_by(statut=statut)
+        
+        rank = None
+        reference = reference_filter(search)
+        if reference is not None:
+            # Référence citée par le candidat: pas de recherche plein texte
+            query = query.filter(reference)
+        elif search:
+            query, rank = search_index.apply_search(query, Candidature, search, search_backend())
+        
+        if rank is not None:
+            return query.order_by(rank, *KEYSET_ORDER)
+        return query.order_by(*KEYSET_ORDER)
+    
+    def cached_count(statut, search, query):
+        """Total de la liste (compteurs, ou COUNT mis en cache LIST_COUNT_CACHE_TTL secondes)"""
+        cache = app.extensions.setdefault('list_count_cache', {})
+        key = (statut or 'all', search or '')
+        now = time.monotonic()
+        
+        # Sans recherche, les compteurs par statut donnent le total sans COUNT(*)
+        if not search:
+            counts = status_counts()
+            return sum(counts.values()) if key[0] == 'all' else counts.get(statut, 0)
+        
+        entry = cache.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+        
+        total = query.order_by(None).count()
+        if len(cache) >= 256:
+            cache.clear()
+        cache[key] = (now + app.config['LIST_COUNT_CACHE_TTL'], total)
+        return total
+    
+    def selected_ids():
+        """IDs explicitement sélectionnés (ids=1&ids=2 ou ids=1,2)"""
+        ids = []
+        for value in request.values.getlist('ids'):
+            for part in value.split(','):
+                part = part.strip()
+                if part.isdigit():
+                    ids.append(int(part))
+        return ids
+    
+    def candidature_zip_entries(candidature, dossier=''):
+        """Lister les entrées (nom, source) de l'archive d'une candidature"""
+        entries = []
+        nom = zip_component(candidature.nom_complet)
+        documents = [
+            ('cv', candidature.cv_path),
+            ('lettre_motivation', candidature.lettre_motivation_path),
+            ('portfolio', candidature.portfolio_fichier_path)
+        ]
+        
+        for doc_type, path in documents:
+            if path:
+                file_path = document_store.resolve(app.config['UPLOAD_FOLDER'], path)
+                if file_path and os.path.exists(file_path):
+                    extension = path.split('.')[-1] if '.' in path else ''
+                    filename_in_zip = f"{nom}_{doc_type}.{extension}" if extension else f"{nom}_{doc_type}"
+                    entries.append((dossier + filename_in_zip, file_path))
+        
+        # Ajouter un fichier texte avec les informations
+        info_content = f"""
+            Candidature: {candidature.nom_complet}
+            Email: {candidature.email}
+            Téléphone: {candidature.telephone}
+            Ville: {candidature.ville}
+            Date de soumission: {candidature.date_soumission}
+            Statut: {candidature.statut}
+            
+            Lettre de motivation:
+            {candidature.lettre_motivation_text}
+            
+            Compétences:
+            {candidature.competences_marketing}
+            
+            Portfolio (lien): {candidature.portfolio_lien}
+            """
+        entries.append((f"{dossier}{nom}_informations.txt", info_content.encode('utf-8')))
+        
+        return entries
+    
+    def save_files(uploads, nom_candidat):
+        """Sauvegarder plusieurs documents en parallèle; {type_document: nom ou None}"""
+        if len(uploads) <= 1:
+            return {doc: save_file(file, nom_candidat, doc) for doc, file in uploads.items()}
+        
+        with ThreadPoolExecutor(max_workers=len(uploads)) as executor:
+            futures = {doc: executor.submit(save_file, file, nom_candidat, doc) for doc, file in uploads.items()}
+            return {doc: future.result() for doc, future in futures.items()}
+    
+    def preview_pool():
+        """Pool de processus des aperçus, créé au premier usage"""
+        if 'preview_pool' not in app.extensions:
+            app.extensions['preview_pool'] = process_pool(app.config['PREVIEW_WORKERS'])
+        return app.extensions['preview_pool']
+    
+    def schedule_previews(chemins):
+        """Générer en arrière-plan les aperçus manquants des documents"""
+        if not app.config['PREVIEW_WORKERS']:
+            return
+        upload_folder = app.config['UPLOAD_FOLDER']
+        for chemin in chemins:
+            if not previews.can_preview(chemin) or previews.has_previews(upload_folder, chemin):
+                continue
+            try:
+                future = preview_pool().submit(previews.render_previews, upload_folder, chemin)
+            except Exception as e:
+                # Pool cassé (processus tué): recréé à la prochaine soumission
+                logger.error(f"Aperçu de {chemin} non planifié: {str(e)}")
+                app.extensions.pop('preview_pool', None)
+                return
+            future.add_done_callback(
+                lambda f, chemin=chemin: f.exception() and logger.error(f"Aperçu de {chemin} impossible: {f.exception()}")
+            )
+    
+    def tus_response(status=204, **headers):
+        """Réponse du protocole tus (en-têtes Upload-*)"""
+        response = Response(status=status)
+        response.headers['Tus-Resumable'] = resumable_upload.TUS_VERSION
+        response.headers['Cache-Control'] = 'no-store'
+        for name, value in headers.items():
+            response.headers[name.replace('_', '-')] = str(value)
+        return response
+    
+    def expire_uploads_if_due():
+        """Purger les envois abandonnés, au plus une fois par UPLOAD_EXPIRE_INTERVAL"""
+        now = time.monotonic()
+        if now < app.extensions.get('uploads_expire_at', 0):
+            return
+        app.extensions['uploads_expire_at'] = now + app.config['UPLOAD_EXPIRE_INTERVAL']
+        count = resumable_upload.expire_uploads(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_EXPIRATION'])
+        if count:
+            logger.info(f"{count} envoi(s) par morceaux expiré(s)")
+    
+    def ingestion_backlog():
+        """(entrées du journal en attente, âge de la plus ancienne), relu au plus une fois par seconde"""
+        now = time.monotonic()
+        cached = app.extensions.get('ingestion_backlog')
+        if cached is None or cached[0] <= now:
+            cached = (now + 1, ingestion_journal.backlog(app.config['INGESTION_JOURNAL_DIR']))
+            app.extensions['ingestion_backlog'] = cached
+        return cached[1]
+    
+    def submission_refused():
+        """Réponse 429 (limite par IP) ou 503 (journal saturé) si la soumission est refusée, sinon None"""
+        burst = app.config['SUBMISSION_RATE_BURST']
+        if burst > 0:
+            state_dir = os.path.join(app.config['INGESTION_JOURNAL_DIR'], 'limites')
+            par_seconde = app.config['SUBMISSION_RATE_PER_MINUTE'] / 60
+            now = time.monotonic()
+            if now >= app.extensions.get('rate_limits_purge_at', 0):
+                # Seaux inchangés depuis un remplissage complet: équivalents à un seau neuf
+                app.extensions['rate_limits_purge_at'] = now + max(60, burst / par_seconde)
+                rate_limit.purge(state_dir, burst / par_seconde)
+            delai = rate_limit.take_token(state_dir, request.remote_addr or '', burst, par_seconde)
+            if delai:
+                metrics.SUBMISSIONS.labels('limite_ip').inc()
+                response = jsonify({
+                    'success': False,
+                    'error': 'Trop de soumissions depuis votre connexion. Veuillez réessayer dans quelques minutes.'
+                })
+                response.status_code = 429
+                response.headers['Retry-After'] = str(math.ceil(delai))
+                return response
+        
+        if app.config['INGESTION_MODE'] == 'journal' and ingestion_backlog()[0] >= app.config['INGESTION_MAX_BACKLOG']:
+            metrics.SUBMISSIONS.labels('journal_plein').inc()
+            response = jsonify({
+                'success': False,
+                'error': 'Le service reçoit beaucoup de candidatures. Veuillez réessayer dans quelques instants.'
+            })
+            response.status_code = 503
+            response.headers['Retry-After'] = '30'
+            return response
+        return None
+    
+    def submission_message(titre, file_status):
+        message = titre
+        if file_status:
+            message += "\nFichiers uploadés:\n"
+            for doc, status in file_status.items():
+                message += f"- {status}\n"
+        return message
+    
+    def spool_candidature(candidature, chunked, file_status):
+        """Mode journal: écrire la candidature dans le journal et répondre sans attendre l'insertion"""
+        reference = ingestion_journal.new_reference()
+        entree = {colonne: getattr(candidature, colonne) for colonne in JOURNAL_COLUMNS}
+        entree.update(reference=reference, date_soumission=datetime.utcnow().isoformat())
+        ingestion_journal.spool(app.config['INGESTION_JOURNAL_DIR'], entree)
+        metrics.SUBMISSIONS.labels('journal').inc()
+        
+        # Documents déjà dans le stockage par empreinte: les envois par morceaux sont terminés
+        for upload in chunked.values():
+            resumable_upload.delete_upload(app.config['UPLOAD_FOLDER'], upload['id'])
+        
+        logger.info(f"Candidature {reference} journalisée")
+        schedule_previews(candidature_documents(candidature))
+        
+        return jsonify({
+            'success': True,
+            'message': submission_message(f'Candidature reçue ! Référence: {reference}', file_status),
+            'reference': reference,
+            'id': None,
+            'nom': candidature.nom_complet,
+            'file_status': file_status
+        }), 202
+    
+    # Envois par morceaux reprenables (protocole tus 1.0)
+    @app.route('/api/uploads', methods=['OPTIONS', 'POST'])
+    def create_chunked_upload():
+        """Créer un envoi: Upload-Length et Upload-Metadata (filename)"""
+        if request.method == 'OPTIONS':
+            return tus_response(
+                Tus_Version=resumable_upload.TUS_VERSION,
+                Tus_Extension=resumable_upload.TUS_EXTENSIONS,
+                Tus_Max_Size=app.config['MAX_CONTENT_LENGTH']
+            )
+        
+        if datetime.now().date() > app.config['DATE_LIMITE']:
+            return jsonify({'success': False, 'error': 'La période de candidature est terminée.'}), 400
+        
+        expire_uploads_if_due()
+        try:
+            length = int(request.headers.get('Upload-Length', ''))
+            metadata = resumable_upload.parse_metadata(request.headers.get('Upload-Metadata'))
+        except ValueError:
+            return jsonify({'success': False, 'error': 'Upload-Length invalide'}), 400
+        except resumable_upload.UploadError as e:
+            return jsonify({'success': False, 'error': str(e)}), e.status
+        
+        if length < 0 or length > app.config['MAX_CONTENT_LENGTH']:
+            return jsonify({'success': False, 'error': 'Fichier trop volumineux'}), 413
+        
+        filename = secure_filename(metadata.get('filename', ''))
+        if not allowed_file(filename):
+            return jsonify({'success': False, 'error': f"Extension non autorisée: {metadata.get('filename', '')}"}), 415
+        
+        upload_id = resumable_upload.create_upload(
+            app.config['UPLOAD_FOLDER'], length, filename, filename.rsplit('.', 1)[-1].lower()
+        )
+        return tus_response(
+            201,
+            Location=url_for('chunked_upload', upload_id=upload_id),
+            Upload_Offset=0,
+            Upload_Expires=http_date(time.time() + app.config['UPLOAD_EXPIRATION'])
+        )
+    
+    @app.route('/api/uploads/<upload_id>', methods=['HEAD', 'PATCH', 'DELETE'])
+    def chunked_upload(upload_id):
+        """Offset courant (HEAD), ajout d'un morceau (PATCH), abandon (DELETE)"""
+        upload_folder = app.config['UPLOAD_FOLDER']
+        
+        if request.method == 'DELETE':
+            if not resumable_upload.delete_upload(upload_folder, upload_id):
+                abort(404)
+            return tus_response()
+        
+        if request.method == 'HEAD':
+            upload = resumable_upload.load_upload(upload_folder, upload_id)
+            if upload is None:
+                abort(404)
+            return tus_response(
+                200,
+                Upload_Offset=upload['offset'],
+                Upload_Length=upload['length'],
+                Upload_Expires=http_date(upload['activite'] + app.config['UPLOAD_EXPIRATION'])
+            )
+        
+        if request.mimetype != 'application/offset+octet-stream':
+            return jsonify({'success': False, 'error': 'Content-Type attendu: application/offset+octet-stream'}), 415
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+            upload = resumable_upload.append_chunk(upload_folder, upload_id, offset, request.stream)
+        except ValueError:
+            return jsonify({'success': False, 'error': 'Upload-Offset invalide'}), 400
+        except resumable_upload.UploadError as e:
+            return jsonify({'success': False, 'error': str(e)}), e.status
+        
+        if upload.get('chemin'):
+            logger.info(f"Envoi {upload_id} terminé: {upload['chemin']} ({upload['taille']} bytes)")
+        return tus_response(
+            Upload_Offset=upload['offset'],
+            Upload_Expires=http_date(time.time() + app.config['UPLOAD_EXPIRATION'])
+        )
+    
+    def send_document(stored, full_path, download_name=None):
+        """Envoyer un document: Range, ETag fort, requêtes conditionnelles et cache privé.
+        
+        Avec X_ACCEL_REDIRECT_PREFIX (nginx) ou USE_X_SENDFILE (Apache, lighttpd),
+        le proxy lit le fichier: l'application ne fait que vérifier l'accès.
+        """
+        mimetype = mimetypes.guess_type(download_name or full_path)[0] or 'application/octet-stream'
+        stat = os.stat(full_path)
+        # Contenu du stockage par empreinte: l'empreinte est l'ETag (et le contenu ne change jamais)
+        immuable = document_store.is_stored(stored)
+        etag = stored.rsplit('/', 1)[-1].split('.', 1)[0] if immuable else f"{int(stat.st_mtime)}-{stat.st_size}"
+        
+        accel_prefix = app.config['X_ACCEL_REDIRECT_PREFIX']
+        if accel_prefix:
+            response = Response(mimetype=mimetype)
+            response.set_etag(etag)
+            response.last_modified = int(stat.st_mtime)
+            if download_name:
+                response.headers['Content-Disposition'] = attachment_disposition(download_name)
+            # Les plages (Range) sont servies par le proxy
+            response.make_conditional(request)
+            if response.status_code != 304:
+                response.headers['X-Accel-Redirect'] = accel_prefix.rstrip('/') + '/' + quote(stored)
+        else:
+            response = send_file(
+                full_path,
+                mimetype=mimetype,
+                as_attachment=bool(download_name),
+                download_name=download_name,
+                etag=etag,
+                conditional=True,
+                max_age=None
+            )
+            if response.status_code in (200, 206):
+                # Octets envoyés (plage comprise); la copie elle-même est faite par le serveur (sendfile)
+                metrics.observe_file_io('download', response.content_length or 0)
+        
+        response.cache_control.no_cache = None
+        response.cache_control.private = True
+        response.cache_control.max_age = app.config['DOCUMENT_CACHE_MAX_AGE']
+        if immuable:
+            response.cache_control.immutable = True
+        return response
+    
+    # Styles et scripts construits (noms hachés, précompressés)
+    @app.route('/assets/<path:filename>')
+    def asset_file(filename):
+        """Fichier construit par `flask assets-build`: précompressé et en cache immuable.
+        
+        Le nom contient l'empreinte du contenu: une nouvelle version a un
+        nouveau nom, le navigateur et les proxies gardent l'ancienne un an
+        sans la revalider.
+        """
+        chemin = safe_join(os.path.join(app.static_folder, assets.DIST_DIR), filename)
+        if chemin is None or filename == assets.MANIFEST or not os.path.isfile(chemin):
+            abort(404)
+        encodage, fichier = assets.negotiate(chemin, request.accept_encodings)
+        response = send_file(fichier, mimetype=mimetypes.guess_type(chemin)[0], conditional=True,
+                             max_age=app.config['ASSETS_MAX_AGE'])
+        if encodage:
+            response.content_encoding = encodage
+        response.vary.add('Accept-Encoding')
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+    
     # Route pour afficher les fichiers uploadés - NOUVELLE ROUTE
-    @app.route('/uploads/<filename>')
+    @app.route('/uploads/<path:filename>')
+    @admin_required
     def uploaded_file(filename):
-        """Afficher un fichier uploadé"""
+        """Afficher un fichier uploadé (administration: les chemins du stockage désignent des documents de candidats)"""
         try:
-            # Sécuriser le nom du fichier
-            filename = secure_filename(filename)
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+            # Chemin du stockage (documents/ab/cd/<sha256>.<ext>) ou ancien nom à plat
+            filepath = document_store.resolve(app.config['UPLOAD_FOLDER'], filename)
             
-            if not os.path.exists(filepath):
+            if not filepath or not os.path.isfile(filepath):
                 abort(404)
             
-            # Déterminer le type MIME
-            mime_type = 'application/octet-stream'
-            if filename.endswith('.pdf'):
-                mime_type = 'application/pdf'
-            elif filename.endswith('.doc'):
-                mime_type = 'application/msword'
-            elif filename.endswith('.docx'):
-                mime_type = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-            elif filename.endswith('.txt'):
-                mime_type = 'text/plain'
-            elif filename.endswith('.jpg') or filename.endswith('.jpeg'):
-                mime_type = 'image/jpeg'
-            elif filename.endswith('.png'):
-                mime_type = 'image/png'
-            elif filename.endswith('.gif'):
-                mime_type = 'image/gif'
-            
-            return send_file(filepath, mimetype=mime_type)
+            return send_document(filename, filepath)
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Erreur lors de l'affichage du fichier {filename}: {str(e)}")
             abort(404)
@@ -222,13 +1135,15 @@ def create_app(config_name='default'):
     # Routes admin protégées
     @app.route('/admin')
     @admin_required
+    @read_replica
     def admin_dashboard():
         """Tableau de bord admin"""
+        counts = status_counts()
         stats = {
-            'total': Candidature.query.count(),
-            'nouvelles': Candidature.query.filter_by(statut='Nouvelle').count(),
-            'en_revue': Candidature.query.filter_by(statut='En revue').count(),
-            'contactees': Candidature.query.filter_by(statut='Contacté').count()
+            'total': sum(counts.values()),
+            'nouvelles': counts.get('Nouvelle', 0),
+            'en_revue': counts.get('En revue', 0),
+            'contactees': counts.get('Contacté', 0)
         }
         
         # Dernières candidatures
@@ -243,6 +1158,7 @@ def create_app(config_name='default'):
     
     @app.route('/admin/candidatures')
     @admin_required
+    @read_replica
     def liste_candidatures():
         """Liste de toutes les candidatures"""
         page = request.args.get('page', 1, type=int)
@@ -252,28 +1168,32 @@ def create_app(config_name='default'):
         statut = request.args.get('statut')
         search = request.args.get('search')
         
-        query = Candidature.query
+        query = filtered_candidatures_query(statut, search)
         
-        if statut and statut != 'all':
-            query = query.filter_by(statut=statut)
-        
-        if search:
-            query = query.filter(
-                db.or_(
-                    Candidature.nom_complet.ilike(f'%{search}%'),
-                    Candidature.email.ilike(f'%{search}%'),
-                    Candidature.ville.ilike(f'%{search}%')
-                )
-            )
+        # Curseurs des liens précédent/suivant (inutilisables avec le tri par pertinence)
+        keyset = not search_index.tokenize(search)
+        try:
+            after = decode_cursor(request.args['after']) if request.args.get('after') else None
+            before = decode_cursor(request.args['before']) if request.args.get('before') else None
+        except ValueError:
+            after = before = None
         
-        candidatures = query.order_by(
-            Candidature.date_soumission.desc()
-        ).paginate(page=page, per_page=per_page, error_out=False)
+        candidatures = KeysetPagination(
+            page=page,
+            per_page=per_page,
+            error_out=False,
+            query=query,
+            keyset=keyset,
+            after=after,
+            before=before,
+            total=cached_count(statut, search, query)
+        )
         
         return render_template('admin/candidatures.html', 
                              candidatures=candidatures,
                              current_statut=statut,
-                             search=search)
+                             search=search,
+                             statuts=STATUTS)
     
     @app.route('/admin/candidature/<int:id>', methods=['GET', 'POST'])
     @admin_required
@@ -283,15 +1203,28 @@ def create_app(config_name='default'):
         
         if request.method == 'POST':
             # Mettre à jour le statut et les notes
+            ancien_statut = candidature.statut
             candidature.statut = request.form.get('statut', candidature.statut)
             candidature.notes_admin = request.form.get('notes_admin', candidature.notes_admin)
+            record_status_change(candidature, ancien_statut)
             
             db.session.commit()
+            mark_recent_write()
             flash('Candidature mise à jour avec succès!', 'success')
             return redirect(url_for('voir_candidature', id=id))
         
+        # Aperçus déjà générés (sinon, seul le lien de téléchargement est proposé)
+        apercus = {
+            document: previews.can_preview(chemin) and previews.has_previews(app.config['UPLOAD_FOLDER'], chemin)
+            for document, chemin in (
+                ('cv', candidature.cv_path),
+                ('lettre_motivation', candidature.lettre_motivation_path),
+                ('portfolio', candidature.portfolio_fichier_path)
+            )
+        }
+        
         return render_template('admin/candidature_detail.html', 
-                             candidature=candidature)
+                             candidature=candidature, apercus=apercus)
     
     @app.route('/admin/download/<int:id>/<string:document>')
     @admin_required
@@ -308,111 +1241,292 @@ def create_app(config_name='default'):
         if document in file_info:
             file_path, base_name = file_info[document]
             if file_path:
-                full_path = os.path.join(app.config['UPLOAD_FOLDER'], file_path)
-                if os.path.exists(full_path):
+                full_path = document_store.resolve(app.config['UPLOAD_FOLDER'], file_path)
+                if full_path and os.path.exists(full_path):
                     extension = file_path.split('.')[-1] if '.' in file_path else ''
                     download_name = f"{base_name}.{extension}" if extension else base_name
-                    return send_file(
-                        full_path,
-                        as_attachment=True,
-                        download_name=download_name
-                    )
+                    return send_document(file_path, full_path, download_name)
+        
+        flash('Document non trouvé', 'error')
+        return redirect(url_for('voir_candidature', id=id))
+    
+    @app.route('/admin/preview/<int:id>/<string:document>/<string:taille>')
+    @admin_required
+    def preview_document(id, document, taille):
+        """Aperçu WebP d'un document (taille 'preview' ou 'thumb')"""
+        candidature = Candidature.query.get_or_404(id)
+        chemin = {
+            'cv': candidature.cv_path,
+            'lettre_motivation': candidature.lettre_motivation_path,
+            'portfolio': candidature.portfolio_fichier_path
+        }.get(document)
+        
+        if taille not in previews.SIZES or not previews.can_preview(chemin):
+            abort(404)
+        full_path = previews.preview_path(app.config['UPLOAD_FOLDER'], chemin, taille)
+        if not os.path.exists(full_path):
+            abort(404)
+        return send_document(os.path.relpath(full_path, app.config['UPLOAD_FOLDER']).replace(os.sep, '/'), full_path)
+    
+    @app.route('/admin/download-all/<int:id>')
+    @admin_required
+    def download_all_documents(id):
+        """Télécharger tous les documents d'une candidature en ZIP (streamé)"""
+        candidature = Candidature.query.get_or_404(id)
+        
+        # Les entrées sont résolues avant le streaming: le générateur ne touche plus à la base
+        entries = candidature_zip_entries(candidature)
+        download_name = f"Candidature_{candidature.nom_complet}_{id}.zip"
+        
+        def generate():
+            debut = time.perf_counter()
+            premier_octet = None
+            total = 0
+            for chunk in stream_zip(entries):
+                if premier_octet is None:
+                    premier_octet = time.perf_counter() - debut
+                total += len(chunk)
+                yield chunk
+            metrics.observe_file_io('zip', total, time.perf_counter() - debut)
+            logger.info(
+                f"ZIP candidature {id}: {total} octets, premier octet en {premier_octet * 1000:.1f} ms, "
+                f"total {(time.perf_counter() - debut) * 1000:.1f} ms"
+            )
+        
+        response = Response(generate(), mimetype='application/zip')
+        response.headers['Content-Disposition'] = attachment_disposition(download_name)
+        return response
+    
+    @app.route('/admin/export-zip', methods=['GET', 'POST'])
+    @admin_required
+    @read_replica
+    def export_candidatures_zip():
+        """Exporter plusieurs candidatures dans une seule archive streamée"""
+        ids = selected_ids()
+        if ids:
+            query = Candidature.query.filter(Candidature.id.in_(ids)).order_by(*KEYSET_ORDER)
+        else:
+            query = filtered_candidatures_query(request.values.get('statut'), request.values.get('search'))
+        batch_size = app.config['EXPORT_BATCH_SIZE']
+        
+        def entries():
+            # Lecture de la base par lots: jamais toute la sélection en mémoire
+            for candidature in query.yield_per(batch_size):
+                dossier = f"CAND{candidature.id:06d}_{zip_component(candidature.nom_complet)}/"
+                yield from candidature_zip_entries(candidature, dossier)
+        
+        def generate():
+            debut = time.perf_counter()
+            total = 0
+            prefetched = prefetch_entries(
+                entries(),
+                workers=app.config['EXPORT_PREFETCH_WORKERS'],
+                window=app.config['EXPORT_PREFETCH_WINDOW']
+            )
+            for chunk in stream_zip(prefetched):
+                total += len(chunk)
+                yield chunk
+            metrics.observe_file_io('zip', total, time.perf_counter() - debut)
+            logger.info(f"Export ZIP groupé: {total} octets en {(time.perf_counter() - debut) * 1000:.1f} ms")
+        
+        download_name = f"Candidatures_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        response = Response(stream_with_context(generate()), mimetype='application/zip')
+        response.headers['Content-Disposition'] = attachment_disposition(download_name)
+        return response
+    
+    @app.route('/admin/export')
+    @admin_required
+    @read_replica
+    def export_candidatures():
+        """Exporter les candidatures filtrées en CSV ou XLSX, ligne par ligne"""
+        format_export = request.args.get('format', 'csv')
+        if format_export not in ('csv', 'xlsx'):
+            abort(400)
+        
+        ids = selected_ids()
+        if ids:
+            query = Candidature.query.filter(Candidature.id.in_(ids)).order_by(*KEYSET_ORDER)
+        else:
+            query = filtered_candidatures_query(request.args.get('statut'), request.args.get('search'))
+        
+        batch_size = app.config['API_STREAM_BATCH_SIZE']
+        
+        def rows():
+            yield [titre for titre, _ in EXPORT_COLUMNS]
+            for candidature in query.yield_per(batch_size):
+                yield [valeur(candidature) for _, valeur in EXPORT_COLUMNS]
+        
+        def generate_csv():
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            # BOM: Excel reconnaît alors l'UTF-8 (accents)
+            buffer.write('\ufeff')
+            for row in rows():
+                writer.writerow([csv_safe(value) for value in row])
+                if buffer.tell() >= 64 * 1024:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            yield buffer.getvalue()
+        
+        download_name = f"candidatures_scms_{datetime.now().strftime('%Y-%m-%d')}.{format_export}"
+        if format_export == 'xlsx':
+            response = Response(
+                stream_with_context(stream_xlsx(rows(), sheet_name='Candidatures')),
+                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            )
+        else:
+            response = Response(stream_with_context(generate_csv()), mimetype='text/csv')
+        response.headers['Content-Disposition'] = attachment_disposition(download_name)
+        return response
+    
+    @app.route('/admin/api/candidatures')
+    @admin_required
+    @read_replica
+    def api_candidatures():
+        """API paginée par curseur (keyset sur date_soumission, id).
+        
+        ?limit=50&cursor=<next_cursor> pour paginer, ?format=ndjson pour un export complet streamé.
+        """
+        query = Candidature.query.options(db.load_only(*API_COLUMNS))
+        
+        if request.args.get('format') == 'ndjson':
+            query = query.order_by(*KEYSET_ORDER)
+            
+            def generate():
+                # Lots côté serveur: mémoire constante même avec 100k+ lignes
+                for candidature in query.yield_per(app.config['API_STREAM_BATCH_SIZE']):
+                    yield json.dumps(candidature.to_dict(), ensure_ascii=False) + '\n'
+            
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
+        limit = request.args.get('limit', app.config['API_PAGE_SIZE'], type=int)
+        limit = max(1, min(limit, app.config['API_MAX_PAGE_SIZE']))
+        
+        cursor = request.args.get('cursor')
+        if cursor:
+            try:
+                date_curseur, id_curseur = decode_cursor(cursor)
+            except ValueError:
+                return jsonify({'success': False, 'error': 'Curseur invalide'}), 400
+            query = query.filter(keyset_before(date_curseur, id_curseur))
         
-        flash('Document non trouvé', 'error')
-        return redirect(url_for('voir_candidature', id=id))
+        # Une ligne de plus pour savoir s'il existe une page suivante
+        rows = query.order_by(*KEYSET_ORDER).limit(limit + 1).all()
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1])
+        
+        return jsonify({
+            'candidatures': [c.to_dict() for c in rows],
+            'next_cursor': next_cursor,
+            'limit': limit
+        })
     
-    @app.route('/admin/download-all/<int:id>')
+    @app.route('/admin/api/candidatures/bulk', methods=['POST'])
     @admin_required
-    def download_all_documents(id):
-        """Télécharger tous les documents d'une candidature en ZIP"""
-        candidature = Candidature.query.get_or_404(id)
+    def bulk_update_api():
+        """Changer le statut et/ou ajouter une note sur une sélection ou sur le filtre courant.
         
-        # Créer un fichier ZIP en mémoire
-        memory_file = BytesIO()
+        Corps JSON: {"ids": [...]} ou {"filtre": {"statut": ..., "search": ...}},
+        avec "statut" et/ou "note".
+        """
+        data = request.get_json(silent=True) or {}
+        statut = (data.get('statut') or '').strip() or None
+        note = (data.get('note') or '').strip() or None
         
-        with zipfile.ZipFile(memory_file, 'w', zipfile.ZIP_DEFLATED) as zf:
-            documents = [
-                ('cv', candidature.cv_path),
-                ('lettre_motivation', candidature.lettre_motivation_path),
-                ('portfolio', candidature.portfolio_fichier_path)
+        if statut and statut not in STATUTS:
+            return jsonify({'success': False, 'error': f'Statut inconnu: {statut}'}), 400
+        if not statut and not note:
+            return jsonify({'success': False, 'error': 'Indiquez un statut ou une note'}), 400
+        
+        if 'filtre' in data:
+            filtre = data.get('filtre') or {}
+            ids = [
+                id for id, in filtered_candidatures_query(filtre.get('statut'), filtre.get('search'))
+                .with_entities(Candidature.id).order_by(None).order_by(Candidature.id)
             ]
-            
-            for doc_type, path in documents:
-                if path:
-                    file_path = os.path.join(app.config['UPLOAD_FOLDER'], path)
-                    if os.path.exists(file_path):
-                        extension = path.split('.')[-1] if '.' in path else ''
-                        filename_in_zip = f"{candidature.nom_complet}_{doc_type}.{extension}" if extension else f"{candidature.nom_complet}_{doc_type}"
-                        zf.write(file_path, filename_in_zip)
-            
-            # Ajouter un fichier texte avec les informations
-            info_content = f"""
-            Candidature: {candidature.nom_complet}
-            Email: {candidature.email}
-            Téléphone: {candidature.telephone}
-            Ville: {candidature.ville}
-            Date de soumission: {candidature.date_soumission}
-            Statut: {candidature.statut}
-            
-            Lettre de motivation:
-            {candidature.lettre_motivation_text}
-            
-            Compétences:
-            {candidature.competences_marketing}
-            
-            Portfolio (lien): {candidature.portfolio_lien}
-            """
-            
-            zf.writestr(f"{candidature.nom_complet}_informations.txt", info_content)
+        else:
+            try:
+                ids = sorted({int(id) for id in data.get('ids') or []})
+            except (TypeError, ValueError):
+                return jsonify({'success': False, 'error': 'Identifiants invalides'}), 400
         
-        memory_file.seek(0)
+        if not ids:
+            return jsonify({'success': False, 'error': 'Aucune candidature sélectionnée'}), 400
         
-        return send_file(
-            memory_file,
-            download_name=f"Candidature_{candidature.nom_complet}_{id}.zip",
-            as_attachment=True,
-            mimetype='application/zip'
+        debut = time.perf_counter()
+        updated = bulk_update_candidatures(ids, statut, note, app.config['BULK_UPDATE_CHUNK_SIZE'])
+        mark_recent_write()
+        logger.info(
+            f"Mise à jour groupée: {updated} candidature(s) (statut={statut!r}, note={'oui' if note else 'non'}) "
+            f"en {(time.perf_counter() - debut) * 1000:.1f} ms"
         )
-    
-    @app.route('/admin/api/candidatures')
-    @admin_required
-    def api_candidatures():
-        """API pour récupérer les candidatures (pour dashboard)"""
-        candidatures = Candidature.query.order_by(Candidature.date_soumission.desc()).all()
-        return jsonify([c.to_dict() for c in candidatures])
+        return jsonify({'success': True, 'updated': updated})
     
     @app.route('/admin/statistiques')
     @admin_required
+    @read_replica
     def statistiques():
-        """Page de statistiques"""
+        """Page de statistiques (lue dans l'agrégat quotidien)"""
         # Statistiques par statut
-        stats_statut = db.session.query(
-            Candidature.statut, 
-            db.func.count(Candidature.id)
-        ).group_by(Candidature.statut).all()
+        stats_statut = [
+            (statut, int(total)) for statut, total in db.session.query(
+                StatistiqueJour.statut,
+                db.func.sum(StatistiqueJour.total)
+            ).group_by(StatistiqueJour.statut).all() if total
+        ]
         
         # Statistiques par mois
-        stats_mois = db.session.query(
-            db.func.strftime('%Y-%m', Candidature.date_soumission),
-            db.func.count(Candidature.id)
-        ).filter(Candidature.date_soumission.isnot(None)).group_by(db.func.strftime('%Y-%m', Candidature.date_soumission)).all()
+        stats_mois = bucket_series(daily_totals(), 'mois')
         
         # Top villes
-        top_villes = db.session.query(
-            Candidature.ville,
-            db.func.count(Candidature.id)
-        ).filter(Candidature.ville.isnot(None)).group_by(Candidature.ville).order_by(
-            db.func.count(Candidature.id).desc()
-        ).limit(10).all()
+        total_ville = db.func.sum(StatistiqueJour.total)
+        top_villes = [
+            (ville, int(total)) for ville, total in db.session.query(
+                StatistiqueJour.ville, total_ville
+            ).filter(StatistiqueJour.ville != '').group_by(StatistiqueJour.ville).order_by(
+                total_ville.desc()
+            ).limit(10).all() if total
+        ]
         
         return render_template('admin/statistiques.html',
                              stats_statut=stats_statut,
                              stats_mois=stats_mois,
                              top_villes=top_villes)
     
+    @app.route('/admin/api/statistiques')
+    @admin_required
+    @read_replica
+    def api_statistiques():
+        """Série temporelle: ?debut=AAAA-MM-JJ&fin=AAAA-MM-JJ&granularite=jour|semaine|mois"""
+        granularite = request.args.get('granularite', 'mois')
+        if granularite not in ('jour', 'semaine', 'mois'):
+            return jsonify({'success': False, 'error': 'granularite doit valoir jour, semaine ou mois'}), 400
+        
+        try:
+            debut = date.fromisoformat(request.args['debut']) if request.args.get('debut') else None
+            fin = date.fromisoformat(request.args['fin']) if request.args.get('fin') else None
+        except ValueError:
+            return jsonify({'success': False, 'error': 'Dates attendues au format AAAA-MM-JJ'}), 400
+        
+        rows = daily_totals(debut, fin, request.args.get('statut'), request.args.get('ville'))
+        series = bucket_series(rows, granularite)
+        
+        return jsonify({
+            'granularite': granularite,
+            'debut': debut.isoformat() if debut else None,
+            'fin': fin.isoformat() if fin else None,
+            'total': sum(total for _, total in series),
+            'series': [{'periode': periode, 'total': total} for periode, total in series]
+        })
+    
     # Route pour la page d'accueil
     @app.route('/home')
     @app.route('/')
+    @cached_page
     def home():
         """Page d'accueil avec navigation"""
         date_limite = app.config['DATE_LIMITE']
@@ -427,6 +1541,7 @@ def create_app(config_name='default'):
     
     # Route pour le formulaire (séparée de l'accueil)
     @app.route('/formulaire')
+    @cached_page
     def formulaire():
         """Page du formulaire de candidature"""
         date_limite = app.config['DATE_LIMITE']
@@ -443,6 +1558,7 @@ def create_app(config_name='default'):
     
     # Route de contact
     @app.route('/contact')
+    @cached_page
     def contact():
         """Page de contact"""
         return render_template('contact.html', 
@@ -461,6 +1577,11 @@ def create_app(config_name='default'):
                 'error': 'La période de candidature est terminée.'
             }), 400
         
+        # Avant la lecture du corps: une soumission refusée ne coûte aucune écriture
+        refus = submission_refused()
+        if refus is not None:
+            return refus
+        
         try:
             # Log pour déboguer
             logger.info(f"Form data received")
@@ -489,20 +1610,27 @@ def create_app(config_name='default'):
             
             # Traiter les fichiers avec plus de logging
             file_status = {}
+            uploads = {}
+            
+            # Documents déjà envoyés par morceaux (/api/uploads), référencés par identifiant
+            chunked = {}
+            for doc, champ in (('cv', 'cv'), ('lettre_motivation', 'lettre_motivation'), ('portfolio', 'portfolio_fichier')):
+                upload_id = request.form.get(f'{champ}_upload', '').strip()
+                if upload_id:
+                    upload = resumable_upload.completed_upload(app.config['UPLOAD_FOLDER'], upload_id)
+                    if upload is None:
+                        return jsonify({'success': False, 'error': f'Envoi du document introuvable, incomplet ou expiré ({champ})'}), 400
+                    chunked[doc] = upload
             
             # CV - Fichier obligatoire
-            if 'cv' in request.files:
+            if 'cv' in chunked:
+                pass
+            elif 'cv' in request.files:
                 file = request.files['cv']
                 if file and file.filename:
                     logger.info(f"CV file received: {file.filename}, size: {file.content_length}")
                     if allowed_file(file.filename):
-                        filename = save_file(file, candidature.nom_complet, 'cv')
-                        if filename:
-                            candidature.cv_path = filename
-                            file_status['cv'] = f"CV uploadé: {file.filename}"
-                        else:
-                            file_status['cv'] = "Erreur lors de l'upload du CV"
-                            return jsonify({'success': False, 'error': 'Erreur lors de l\'upload du CV'}), 400
+                        uploads['cv'] = file
                     else:
                         file_status['cv'] = f"Extension non autorisée pour le CV: {file.filename}"
                         return jsonify({'success': False, 'error': f'Extension non autorisée pour le CV: {file.filename}'}), 400
@@ -510,65 +1638,89 @@ def create_app(config_name='default'):
                 return jsonify({'success': False, 'error': 'Le CV est obligatoire'}), 400
             
             # Lettre de motivation - Fichier obligatoire
-            if 'lettre_motivation' in request.files:
+            if 'lettre_motivation' in chunked:
+                pass
+            elif 'lettre_motivation' in request.files:
                 file = request.files['lettre_motivation']
                 if file and file.filename:
                     logger.info(f"Lettre file received: {file.filename}")
                     if allowed_file(file.filename):
-                        filename = save_file(file, candidature.nom_complet, 'lettre_motivation')
-                        if filename:
-                            candidature.lettre_motivation_path = filename
-                            file_status['lettre'] = f"Lettre uploadée: {file.filename}"
-                        else:
-                            file_status['lettre'] = "Erreur lors de l'upload de la lettre de motivation"
+                        uploads['lettre_motivation'] = file
                     else:
                         file_status['lettre'] = f"Extension non autorisée pour la lettre: {file.filename}"
                 else:
                     return jsonify({'success': False, 'error': 'La lettre de motivation est obligatoire'}), 400
             
             # Portfolio fichier - Optionnel
-            if 'portfolio_fichier' in request.files:
+            if 'portfolio_fichier' in request.files and 'portfolio' not in chunked:
                 file = request.files['portfolio_fichier']
                 if file and file.filename:
                     logger.info(f"Portfolio file received: {file.filename}")
                     if allowed_file(file.filename):
-                        filename = save_file(file, candidature.nom_complet, 'portfolio')
-                        if filename:
-                            candidature.portfolio_fichier_path = filename
-                            file_status['portfolio'] = f"Portfolio uploadé: {file.filename}"
+                        uploads['portfolio'] = file
                     else:
                         file_status['portfolio'] = f"Extension non autorisée pour le portfolio: {file.filename}"
             
+            # Les documents sont finalisés (fsync + renommage) en parallèle
+            saved = save_files(uploads, candidature.nom_complet)
+            
+            if 'cv' in uploads:
+                if saved['cv']:
+                    candidature.cv_path = saved['cv']
+                    file_status['cv'] = f"CV uploadé: {uploads['cv'].filename}"
+                else:
+                    # Les autres documents, sauvegardés en parallèle, restent sans référence:
+                    # `flask documents-gc` les supprime (ils peuvent être partagés, jamais supprimés ici)
+                    file_status['cv'] = "Erreur lors de l'upload du CV"
+                    return jsonify({'success': False, 'error': 'Erreur lors de l\'upload du CV'}), 400
+            
+            if 'lettre_motivation' in uploads:
+                if saved['lettre_motivation']:
+                    candidature.lettre_motivation_path = saved['lettre_motivation']
+                    file_status['lettre'] = f"Lettre uploadée: {uploads['lettre_motivation'].filename}"
+                else:
+                    file_status['lettre'] = "Erreur lors de l'upload de la lettre de motivation"
+            
+            if 'portfolio' in uploads and saved['portfolio']:
+                candidature.portfolio_fichier_path = saved['portfolio']
+                file_status['portfolio'] = f"Portfolio uploadé: {uploads['portfolio'].filename}"
+            
+            libelles = {'cv': 'CV uploadé', 'lettre_motivation': 'Lettre uploadée', 'portfolio': 'Portfolio uploadé'}
+            for doc, upload in chunked.items():
+                champ = 'portfolio_fichier_path' if doc == 'portfolio' else f'{doc}_path'
+                setattr(candidature, champ, upload['chemin'])
+                file_status['lettre' if doc == 'lettre_motivation' else doc] = f"{libelles[doc]}: {upload['filename']}"
+            
             logger.info(f"File upload status: {file_status}")
             
-            # Sauvegarder en base de données
+            if app.config['INGESTION_MODE'] == 'journal':
+                return spool_candidature(candidature, chunked, file_status)
+            
+            # Sauvegarder en base de données, avec les emails dans la même transaction
             db.session.add(candidature)
-            db.session.commit()
+            db.session.flush()
+            record_new_candidature(candidature)
+            for chemin in candidature_documents(candidature):
+                reference_document(chemin, 1)
             
-            logger.info(f"Candidature {candidature.id} sauvegardée avec succès")
+            send_confirmation_email(candidature, app)
+            send_admin_notification(candidature, app)
             
-            # Préparer le message de succès avec détails des fichiers
-            message = 'Candidature soumise avec succès !'
-            if file_status:
-                message += "\nFichiers uploadés:\n"
-                for doc, status in file_status.items():
-                    message += f"- {status}\n"
+            db.session.commit()
+            metrics.SUBMISSIONS.labels('direct').inc()
             
-            # Envoyer l'email de confirmation
-            try:
-                send_confirmation_email(candidature, app)
-            except Exception as e:
-                logger.error(f"Erreur lors de l'envoi de l'email de confirmation: {str(e)}")
+            # Les identifiants d'envoi ne peuvent servir qu'une fois
+            for upload in chunked.values():
+                resumable_upload.delete_upload(app.config['UPLOAD_FOLDER'], upload['id'])
             
-            # Envoyer la notification à l'admin
-            try:
-                send_admin_notification(candidature, app)
-            except Exception as e:
-                logger.error(f"Erreur notification admin: {str(e)}")
+            logger.info(f"Candidature {candidature.id} sauvegardée avec succès")
+            schedule_previews(candidature_documents(candidature))
             
+            # Message de succès avec détails des fichiers
             return jsonify({
                 'success': True,
-                'message': message,
+                'message': submission_message(f'Candidature soumise avec succès ! Référence: {candidature.reference}', file_status),
+                'reference': candidature.reference,
                 'id': candidature.id,
                 'nom': candidature.nom_complet,
                 'file_status': file_status
@@ -580,20 +1732,62 @@ def create_app(config_name='default'):
             return jsonify({'success': False, 'error': f'Une erreur est survenue: {str(e)}'}), 500
     
     @app.route('/confirmation')
+    @cached_page
     def confirmation():
         """Page de confirmation après soumission"""
         return render_template('confirmation.html')
     
-    # Route publique pour la santé
+    # Routes publiques pour la supervision
     @app.route('/health')
     def health():
-        """Endpoint de santé pour monitoring"""
+        """Liveness: le processus répond, sans toucher à la base"""
         return jsonify({
             'status': 'healthy', 
-            'timestamp': datetime.now().isoformat(),
-            'candidatures_count': Candidature.query.count()
+            'timestamp': datetime.now().isoformat()
         })
     
+    @app.route('/metrics')
+    def metrics_endpoint():
+        """Métriques Prometheus (tous les workers avec PROMETHEUS_MULTIPROC_DIR)"""
+        token = app.config['METRICS_TOKEN']
+        if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            abort(401)
+        if app.config['INGESTION_MODE'] == 'journal':
+            metrics.observe_backlog(*ingestion_journal.backlog(app.config['INGESTION_JOURNAL_DIR']))
+        body, content_type = metrics.render()
+        return Response(body, content_type=content_type)
+    
+    @app.route('/ready')
+    def ready():
+        """Readiness: la base de données répond"""
+        try:
+            db.session.execute(db.text('SELECT 1'))
+        except Exception as e:
+            logger.error(f"Base de données indisponible: {str(e)}")
+            return jsonify({'status': 'unavailable', 'timestamp': datetime.now().isoformat()}), 503
+        etat = {'status': 'ready', 'timestamp': datetime.now().isoformat()}
+        if app.config['INGESTION_MODE'] == 'journal':
+            etat['ingestion_backlog'], age = ingestion_backlog()
+            etat['ingestion_backlog_age'] = round(age, 1)
+        return jsonify(etat)
+    
+    @app.route('/api/candidatures/count')
+    def public_candidatures_count():
+        """Nombre de candidatures affiché sur les pages publiques (cache en mémoire)"""
+        ttl = app.config['PUBLIC_COUNT_CACHE_TTL']
+        now = time.monotonic()
+        
+        cached = app.extensions.get('public_count')
+        if cached is None or cached[0] <= now:
+            cached = (now + ttl, sum(status_counts().values()))
+            app.extensions['public_count'] = cached
+        
+        response = jsonify({'candidatures_count': cached[1]})
+        response.set_etag(f"count-{cached[1]}")
+        response.cache_control.public = True
+        response.cache_control.max_age = ttl
+        return response.make_conditional(request)
+    
     # Gestion des erreurs
     @app.errorhandler(404)
     def page_not_found(e):
@@ -628,26 +1822,179 @@ def create_app(config_name='default'):
         <p>Extensions autorisées: ''' + ', '.join(app.config['ALLOWED_EXTENSIONS']) + '''</p>
         '''
     
+    # Commandes CLI
+    @app.cli.command('mail-worker')
+    @click.option('--once', is_flag=True, help="Vider la file puis s'arrêter")
+    def mail_worker_command(once):
+        """Envoyer les emails en attente (processus séparé des workers web)"""
+        run_mail_worker(app, once=once)
+    
+    @app.cli.command('ingestion-writer')
+    @click.option('--once', is_flag=True, help="Vider le journal puis s'arrêter")
+    def ingestion_writer_command(once):
+        """Insérer par lots les candidatures du journal d'ingestion (INGESTION_MODE=journal)"""
+        run_ingestion_writer(app, once=once)
+    
+    @app.cli.command('counters-reconcile')
+    @click.option('--interval', type=int, default=0, help="Répéter toutes les N secondes")
+    def counters_reconcile_command(interval):
+        """Corriger les compteurs par statut à partir de la table candidatures"""
+        while True:
+            ecarts = reconcile_status_counters()
+            if ecarts:
+                logger.warning(f"Compteurs par statut corrigés: {ecarts}")
+            click.echo(f"Compteurs réconciliés ({len(ecarts)} écart(s))")
+            if not interval:
+                return
+            time.sleep(interval)
+    
+    @app.cli.command('stats-backfill')
+    def stats_backfill_command():
+        """Reconstruire l'agrégat quotidien des statistiques"""
+        count = backfill_daily_stats()
+        click.echo(f"{count} ligne(s) d'agrégat quotidien reconstruite(s)")
+    
+    @app.cli.command('search-rebuild')
+    def search_rebuild_command():
+        """Reconstruire l'index plein texte des candidatures"""
+        with db.engine.begin() as connection:
+            backend = search_index.install(connection)
+            search_index.rebuild(connection)
+        app.extensions['search_backend'] = backend
+        click.echo(f"Index de recherche reconstruit ({backend or 'aucun index, recherche ILIKE'})")
+    
+    @app.cli.command('documents-migrate')
+    @click.option('--batch-size', type=int, default=100, help="Candidatures traitées par transaction")
+    def documents_migrate_command(batch_size):
+        """Déplacer les fichiers existants dans le stockage par empreinte"""
+        stats = migrate_documents(batch_size)
+        click.echo(
+            f"{stats['fichiers']} fichier(s) migré(s), dont {stats['doublons']} doublon(s); "
+            f"{stats['manquants']} fichier(s) introuvable(s)"
+        )
+    
+    @app.cli.command('documents-gc')
+    @click.option('--grace', type=int, default=None, help="Âge minimal (secondes) d'un contenu supprimé")
+    def documents_gc_command(grace):
+        """Supprimer les contenus stockés qui ne sont plus référencés"""
+        if grace is None:
+            grace = app.config['DOCUMENTS_GC_GRACE']
+        count = purge_orphan_documents(grace)
+        click.echo(f"{count} fichier(s) orphelin(s) supprimé(s)")
+    
+    @app.cli.command('previews-backfill')
+    @click.option('--workers', type=int, default=None, help="Processus de rendu (défaut: PREVIEW_WORKERS)")
+    def previews_backfill_command(workers):
+        """Générer les aperçus manquants des documents déjà stockés"""
+        upload_folder = app.config['UPLOAD_FOLDER']
+        chemins = [
+            chemin for chemin, in db.session.query(Document.chemin).filter(Document.total > 0)
+            if previews.can_preview(chemin) and not previews.has_previews(upload_folder, chemin)
+        ]
+        
+        generes, erreurs = 0, 0
+        with process_pool(workers or app.config['PREVIEW_WORKERS'] or 1) as executor:
+            futures = {executor.submit(previews.render_previews, upload_folder, chemin): chemin for chemin in chemins}
+            for future, chemin in futures.items():
+                try:
+                    generes += 1 if future.result() else 0
+                except Exception as e:
+                    erreurs += 1
+                    logger.error(f"Aperçu de {chemin} impossible: {str(e)}")
+        click.echo(f"{generes} document(s) avec nouveaux aperçus, {erreurs} erreur(s)")
+    
+    @app.cli.command('text-worker')
+    @click.option('--once', is_flag=True, help="Traiter l'arriéré puis s'arrêter")
+    @click.option('--workers', type=int, default=None, help="Processus d'extraction (défaut: TEXT_WORKERS)")
+    def text_worker_command(once, workers):
+        """Extraire et indexer le texte des CV et lettres (processus séparé des workers web)"""
+        run_text_worker(app, once=once, workers=workers)
+    
+    @app.cli.command('uploads-expire')
+    def uploads_expire_command():
+        """Supprimer les envois par morceaux abandonnés"""
+        count = resumable_upload.expire_uploads(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_EXPIRATION'])
+        click.echo(f"{count} envoi(s) expiré(s)")
+    
+    @app.cli.command('candidatures-import')
+    @click.argument('source', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--format', 'format_', type=click.Choice(['csv', 'json']), default=None,
+                  help="Format du fichier (défaut: d'après l'extension)")
+    @click.option('--files-dir', type=click.Path(exists=True, file_okay=False), default=None,
+                  help="Dossier des documents référencés (défaut: dossier du fichier)")
+    @click.option('--batch-size', type=int, default=None, help="Lignes insérées par transaction")
+    @click.option('--workers', type=int, default=None, help="Threads de copie des documents")
+    @click.option('--rejects', type=click.Path(dir_okay=False), default=None, help="CSV des lignes rejetées")
+    @click.option('--restart', is_flag=True, help="Ignorer le point de reprise et tout réimporter")
+    def candidatures_import_command(source, format_, files_dir, batch_size, workers, rejects, restart):
+        """Importer des candidatures d'anciennes campagnes (CSV ou JSON), avec reprise"""
+        def progress(stats):
+            click.echo(
+                f"Ligne {stats['position']}: {stats['inserees']} insérée(s), {stats['rejetees']} rejetée(s), "
+                f"{stats['lignes_par_seconde']:.0f} lignes/s"
+            )
+        
+        try:
+            stats = import_candidatures(
+                source, format_=format_, files_dir=files_dir,
+                batch_size=batch_size or app.config['IMPORT_BATCH_SIZE'],
+                workers=workers or app.config['IMPORT_COPY_WORKERS'],
+                rejects=rejects, restart=restart, progress=progress
+            )
+        except bulk_import.ImportSourceChangedError as e:
+            raise click.ClickException(str(e))
+        if stats['deja_termine']:
+            click.echo("Import déjà terminé pour ce fichier (--restart pour le rejouer)")
+            return
+        click.echo(
+            f"{stats['inserees']} candidature(s) importée(s), {stats['rejetees']} ligne(s) rejetée(s), "
+            f"{stats['documents']} document(s) copié(s), {stats['manquants']} introuvable(s); "
+            f"{stats['lignes_par_seconde']:.0f} lignes/s"
+            + (f" (reprise après la ligne {stats['reprise']})" if stats['reprise'] else '')
+        )
+    
+    @app.cli.command('mail-requeue-dead')
+    def mail_requeue_dead_command():
+        """Remettre en file les emails en lettre morte"""
+        count = EmailQueue.query.filter_by(statut='dead').update({
+            'statut': 'pending',
+            'tentatives': 0,
+            'prochaine_tentative': datetime.utcnow()
+        }, synchronize_session=False)
+        db.session.commit()
+        click.echo(f"{count} email(s) remis en file")
+    
+    @app.cli.command('templates-compile')
+    def templates_compile_command():
+        """Compiler les templates dans le cache de bytecode (JINJA_BYTECODE_CACHE_DIR)"""
+        if not app.config['JINJA_BYTECODE_CACHE_DIR']:
+            raise click.ClickException("JINJA_BYTECODE_CACHE_DIR n'est pas défini")
+        click.echo(f"{compile_templates(app)} template(s) compilé(s) dans {app.config['JINJA_BYTECODE_CACHE_DIR']}")
+    
+    @app.cli.command('assets-build')
+    def assets_build_command():
+        """Minifier, hacher et précompresser les styles et scripts des pages (static/dist)"""
+        for bundle, fichier, tailles in assets.build(app.static_folder):
+            click.echo(
+                f"{bundle:<34} {fichier:<44} {tailles['sources']:>7} -> {tailles['minifie']:>7} octets "
+                f"(gzip {tailles['gzip']}, brotli {tailles['brotli']})"
+            )
+        app.extensions['assets_manifest'] = assets.load_manifest(app.static_folder)
+    
     return app
 
 
 def send_confirmation_email(candidature, app):
-    """Envoyer un email de confirmation au candidat"""
+    """Mettre en file l'email de confirmation au candidat (commit par l'appelant)"""
     try:
-        msg = Message(
-            subject="Confirmation de réception de votre candidature - SCSM SARL",
-            recipients=[candidature.email],
-            sender=app.config['MAIL_DEFAULT_SENDER']
-        )
-        
-        msg.body = f"""
+        body = f"""
         Bonjour {candidature.nom_complet},
         
         Nous accusons réception de votre candidature pour le poste chez SCSM SARL.
         
         Détails de votre soumission:
         - Date: {candidature.date_soumission.strftime('%d/%m/%Y %H:%M')}
-        - Référence: CAND{candidature.id:06d}
+        - Référence: {candidature.reference}
         
         Nous examinerons votre dossier avec attention et vous contacterons si votre profil retient notre attention.
         
@@ -661,28 +2008,27 @@ def send_confirmation_email(candidature, app):
         L'équipe de recrutement SCSM SARL
         """
         
-        mail.send(msg)
-        logger.info(f"Email de confirmation envoyé à {candidature.email}")
+        queue_email(
+            subject="Confirmation de réception de votre candidature - SCSM SARL",
+            recipients=[candidature.email],
+            body=body,
+            sender=app.config['MAIL_DEFAULT_SENDER']
+        )
+        logger.info(f"Email de confirmation mis en file pour {candidature.email}")
         
     except Exception as e:
-        logger.error(f"Erreur lors de l'envoi de l'email de confirmation: {str(e)}")
+        logger.error(f"Erreur lors de la mise en file de l'email de confirmation: {str(e)}")
 
 
 def send_admin_notification(candidature, app):
-    """Notifier l'admin de la nouvelle candidature"""
+    """Mettre en file la notification admin (commit par l'appelant)"""
     try:
         admin_email = app.config.get('EMAIL_CONTACT')
         if not admin_email:
             logger.warning("EMAIL_CONTACT non configuré, notification admin ignorée")
             return
         
-        msg = Message(
-            subject=f"[SCSM] Nouvelle candidature: {candidature.nom_complet}",
-            recipients=[admin_email],
-            sender=app.config['MAIL_DEFAULT_SENDER']
-        )
-        
-        msg.body = f"""
+        body = f"""
         Nouvelle candidature reçue:
         
         Candidat: {candidature.nom_complet}
@@ -691,17 +2037,804 @@ def send_admin_notification(candidature, app):
         Ville: {candidature.ville}
         Date: {candidature.date_soumission.strftime('%d/%m/%Y %H:%M')}
         ID: CAND{candidature.id:06d}
+        Référence candidat: {candidature.reference}
         
         Pour voir les détails, connectez-vous à l'interface admin.
         """
         
-        mail.send(msg)
-        logger.info(f"Notification admin envoyée pour candidature {candidature.id}")
+        queue_email(
+            subject=f"[SCSM] Nouvelle candidature: {candidature.nom_complet}",
+            recipients=[admin_email],
+            body=body,
+            sender=app.config['MAIL_DEFAULT_SENDER']
+        )
+        logger.info(f"Notification admin mise en file pour candidature {candidature.id}")
         
     except Exception as e:
         logger.error(f"Erreur notification admin: {str(e)}")
 
 
+def attachment_disposition(download_name):
+    """En-tête Content-Disposition compatible avec les noms accentués"""
+    try:
+        download_name.encode('ascii')
+        return dump_options_header('attachment', {'filename': download_name})
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize('NFKD', download_name).encode('ascii', 'ignore').decode('ascii')
+        return dump_options_header('attachment', {
+            'filename': simple,
+            'filename*': f"UTF-8''{quote(download_name, safe='!#$&+^`|~')}"
+        })
+
+
+# Compteurs par statut et agrégats quotidiens
+def _increment(model, delta, valeurs=None, **cle):
+    """Incrémenter `total` sur la ligne `cle`, créée au besoin (transaction courante)"""
+    cible = model.query.filter_by(**cle)
+    
+    if cible.update({'total': model.total + delta}, synchronize_session=False):
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.add(model(total=delta, **(valeurs or {}), **cle))
+    except IntegrityError:
+        # Ligne créée entre-temps par une autre transaction
+        cible.update({'total': model.total + delta}, synchronize_session=False)
+
+
+def adjust_status_counter(statut, delta):
+    """Ajouter `delta` au compteur d'un statut dans la transaction courante"""
+    slot = random.randrange(current_app.config['STATUS_COUNTER_SLOTS'])
+    _increment(CompteurStatut, delta, statut=statut or '', slot=slot)
+
+
+def adjust_daily_stat(candidature, statut, delta):
+    """Ajouter `delta` à l'agrégat du jour de soumission d'une candidature"""
+    _increment(
+        StatistiqueJour, delta,
+        jour=candidature.date_soumission.date(),
+        statut=statut or '',
+        ville=(candidature.ville or '').strip()
+    )
+
+
+def record_new_candidature(candidature):
+    """Compter une candidature insérée (après flush, avant commit)"""
+    adjust_status_counter(candidature.statut, 1)
+    adjust_daily_stat(candidature, candidature.statut, 1)
+
+
+def record_status_change(candidature, ancien_statut):
+    """Répercuter un changement de statut sur les compteurs et agrégats"""
+    if (ancien_statut or '') != (candidature.statut or ''):
+        adjust_status_counter(ancien_statut, -1)
+        adjust_status_counter(candidature.statut, 1)
+        adjust_daily_stat(candidature, ancien_statut, -1)
+        adjust_daily_stat(candidature, candidature.statut, 1)
+
+
+# Références au stockage par empreinte
+def candidature_documents(candidature):
+    """Chemins du stockage par empreinte référencés par une candidature"""
+    chemins = (candidature.cv_path, candidature.lettre_motivation_path, candidature.portfolio_fichier_path)
+    return [chemin for chemin in chemins if document_store.is_stored(chemin)]
+
+
+def reference_document(chemin, delta, taille=None):
+    """Ajouter `delta` aux références d'un contenu stocké (transaction courante)"""
+    if taille is None and delta > 0:
+        try:
+            taille = os.path.getsize(document_store.resolve(current_app.config['UPLOAD_FOLDER'], chemin))
+        except (OSError, TypeError):
+            taille = None
+    sha256 = chemin.rsplit('/', 1)[-1].split('.', 1)[0]
+    _increment(Document, delta, valeurs={'sha256': sha256, 'taille': taille}, chemin=chemin)
+
+
+def migrate_documents(batch_size=100):
+    """Déplacer les anciens fichiers à plat dans le stockage par empreinte.
+    
+    Chaque lot est copié puis validé en base avant la suppression des
+    originaux: une interruption laisse au pire des doublons que
+    `purge_orphan_documents` retire.
+    """
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    champs = ('cv_path', 'lettre_motivation_path', 'portfolio_fichier_path')
+    anciens = db.or_(*(
+        db.and_(getattr(Candidature, champ).isnot(None), getattr(Candidature, champ) != '',
+                ~getattr(Candidature, champ).startswith(document_store.STORE_DIR + '/'))
+        for champ in champs
+    ))
+    stats = {'fichiers': 0, 'doublons': 0, 'manquants': 0}
+    dernier_id = 0
+    
+    while True:
+        lot = Candidature.query.filter(anciens, Candidature.id > dernier_id) \
+            .order_by(Candidature.id).limit(batch_size).all()
+        if not lot:
+            return stats
+        
+        a_supprimer = []
+        for candidature in lot:
+            for champ in champs:
+                ancien = getattr(candidature, champ)
+                if not ancien or document_store.is_stored(ancien):
+                    continue
+                source = document_store.resolve(upload_folder, ancien)
+                if not source or not os.path.isfile(source):
+                    logger.warning(f"Candidature {candidature.id}: fichier introuvable {ancien}")
+                    stats['manquants'] += 1
+                    continue
+                chemin, _, taille = document_store.import_file(source, upload_folder)
+                if db.session.get(Document, chemin) is not None:
+                    stats['doublons'] += 1
+                setattr(candidature, champ, chemin)
+                reference_document(chemin, 1, taille=taille)
+                a_supprimer.append(source)
+                stats['fichiers'] += 1
+            dernier_id = candidature.id
+        db.session.commit()
+        
+        for source in a_supprimer:
+            try:
+                os.remove(source)
+            except FileNotFoundError:
+                pass
+
+
+# Colonnes renseignées par l'import en masse
+IMPORT_COLUMNS = (
+    'nom_complet', 'email', 'telephone', 'ville', 'portfolio_lien',
+    'cv_path', 'lettre_motivation_path', 'lettre_motivation_text', 'portfolio_fichier_path',
+    'competences_marketing', 'date_soumission', 'statut', 'notes_admin',
+)
+
+
+def bulk_insert_candidatures(lignes):
+    """Insérer des candidatures en une instruction dans la transaction courante.
+    
+    COPY sous PostgreSQL (psycopg2 ou psycopg), executemany sinon. Les
+    triggers de l'index de recherche s'appliquent dans les deux cas.
+    """
+    if not lignes:
+        return
+    connection = db.session.connection()
+    driver = connection.dialect.driver
+    if connection.dialect.name == 'postgresql' and driver in ('psycopg2', 'psycopg'):
+        tampon = bulk_import.copy_rows_csv(lignes, IMPORT_COLUMNS)
+        sql = f"COPY candidatures ({', '.join(IMPORT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+        cursor = connection.connection.cursor()
+        try:
+            if driver == 'psycopg2':
+                cursor.copy_expert(sql, tampon)
+            else:
+                with cursor.copy(sql) as copy:
+                    copy.write(tampon.getvalue())
+        finally:
+            cursor.close()
+    else:
+        db.session.execute(db.insert(Candidature), [
+            {colonne: ligne.get(colonne) for colonne in IMPORT_COLUMNS} for ligne in lignes
+        ])
+
+
+def _import_batch(lot, point, position, rejetees, stats):
+    """Insérer un lot validé avec ses documents, compteurs et point de reprise (un commit)"""
+    lignes, references = [], {}
+    for valeurs, documents in lot:
+        for champ, (source, future) in documents.items():
+            try:
+                resultat = future.result()
+            except OSError as e:
+                logger.warning(f"Document {source} non copié: {str(e)}")
+                resultat = None
+            if resultat is None:
+                stats['manquants'] += 1
+                continue
+            chemin, _, taille = resultat
+            valeurs[f'{champ}_path'] = chemin
+            references.setdefault(chemin, [0, taille])[0] += 1
+            stats['documents'] += 1
+        lignes.append(valeurs)
+    
+    bulk_insert_candidatures(lignes)
+    for chemin, (nombre, taille) in references.items():
+        reference_document(chemin, nombre, taille=taille)
+    # Compteurs et agrégats: une mise à jour par clé, pas par ligne
+    for statut, nombre in Counter(ligne['statut'] for ligne in lignes).items():
+        adjust_status_counter(statut, nombre)
+    jours = Counter(
+        (ligne['date_soumission'].date(), ligne['statut'], (ligne.get('ville') or '').strip()) for ligne in lignes
+    )
+    for (jour, statut, ville), nombre in jours.items():
+        _increment(StatistiqueJour, nombre, jour=jour, statut=statut, ville=ville)
+    
+    point.position = position
+    point.inserees += len(lignes)
+    point.rejetees += rejetees
+    point.date_maj = datetime.utcnow()
+    db.session.commit()
+    stats['inserees'] += len(lignes)
+
+
+def import_candidatures(source, format_=None, files_dir=None, batch_size=1000, workers=8,
+                        rejects=None, restart=False, progress=None):
+    """Importer un fichier CSV/JSON de candidatures par lots; retourne les statistiques.
+    
+    Le fichier est lu en flux. Les documents référencés sont copiés dans le
+    stockage par un pool de threads pendant la lecture; chaque lot est ensuite
+    inséré en une instruction avec les compteurs, les références des documents
+    et le point de reprise, dans la même transaction: après une interruption,
+    l'import repart du dernier lot validé, sans doublon. Le point de reprise suit
+    le contenu du fichier: la reprise d'un fichier modifié depuis est refusée
+    (ImportSourceChangedError) plutôt que de réinsérer les lignes déjà validées.
+    """
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    files_dir = files_dir or os.path.dirname(os.path.abspath(source))
+    fichier = os.path.abspath(source)[-255:]
+    # Point de reprise lié au contenu: deux fichiers de même nom et de même taille restent distincts
+    cle = document_store.hash_file(source)
+    
+    point = db.session.get(ImportCandidatures, cle)
+    if point is None:
+        interrompus = ImportCandidatures.query.filter(
+            ImportCandidatures.fichier == fichier, ImportCandidatures.termine.is_(False),
+            ImportCandidatures.position > 0
+        )
+        if restart:
+            interrompus.delete(synchronize_session=False)
+        else:
+            interrompu = interrompus.first()
+            if interrompu is not None:
+                raise bulk_import.ImportSourceChangedError(
+                    f"{source} a été modifié depuis l'import interrompu après la ligne {interrompu.position} "
+                    "(--restart pour l'importer depuis le début)"
+                )
+        point = ImportCandidatures(source=cle, fichier=fichier, position=0, inserees=0, rejetees=0, termine=False)
+        db.session.add(point)
+    elif restart:
+        point.position, point.inserees, point.rejetees, point.termine = 0, 0, 0, False
+    db.session.commit()
+    
+    stats = {
+        'inserees': 0, 'rejetees': 0, 'documents': 0, 'manquants': 0,
+        'reprise': point.position, 'position': point.position,
+        'deja_termine': point.termine, 'lignes_par_seconde': 0.0,
+    }
+    if point.termine:
+        return stats
+    
+    def copier(chemin):
+        absolu = os.path.join(files_dir, chemin)
+        if not os.path.isfile(absolu):
+            logger.warning(f"Document introuvable: {absolu}")
+            return None
+        return document_store.import_file(absolu, upload_folder)
+    
+    rejets = open(rejects, 'a', newline='', encoding='utf-8') if rejects else None
+    rejets_writer = csv.writer(rejets) if rejets else None
+    if rejets and rejets.tell() == 0:
+        rejets_writer.writerow(['position', 'erreur', 'ligne'])
+    
+    def valider(lot, rejetes, position):
+        _import_batch(lot, point, position, len(rejetes), stats)
+        # Rejets écrits une fois le lot validé: pas de doublon après une reprise
+        if rejets_writer:
+            rejets_writer.writerows(rejetes)
+    
+    debut = time.perf_counter()
+    date_defaut = datetime.utcnow()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            lot, rejetes, position = [], [], point.position
+            for position, brute in bulk_import.read_rows(source, format_):
+                if position <= point.position:
+                    continue
+                try:
+                    valeurs, documents = bulk_import.validate_row(brute, STATUTS, date_defaut)
+                except bulk_import.ImportRowError as e:
+                    stats['rejetees'] += 1
+                    rejetes.append([position, str(e), json.dumps(brute, ensure_ascii=False, default=str)])
+                    continue
+                lot.append((valeurs, {
+                    champ: (chemin, executor.submit(copier, chemin)) for champ, chemin in documents.items()
+                }))
+                
+                if len(lot) >= batch_size:
+                    valider(lot, rejetes, position)
+                    lot, rejetes = [], []
+                    stats['position'] = position
+                    stats['lignes_par_seconde'] = (stats['inserees'] + stats['rejetees']) / (time.perf_counter() - debut)
+                    if progress:
+                        progress(stats)
+            
+            point.termine = True
+            valider(lot, rejetes, position)
+    finally:
+        if rejets:
+            rejets.close()
+    
+    stats['position'] = point.position
+    stats['lignes_par_seconde'] = (stats['inserees'] + stats['rejetees']) / max(time.perf_counter() - debut, 1e-9)
+    logger.info(f"Import {cle}: {stats}")
+    return stats
+
+
+def purge_orphan_documents(grace):
+    """Supprimer les contenus sans référence depuis plus de `grace` secondes"""
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    references = {chemin for chemin, in db.session.query(Document.chemin).filter(Document.total > 0)}
+    limite = time.time() - grace
+    
+    count = 0
+    for chemin, absolu in document_store.iter_stored(upload_folder):
+        if chemin in references:
+            continue
+        try:
+            if os.path.getmtime(absolu) < limite:
+                os.remove(absolu)
+                count += 1
+                for taille in previews.SIZES:
+                    apercu = previews.preview_path(upload_folder, chemin, taille)
+                    if os.path.exists(apercu):
+                        os.remove(apercu)
+        except FileNotFoundError:
+            pass
+    
+    Document.query.filter(Document.total <= 0).delete(synchronize_session=False)
+    db.session.commit()
+    return count + document_store.purge_partials(upload_folder, grace)
+
+
+def bulk_update_candidatures(ids, statut=None, note=None, chunk_size=500):
+    """Changer le statut et/ou ajouter une note sur `ids`; retourne le nombre de lignes modifiées.
+    
+    Un UPDATE ensembliste par lot de `chunk_size`, chacun dans sa propre
+    transaction avec la mise à jour des compteurs et agrégats: les verrous
+    (SQLite) ne durent que le temps d'un lot.
+    """
+    valeurs = {}
+    if statut:
+        valeurs['statut'] = statut
+    if note:
+        valeurs['notes_admin'] = db.case(
+            (db.func.coalesce(Candidature.notes_admin, '') == '', note),
+            else_=Candidature.notes_admin + '\n' + note
+        )
+    if not valeurs or not ids:
+        return 0
+    
+    total = 0
+    for debut in range(0, len(ids), chunk_size):
+        lot = ids[debut:debut + chunk_size]
+        
+        if statut:
+            # Répartition des statuts quittés, pour les compteurs et agrégats
+            ancien = db.func.coalesce(Candidature.statut, '')
+            jour = db.func.date(Candidature.date_soumission)
+            ville = db.func.coalesce(db.func.trim(Candidature.ville), '')
+            quittes = db.session.query(ancien, jour, ville, db.func.count(Candidature.id)) \
+                .filter(Candidature.id.in_(lot), ancien != statut) \
+                .group_by(ancien, jour, ville).all()
+            for ancien_statut, valeur_jour, valeur_ville, nombre in quittes:
+                if isinstance(valeur_jour, str):
+                    valeur_jour = date.fromisoformat(valeur_jour[:10])
+                adjust_status_counter(ancien_statut, -nombre)
+                adjust_status_counter(statut, nombre)
+                _increment(StatistiqueJour, -nombre, jour=valeur_jour, statut=ancien_statut, ville=valeur_ville)
+                _increment(StatistiqueJour, nombre, jour=valeur_jour, statut=statut, ville=valeur_ville)
+        
+        total += Candidature.query.filter(Candidature.id.in_(lot)).update(valeurs, synchronize_session=False)
+        db.session.commit()
+    
+    return total
+
+
+def status_counts():
+    """Nombre de candidatures par statut, lu dans les compteurs"""
+    rows = db.session.query(
+        CompteurStatut.statut, db.func.sum(CompteurStatut.total)
+    ).group_by(CompteurStatut.statut)
+    return {statut: int(total) for statut, total in rows if total}
+
+
+def lock_status_counters():
+    """Bloquer jusqu'au commit les écritures sur les candidatures et leurs compteurs.
+    
+    Doit ouvrir la transaction: une insertion validée entre le comptage et la
+    réécriture des compteurs serait perdue. SQLite: verrou d'écriture de la
+    base (BEGIN IMMEDIATE); PostgreSQL: insertions et changements de statut
+    (SHARE sur candidatures) et incréments (EXCLUSIVE sur les compteurs)
+    attendent la fin de la réconciliation.
+    """
+    connection = db.session.connection()
+    if connection.dialect.name == 'sqlite':
+        connection.exec_driver_sql('BEGIN IMMEDIATE')
+    elif connection.dialect.name == 'postgresql':
+        # Même ordre que les écritures (candidature puis compteur): pas d'interblocage
+        connection.exec_driver_sql('LOCK TABLE candidatures IN SHARE MODE')
+        connection.exec_driver_sql('LOCK TABLE compteurs_statut IN EXCLUSIVE MODE')
+    else:
+        # Autres bases: lignes des compteurs verrouillées, les incréments attendent
+        db.session.query(CompteurStatut.statut).with_for_update().all()
+
+
+def reconcile_status_counters():
+    """Recalculer les compteurs depuis la table; retourne les écarts corrigés.
+    
+    Comptage et réécriture dans une même transaction verrouillée (lock_status_counters).
+    """
+    db.session.commit()
+    lock_status_counters()
+    reel = {
+        statut or '': total
+        for statut, total in db.session.query(
+            Candidature.statut, db.func.count(Candidature.id)
+        ).group_by(Candidature.statut)
+    }
+    compteurs = status_counts()
+    
+    ecarts = {
+        statut: reel.get(statut, 0) - compteurs.get(statut, 0)
+        for statut in set(reel) | set(compteurs)
+        if reel.get(statut, 0) != compteurs.get(statut, 0)
+    }
+    
+    if ecarts:
+        CompteurStatut.query.delete(synchronize_session=False)
+        for statut, total in reel.items():
+            db.session.add(CompteurStatut(statut=statut, slot=0, total=total))
+    db.session.commit()
+    return ecarts
+
+
+def backfill_daily_stats():
+    """Reconstruire les agrégats quotidiens depuis la table candidatures"""
+    jour = db.func.date(Candidature.date_soumission)
+    ville = db.func.coalesce(db.func.trim(Candidature.ville), '')
+    rows = db.session.query(
+        jour, db.func.coalesce(Candidature.statut, ''), ville, db.func.count(Candidature.id)
+    ).group_by(jour, Candidature.statut, ville)
+    
+    StatistiqueJour.query.delete(synchronize_session=False)
+    count = 0
+    for valeur_jour, statut, valeur_ville, total in rows.all():
+        # date() renvoie une chaîne sous SQLite, une date sous PostgreSQL
+        if isinstance(valeur_jour, str):
+            valeur_jour = date.fromisoformat(valeur_jour[:10])
+        _increment(StatistiqueJour, total, jour=valeur_jour, statut=statut, ville=valeur_ville)
+        count += 1
+    db.session.commit()
+    return count
+
+
+def daily_totals(debut=None, fin=None, statut=None, ville=None):
+    """Totaux par jour lus dans l'agrégat, filtrés par période, statut et ville"""
+    query = db.session.query(StatistiqueJour.jour, db.func.sum(StatistiqueJour.total))
+    if debut:
+        query = query.filter(StatistiqueJour.jour >= debut)
+    if fin:
+        query = query.filter(StatistiqueJour.jour <= fin)
+    if statut:
+        query = query.filter(StatistiqueJour.statut == statut)
+    if ville:
+        query = query.filter(StatistiqueJour.ville == ville)
+    return query.group_by(StatistiqueJour.jour).order_by(StatistiqueJour.jour).all()
+
+
+def bucket_series(rows, granularite):
+    """Regrouper des totaux (jour, total) par jour, semaine ISO ou mois"""
+    series = {}
+    for jour, total in rows:
+        if granularite == 'jour':
+            periode = jour.isoformat()
+        elif granularite == 'semaine':
+            annee, semaine, _ = jour.isocalendar()
+            periode = f"{annee}-S{semaine:02d}"
+        else:
+            periode = jour.strftime('%Y-%m')
+        series[periode] = series.get(periode, 0) + int(total or 0)
+    return [(periode, total) for periode, total in series.items() if total]
+
+
+# Extraction du texte des documents
+def extract_pending_texts(app, executor):
+    """Traiter un lot de candidatures sans texte extrait; retourne leur nombre"""
+    upload_folder = app.config['UPLOAD_FOLDER']
+    max_chars = app.config['TEXT_EXTRACTION_MAX_CHARS']
+    lot = Candidature.query.options(
+        db.load_only(Candidature.id, Candidature.cv_path, Candidature.lettre_motivation_path)
+    ).filter(Candidature.texte_documents.is_(None)) \
+        .order_by(Candidature.id).limit(app.config['TEXT_WORKER_BATCH_SIZE']).all()
+    if not lot:
+        return 0
+    
+    # Empreintes des documents du lot (None: fichier introuvable)
+    empreintes = {}
+    for candidature in lot:
+        for chemin in (candidature.cv_path, candidature.lettre_motivation_path):
+            if chemin and chemin not in empreintes:
+                empreintes[chemin] = text_extraction.sha256_of(upload_folder, chemin)
+    
+    connus = {
+        texte.sha256: texte for texte in
+        TexteDocument.query.filter(TexteDocument.sha256.in_({sha for sha in empreintes.values() if sha}))
+    }
+    a_extraire = {}
+    for chemin, sha256 in empreintes.items():
+        if sha256 and sha256 not in connus:
+            a_extraire.setdefault(sha256, chemin)
+    
+    # Extraction en parallèle dans les processus du pool
+    resultats = executor.map(
+        text_extraction.extract_document,
+        [upload_folder] * len(a_extraire), a_extraire.values(), [max_chars] * len(a_extraire)
+    )
+    for sha256, (statut, texte) in zip(a_extraire, resultats):
+        if statut == 'erreur':
+            logger.warning(f"Extraction impossible ({a_extraire[sha256]}): {texte}")
+        connus[sha256] = db.session.merge(TexteDocument(sha256=sha256, statut=statut, texte=texte))
+    
+    for candidature in lot:
+        textes = []
+        for chemin in (candidature.cv_path, candidature.lettre_motivation_path):
+            texte = connus.get(empreintes.get(chemin))
+            if texte is not None and texte.statut == 'ok':
+                textes.append(texte.texte)
+        # Chaîne vide: traitée, même sans texte exploitable
+        candidature.texte_documents = '\n\n'.join(textes)
+    
+    db.session.commit()
+    logger.info(f"Texte extrait pour {len(lot)} candidature(s), {len(a_extraire)} nouveau(x) document(s)")
+    return len(lot)
+
+
+def run_text_worker(app, once=False, workers=None):
+    """Boucle du worker d'extraction de texte"""
+    workers = workers or app.config['TEXT_WORKERS']
+    logger.info(f"Worker d'extraction démarré ({workers} processus)")
+    
+    with process_pool(workers) as executor:
+        while True:
+            try:
+                count = extract_pending_texts(app, executor)
+            except Exception as e:
+                logger.error(f"Erreur du worker d'extraction: {str(e)}", exc_info=True)
+                db.session.rollback()
+                count = 0
+            
+            if count:
+                continue
+            if once:
+                return
+            db.session.remove()
+            time.sleep(app.config['TEXT_WORKER_POLL_INTERVAL'])
+
+
+# Journal d'ingestion (INGESTION_MODE=journal): colonnes écrites par /postuler
+JOURNAL_COLUMNS = (
+    'nom_complet', 'email', 'telephone', 'ville', 'portfolio_lien', 'lettre_motivation_text',
+    'competences_marketing', 'cv_path', 'lettre_motivation_path', 'portfolio_fichier_path',
+)
+
+
+def insert_journal_entries(app, entrees):
+    """Insérer des entrées du journal dans la transaction courante; retourne le nombre insérées.
+    
+    Les entrées dont la référence est déjà en base (writer arrêté entre le
+    commit et la suppression des fichiers) sont ignorées.
+    """
+    references = [entree['reference'] for entree in entrees]
+    deja = {reference for reference, in db.session.query(Candidature.reference_depot).filter(
+        Candidature.reference_depot.in_(references)
+    )}
+    candidatures = [
+        Candidature(
+            reference_depot=entree['reference'],
+            date_soumission=datetime.fromisoformat(entree['date_soumission']),
+            **{colonne: entree.get(colonne) for colonne in JOURNAL_COLUMNS}
+        )
+        for entree in entrees if entree['reference'] not in deja
+    ]
+    db.session.add_all(candidatures)
+    db.session.flush()
+    
+    for candidature in candidatures:
+        record_new_candidature(candidature)
+        for chemin in candidature_documents(candidature):
+            reference_document(chemin, 1)
+        send_confirmation_email(candidature, app)
+        send_admin_notification(candidature, app)
+    return len(candidatures)
+
+
+def drain_ingestion_journal(app, batch_size=None):
+    """Insérer un lot du journal en une transaction; retourne le nombre d'entrées traitées.
+    
+    Un lot refusé est rejoué entrée par entrée: celles qui échouent encore
+    vont dans rejets/. Base indisponible (OperationalError): les entrées
+    restantes sont remises en attente et l'erreur est propagée.
+    """
+    journal_dir = app.config['INGESTION_JOURNAL_DIR']
+    reservees = ingestion_journal.claim(journal_dir, batch_size or app.config['INGESTION_BATCH_SIZE'])
+    lot = []
+    for nom, entree in reservees:
+        if entree is None or not entree.get('reference'):
+            ingestion_journal.reject(journal_dir, nom, 'Entrée illisible')
+            metrics.INGESTION_WRITTEN.labels('rejet').inc()
+        else:
+            lot.append((nom, entree))
+    if not lot:
+        return len(reservees)
+    
+    debut = time.perf_counter()
+    try:
+        inserees = insert_journal_entries(app, [entree for _, entree in lot])
+        db.session.commit()
+    except OperationalError:
+        db.session.rollback()
+        ingestion_journal.release(journal_dir, [nom for nom, _ in lot])
+        raise
+    except Exception as e:
+        db.session.rollback()
+        logger.warning(f"Lot du journal refusé ({str(e)}), insertion entrée par entrée")
+        inserees = 0
+        for position, (nom, entree) in enumerate(lot):
+            try:
+                inserees += insert_journal_entries(app, [entree])
+                db.session.commit()
+            except OperationalError:
+                db.session.rollback()
+                ingestion_journal.release(journal_dir, [nom for nom, _ in lot[position:]])
+                raise
+            except Exception as erreur:
+                db.session.rollback()
+                logger.error(f"Entrée {entree['reference']} du journal rejetée: {str(erreur)}")
+                ingestion_journal.reject(journal_dir, nom, erreur)
+                metrics.INGESTION_WRITTEN.labels('rejet').inc()
+                continue
+            ingestion_journal.complete(journal_dir, [nom])
+    else:
+        ingestion_journal.complete(journal_dir, [nom for nom, _ in lot])
+        metrics.INGESTION_WRITTEN.labels('deja_inseree').inc(len(lot) - inserees)
+    
+    metrics.INGESTION_BATCH_DURATION.observe(time.perf_counter() - debut)
+    metrics.INGESTION_WRITTEN.labels('inseree').inc(inserees)
+    logger.info(f"{inserees} candidature(s) du journal insérée(s) en {time.perf_counter() - debut:.2f} s")
+    return len(reservees)
+
+
+def run_ingestion_writer(app, once=False):
+    """Drainer le journal d'ingestion par lots (un seul processus suffit, plusieurs sont possibles)"""
+    journal_dir = app.config['INGESTION_JOURNAL_DIR']
+    ingestion_journal.ensure_dirs(journal_dir)
+    logger.info(f"Writer du journal d'ingestion démarré ({journal_dir})")
+    
+    while True:
+        repris = ingestion_journal.recover(journal_dir, app.config['INGESTION_LOCK_TIMEOUT'])
+        if repris:
+            logger.warning(f"{repris} entrée(s) du journal reprise(s) après l'arrêt d'un writer")
+        
+        try:
+            count = drain_ingestion_journal(app)
+        except OperationalError as e:
+            logger.error(f"Base indisponible, lot du journal remis en attente: {str(e)}")
+            count = 0
+        metrics.observe_backlog(*ingestion_journal.backlog(journal_dir))
+        
+        if count:
+            continue
+        if once:
+            return
+        time.sleep(app.config['INGESTION_POLL_INTERVAL'])
+
+
+# File d'attente des emails
+def queue_email(subject, recipients, body, sender):
+    """Ajouter un message à la file d'envoi dans la transaction courante"""
+    db.session.add(EmailQueue(
+        subject=subject,
+        sender=sender,
+        recipients=json.dumps(list(recipients)),
+        body=body
+    ))
+
+
+def claim_email_batch(app, worker_id):
+    """Réserver un lot d'emails à envoyer pour ce worker"""
+    now = datetime.utcnow()
+    stale = now - timedelta(seconds=app.config['MAIL_QUEUE_LOCK_TIMEOUT'])
+    disponible = db.or_(
+        db.and_(EmailQueue.statut == 'pending', EmailQueue.prochaine_tentative <= now),
+        # Envois abandonnés par un worker arrêté brutalement
+        db.and_(EmailQueue.statut == 'sending', EmailQueue.verrouille_le < stale)
+    )
+    
+    ids = [row.id for row in db.session.query(EmailQueue.id).filter(disponible).order_by(
+        EmailQueue.prochaine_tentative
+    ).limit(app.config['MAIL_QUEUE_BATCH_SIZE'])]
+    if not ids:
+        return []
+    
+    # Le filtre est répété dans l'UPDATE pour qu'un autre worker ne prenne pas les mêmes lignes
+    EmailQueue.query.filter(EmailQueue.id.in_(ids), disponible).update({
+        'statut': 'sending',
+        'verrouille_le': now,
+        'verrouille_par': worker_id
+    }, synchronize_session=False)
+    db.session.commit()
+    
+    return EmailQueue.query.filter_by(statut='sending', verrouille_par=worker_id).order_by(EmailQueue.id).all()
+
+
+def reschedule_email(item, error, app):
+    """Replanifier un envoi en échec, ou le passer en lettre morte"""
+    item.tentatives += 1
+    item.derniere_erreur = str(error)
+    item.verrouille_le = None
+    item.verrouille_par = None
+    
+    if item.tentatives >= app.config['MAIL_QUEUE_MAX_ATTEMPTS']:
+        item.statut = 'dead'
+        logger.error(f"Email {item.id} abandonné après {item.tentatives} tentatives: {error}")
+    else:
+        delai = app.config['MAIL_QUEUE_RETRY_DELAY'] * 2 ** (item.tentatives - 1)
+        item.statut = 'pending'
+        item.prochaine_tentative = datetime.utcnow() + timedelta(seconds=delai)
+        logger.warning(f"Email {item.id} replanifié dans {delai}s: {error}")
+
+
+def deliver_email_batch(connection, batch, app):
+    """Envoyer un lot sur une connexion SMTP déjà ouverte"""
+    import smtplib
+    for item in batch:
+        debut = time.perf_counter()
+        try:
+            connection.send(item.to_message())
+        except smtplib.SMTPServerDisconnected:
+            metrics.MAIL_SEND_DURATION.labels('deconnexion').observe(time.perf_counter() - debut)
+            # Connexion perdue: le reste du lot est replanifié par l'appelant
+            raise
+        except Exception as e:
+            metrics.MAIL_SEND_DURATION.labels('erreur').observe(time.perf_counter() - debut)
+            reschedule_email(item, e, app)
+        else:
+            metrics.MAIL_SEND_DURATION.labels('ok').observe(time.perf_counter() - debut)
+            item.statut = 'sent'
+            item.date_envoi = datetime.utcnow()
+            item.verrouille_par = None
+        # Commit par message pour ne jamais renvoyer un email déjà parti
+        db.session.commit()
+
+
+def run_mail_worker(app, once=False):
+    """Drainer la file d'emails en réutilisant une seule connexion SMTP"""
+    worker_id = uuid.uuid4().hex
+    logger.info(f"Worker email {worker_id} démarré")
+    
+    while True:
+        batch = claim_email_batch(app, worker_id)
+        if not batch:
+            if once:
+                return
+            time.sleep(app.config['MAIL_QUEUE_POLL_INTERVAL'])
+            continue
+        
+        try:
+            # Une connexion tant que la file n'est pas vide
+            with mail_extension(app).connect() as connection:
+                while batch:
+                    deliver_email_batch(connection, batch, app)
+                    logger.info(f"Lot de {len(batch)} email(s) traité")
+                    batch = claim_email_batch(app, worker_id)
+        except Exception as e:
+            logger.error(f"Erreur de connexion SMTP: {str(e)}")
+            db.session.rollback()
+            for item in EmailQueue.query.filter_by(statut='sending', verrouille_par=worker_id):
+                reschedule_email(item, e, app)
+            db.session.commit()
+
+
 if __name__ == '__main__':
     app = create_app()
     app.logger.setLevel(logging.DEBUG)  # Pour plus de logs
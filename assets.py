@@ -0,0 +1,143 @@
+import gzip
+import hashlib
+import json
+import os
+
+from markupsafe import Markup, escape
+
+# Feuilles de style et scripts des pages, construits par `flask assets-build`:
+#   static/css/<page>.css, static/js/<page>.js          sources (servies telles quelles sans build)
+#   static/dist/<page>.<empreinte>.(css|js)             minifié; l'empreinte change avec le contenu
+#   static/dist/<page>.<empreinte>.(css|js).(gz|br)     précompressé (gzip niveau 9, brotli qualité 11)
+#   static/dist/manifest.json                           bundle -> fichier construit
+# Les fichiers construits ne changent jamais: ils sont servis avec un cache immuable d'un an.
+DIST_DIR = 'dist'
+MANIFEST = 'manifest.json'
+# Encodages précompressés, par ordre de préférence
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+# Bundle -> sources (relatives au dossier static), concaténées dans l'ordre
+BUNDLES = {
+    'style.css': ['css/style.css'],
+    'index.css': ['css/index.css'],
+    'index.js': ['js/resumable-upload.js', 'js/index.js'],
+}
+for _page in ('home', 'confirmation', 'contact', 'admin_login', 'errors/404', 'errors/500',
+              'admin/login', 'admin/dashboard', 'admin/candidatures', 'admin/candidature_detail',
+              'admin/statistiques'):
+    BUNDLES[f'{_page}.css'] = [f'css/{_page}.css']
+    BUNDLES[f'{_page}.js'] = [f'js/{_page}.js']
+
+
+def load_manifest(static_folder):
+    """Manifeste du dernier build, ou None (sources servies séparément)"""
+    try:
+        with open(os.path.join(static_folder, DIST_DIR, MANIFEST), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def is_stale(static_folder):
+    """Une source a-t-elle été modifiée après le dernier build ? (mode debug)"""
+    try:
+        construit = os.stat(os.path.join(static_folder, DIST_DIR, MANIFEST)).st_mtime
+    except FileNotFoundError:
+        return True
+    return any(
+        os.stat(os.path.join(static_folder, source)).st_mtime > construit
+        for sources in BUNDLES.values() for source in sources
+    )
+
+
+def tags(bundle, urls):
+    """Balises <link>/<script> d'un bundle pour une liste d'URLs"""
+    if bundle.endswith('.css'):
+        modele = '<link rel="stylesheet" href="{}">'
+    else:
+        modele = '<script src="{}"></script>'
+    return Markup('\n    '.join(modele.format(escape(url)) for url in urls))
+
+
+def negotiate(path, accept_encodings):
+    """(Content-Encoding ou None, fichier à envoyer) selon Accept-Encoding et les fichiers précompressés"""
+    for encodage, extension in ENCODINGS:
+        if accept_encodings[encodage] and os.path.isfile(path + extension):
+            return encodage, path + extension
+    return None, path
+
+
+def _minify(bundle, contenu):
+    if bundle.endswith('.css'):
+        import rcssmin
+        return rcssmin.cssmin(contenu)
+    import rjsmin
+    return rjsmin.jsmin(contenu)
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporaire = f'{path}.tmp'
+    with open(temporaire, 'wb') as f:
+        f.write(data)
+    os.replace(temporaire, path)
+
+
+def build(static_folder, bundles=None):
+    """Construire les bundles dans static/dist; retourne [(bundle, fichier, tailles)].
+
+    tailles: octets des sources, minifié, gzip et brotli. Les fichiers du build
+    précédent sont conservés (pages encore en cache pendant un déploiement),
+    les plus anciens sont supprimés.
+    """
+    import brotli
+
+    bundles = bundles or BUNDLES
+    dist = os.path.join(static_folder, DIST_DIR)
+    precedent = load_manifest(static_folder) or {}
+    manifeste, resultats = {}, []
+    for bundle, sources in bundles.items():
+        contenus = []
+        for source in sources:
+            with open(os.path.join(static_folder, source), encoding='utf-8') as f:
+                contenus.append(f.read())
+        # ';' entre deux scripts: une source sans point-virgule final ne fusionne pas avec la suivante
+        contenu = ('\n' if bundle.endswith('.css') else ';\n').join(contenus)
+        data = _minify(bundle, contenu).encode('utf-8')
+        base, extension = os.path.splitext(bundle)
+        fichier = f'{base}.{hashlib.sha256(data).hexdigest()[:12]}{extension}'
+        chemin = os.path.join(dist, fichier)
+        compresse = {
+            # mtime=0: même contenu, même fichier .gz d'un build à l'autre
+            '.gz': gzip.compress(data, compresslevel=9, mtime=0),
+            '.br': brotli.compress(data, quality=11),
+        }
+        _write(chemin, data)
+        for extension_compression, donnees in compresse.items():
+            _write(chemin + extension_compression, donnees)
+        manifeste[bundle] = fichier
+        resultats.append((bundle, fichier, {
+            'sources': len(contenu.encode('utf-8')),
+            'minifie': len(data),
+            'gzip': len(compresse['.gz']),
+            'brotli': len(compresse['.br']),
+        }))
+
+    _write(os.path.join(dist, MANIFEST), json.dumps(manifeste, indent=2, sort_keys=True).encode('utf-8'))
+    _purge(dist, set(manifeste.values()) | set(precedent.values()))
+    return resultats
+
+
+def _purge(dist, conserves):
+    """Supprimer les fichiers construits absents des deux derniers manifestes"""
+    for dossier, _, noms in os.walk(dist):
+        for nom in noms:
+            chemin = os.path.join(dossier, nom)
+            relatif = os.path.relpath(chemin, dist).replace(os.sep, '/')
+            if relatif == MANIFEST:
+                continue
+            for _, extension in ENCODINGS:
+                if relatif.endswith(extension):
+                    relatif = relatif[:-len(extension)]
+            if relatif not in conserves:
+                os.remove(chemin)
@@ -0,0 +1 @@
+# Benchmarks de charge (voir benchmarks/run.py)
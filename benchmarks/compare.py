@@ -0,0 +1,77 @@
+"""Comparer deux fichiers de résultats de benchmarks.run.
+
+    python -m benchmarks.compare benchmarks/results/avant.json benchmarks/results/apres.json
+
+Code de sortie 1 si une route régresse au-delà de --threshold (en %) sur le
+p95, le débit ou le pic de RSS.
+"""
+import argparse
+import json
+import sys
+
+# (clé, libellé, sens: +1 si plus grand est pire)
+METRIQUES = (
+    (('latency_ms', 'p50'), 'p50 ms', 1),
+    (('latency_ms', 'p95'), 'p95 ms', 1),
+    (('latency_ms', 'p99'), 'p99 ms', 1),
+    (('throughput_rps',), 'req/s', -1),
+    (('peak_rss_mb',), 'RSS Mo', 1),
+)
+SURVEILLEES = {'p95 ms', 'req/s', 'RSS Mo'}
+
+
+def _valeur(resultat, cle):
+    for partie in cle:
+        resultat = (resultat or {}).get(partie)
+    return resultat
+
+
+def compare(avant, apres, threshold):
+    """Lignes du tableau de comparaison et liste des régressions"""
+    lignes, regressions = [], []
+    runs_avant = {run['backend']: run for run in avant['runs']}
+    for run in apres['runs']:
+        base = runs_avant.get(run['backend'])
+        if base is None:
+            continue
+        for scenario, resultat in run['routes'].items():
+            reference = base['routes'].get(scenario)
+            if reference is None:
+                continue
+            for cle, libelle, sens in METRIQUES:
+                a, b = _valeur(reference, cle), _valeur(resultat, cle)
+                if not a or b is None:
+                    continue
+                ecart = (b - a) / a * 100
+                lignes.append((run['backend'], scenario, libelle, a, b, ecart))
+                if libelle in SURVEILLEES and ecart * sens > threshold:
+                    regressions.append(f"{run['backend']} {scenario} {libelle}: {a} -> {b} ({ecart:+.1f} %)")
+    return lignes, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparer deux résultats de benchmarks")
+    parser.add_argument('avant')
+    parser.add_argument('apres')
+    parser.add_argument('--threshold', type=float, default=10.0, help="Régression tolérée en %%")
+    args = parser.parse_args()
+
+    with open(args.avant) as f:
+        avant = json.load(f)
+    with open(args.apres) as f:
+        apres = json.load(f)
+
+    print(f"{avant['meta'].get('git_commit')} -> {apres['meta'].get('git_commit')}")
+    lignes, regressions = compare(avant, apres, args.threshold)
+    for backend, scenario, libelle, a, b, ecart in lignes:
+        print(f"{backend:<10} {scenario:<30} {libelle:<8} {a:>10} {b:>10} {ecart:>+8.1f} %")
+
+    if regressions:
+        print(f"\n{len(regressions)} régression(s) au-delà de {args.threshold} %:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
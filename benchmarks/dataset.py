@@ -0,0 +1,191 @@
+"""Jeu de données synthétique pour les benchmarks.
+
+    DATABASE_URL=... UPLOAD_FOLDER=... python -m benchmarks.dataset --count 10000 --reset
+
+La base et le dossier d'upload sont ceux de la configuration (variables
+d'environnement), comme pour l'application. Le tirage est déterminé par --seed:
+deux exécutions avec les mêmes paramètres produisent les mêmes données.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Taille des documents en octets: (médiane, dispersion log-normale, minimum, maximum)
+DOCUMENT_SIZES = {
+    'cv': (250_000, 0.9, 20_000, 5_000_000),
+    'lettre_motivation': (90_000, 0.7, 10_000, 2_000_000),
+    'portfolio_fichier': (1_500_000, 0.8, 100_000, 15_000_000),
+}
+PORTFOLIO_RATE = 0.3
+
+# Contenus distincts par type de document; au-delà ils sont partagés (dédoublonnage)
+DISTINCT_DOCUMENTS = 200
+
+STATUT_WEIGHTS = {'Nouvelle': 55, 'En revue': 25, 'Contacté': 8, 'Rejeté': 12}
+
+PRENOMS = [
+    'Jean', 'Marie', 'Paul', 'Aminata', 'Ibrahim', 'Chantal', 'Serge', 'Nadège',
+    'Patrick', 'Florence', 'Hervé', 'Sandrine', 'Blaise', 'Josiane', 'Arnaud', 'Clarisse',
+]
+NOMS = [
+    'Dupont', 'Mbarga', 'Ngono', 'Fotso', 'Tchoupo', 'Essomba', 'Kamga', 'Nkoulou',
+    'Abena', 'Bello', 'Djoumessi', 'Ekotto', 'Manga', 'Onana', 'Talla', 'Yomba',
+]
+VILLES = [
+    'Douala', 'Yaoundé', 'Bafoussam', 'Garoua', 'Bamenda', 'Maroua', 'Ngaoundéré',
+    'Bertoua', 'Kribi', 'Limbé', 'Buea', 'Ebolowa', '',
+]
+COMPETENCES = [
+    'SEO', 'SEA', 'réseaux sociaux', 'community management', 'Google Analytics',
+    'emailing', 'rédaction web', 'Canva', 'Photoshop', 'WordPress', 'Meta Ads',
+    'growth hacking', 'marketing d\'influence', 'CRM', 'Mailchimp', 'TikTok',
+]
+
+
+def document_size(rng, champ):
+    mediane, dispersion, minimum, maximum = DOCUMENT_SIZES[champ]
+    return int(min(maximum, max(minimum, rng.lognormvariate(0, dispersion) * mediane)))
+
+
+def fake_document(rng, taille):
+    """Contenu de `taille` octets accepté comme PDF (signature correcte, corps aléatoire)"""
+    entete = b'%PDF-1.4\n'
+    return entete + rng.randbytes(max(0, taille - len(entete)))
+
+
+def fake_candidature(rng, index):
+    """Champs du formulaire /postuler d'un candidat fictif"""
+    prenom, nom = rng.choice(PRENOMS), rng.choice(NOMS)
+    competences = rng.sample(COMPETENCES, rng.randint(2, 6))
+    return {
+        'nom_complet': f'{prenom} {nom}',
+        'email': f'{prenom.lower()}.{nom.lower()}.{index}@example.org',
+        'telephone': f'+237 6{rng.randint(10000000, 99999999)}',
+        'ville': rng.choice(VILLES),
+        'portfolio_lien': f'https://portfolio.example.org/{index}' if rng.random() < 0.2 else '',
+        'motivation': (
+            f"Je souhaite rejoindre votre équipe marketing. Expérience en {competences[0]} "
+            f"et {competences[-1]}. " * rng.randint(1, 6)
+        ).strip(),
+        'competences': ', '.join(competences),
+    }
+
+
+def _store_documents(rng, upload_folder, champ, nombre):
+    """Écrire `nombre` contenus distincts dans le stockage; retourne [(chemin, sha256, taille)]"""
+    import document_store
+
+    stockes = []
+    for _ in range(nombre):
+        with tempfile.NamedTemporaryFile(dir=upload_folder, suffix='.pdf', delete=False) as f:
+            f.write(fake_document(rng, document_size(rng, champ)))
+        try:
+            stockes.append(document_store.import_file(f.name, upload_folder, 'pdf'))
+        finally:
+            os.remove(f.name)
+    return stockes
+
+
+def reset_database(app):
+    """Base vidée puis recréée (tables et index de recherche)"""
+    import search_index
+    from app import db
+
+    with app.app_context():
+        with db.engine.begin() as connection:
+            search_index.uninstall(connection)
+        db.drop_all()
+        db.create_all()
+        with db.engine.begin() as connection:
+            app.extensions['search_backend'] = search_index.install(connection)
+
+
+def generate(app, count, seed=0, batch_size=1000, distinct=DISTINCT_DOCUMENTS, days=120):
+    """Insérer `count` candidatures avec leurs documents; retourne les statistiques de génération"""
+    from app import db, Candidature, Document, reconcile_status_counters, backfill_daily_stats
+
+    rng = random.Random(seed)
+    upload_folder = app.config['UPLOAD_FOLDER']
+    debut = time.perf_counter()
+
+    with app.app_context():
+        documents = {
+            champ: _store_documents(rng, upload_folder, champ, min(distinct, count) or 1)
+            for champ in DOCUMENT_SIZES
+        }
+        references = {chemin: 0 for stockes in documents.values() for chemin, _, _ in stockes}
+
+        maintenant = datetime.utcnow()
+        statuts, poids = zip(*STATUT_WEIGHTS.items())
+        for lot in range(0, count, batch_size):
+            lignes = []
+            for index in range(lot, min(lot + batch_size, count)):
+                champs = fake_candidature(rng, index)
+                ligne = {
+                    'nom_complet': champs['nom_complet'],
+                    'email': champs['email'],
+                    'telephone': champs['telephone'],
+                    'ville': champs['ville'],
+                    'portfolio_lien': champs['portfolio_lien'],
+                    'lettre_motivation_text': champs['motivation'],
+                    'competences_marketing': champs['competences'],
+                    'texte_documents': f"Curriculum vitae {champs['nom_complet']}. {champs['competences']}.",
+                    'date_soumission': maintenant - timedelta(seconds=rng.randint(0, days * 86400)),
+                    'statut': rng.choices(statuts, poids)[0],
+                    'cv_path': rng.choice(documents['cv'])[0],
+                    'lettre_motivation_path': rng.choice(documents['lettre_motivation'])[0],
+                    'portfolio_fichier_path': (
+                        rng.choice(documents['portfolio_fichier'])[0] if rng.random() < PORTFOLIO_RATE else None
+                    ),
+                }
+                for champ in ('cv_path', 'lettre_motivation_path', 'portfolio_fichier_path'):
+                    if ligne[champ]:
+                        references[ligne[champ]] += 1
+                lignes.append(ligne)
+            db.session.execute(db.insert(Candidature), lignes)
+            db.session.commit()
+
+        db.session.execute(db.insert(Document), [
+            {'chemin': chemin, 'sha256': sha256, 'taille': taille, 'total': references[chemin]}
+            for stockes in documents.values() for chemin, sha256, taille in stockes
+        ])
+        db.session.commit()
+
+        # Compteurs et agrégats recalculés comme après une reprise de données
+        reconcile_status_counters()
+        backfill_daily_stats()
+
+    return {
+        'candidatures': count,
+        'documents': len(references),
+        'octets': sum(taille for stockes in documents.values() for _, _, taille in stockes),
+        'secondes': round(time.perf_counter() - debut, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Générer un jeu de candidatures synthétique")
+    parser.add_argument('--count', type=int, default=10000, help="Nombre de candidatures")
+    parser.add_argument('--seed', type=int, default=0, help="Graine du tirage aléatoire")
+    parser.add_argument('--distinct', type=int, default=DISTINCT_DOCUMENTS, help="Contenus distincts par type de document")
+    parser.add_argument('--days', type=int, default=120, help="Période couverte par les dates de soumission")
+    parser.add_argument('--reset', action='store_true', help="Vider la base avant la génération")
+    args = parser.parse_args()
+
+    from app import create_app
+
+    app = create_app()
+    if args.reset:
+        reset_database(app)
+    stats = generate(app, args.count, seed=args.seed, distinct=args.distinct, days=args.days)
+    print(
+        f"{stats['candidatures']} candidature(s), {stats['documents']} document(s) "
+        f"({stats['octets'] / 1e6:.1f} Mo) générés en {stats['secondes']} s"
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,513 @@
+"""Scénarios de charge contre un déploiement gunicorn local.
+
+    python -m benchmarks.run --count 10000 --workers 4
+    python -m benchmarks.run --database-url sqlite --database-url postgresql://bench@localhost/bench
+
+Pour chaque base: jeu de données synthétique (benchmarks.dataset), serveur SMTP
+local (benchmarks.smtp_stub), gunicorn démarré sur un port libre, puis chaque
+scénario est joué en boucle fermée par --concurrency clients pendant --duration
+secondes. Par route: latences p50/p95/p99, débit, erreurs et pic de RSS des
+processus gunicorn (lu dans /proc, Linux uniquement). Le drainage de la file
+d'emails par `flask mail-worker --once` est mesuré après /postuler, ainsi que celui
+du journal par `flask ingestion-writer --once` avec --ingestion-mode journal.
+
+Résultats en JSON (--output, par défaut benchmarks/results/<date>-<commit>.json),
+à comparer entre deux versions avec `python -m benchmarks.compare`.
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from urllib.parse import urlencode, urlsplit, urlunsplit
+
+from benchmarks.dataset import document_size, fake_candidature, fake_document
+from benchmarks.smtp_stub import SMTPStub
+from ingestion_journal import backlog
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+RESULTS_VERSION = 1
+
+ADMIN_USERNAME = 'admin'
+ADMIN_PASSWORD = 'benchmark'
+
+# Corps /postuler préparés d'avance: le client ne doit pas peser sur la mesure
+POSTULER_PAYLOADS = 20
+
+
+class Scenario:
+    """Route jouée en boucle; `request(rng)` retourne (méthode, chemin, corps, en-têtes)"""
+
+    def __init__(self, name, route, request, admin=True, concurrency=None):
+        self.name = name
+        self.route = route
+        self.request = request
+        self.admin = admin
+        self.concurrency = concurrency
+
+
+def multipart_body(champs, fichiers):
+    boundary = uuid.uuid4().hex
+    parties = []
+    for nom, valeur in champs.items():
+        parties.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{nom}"\r\n\r\n{valeur}\r\n'.encode('utf-8')
+        )
+    for nom, (filename, contenu) in fichiers.items():
+        parties.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{nom}"; filename="{filename}"\r\n'
+            f'Content-Type: application/pdf\r\n\r\n'.encode('utf-8') + contenu + b'\r\n'
+        )
+    parties.append(f'--{boundary}--\r\n'.encode('ascii'))
+    return b''.join(parties), f'multipart/form-data; boundary={boundary}'
+
+
+def build_scenarios(count, seed):
+    rng = random.Random(seed)
+    payloads = []
+    for index in range(POSTULER_PAYLOADS):
+        fichiers = {
+            'cv': ('cv.pdf', fake_document(rng, document_size(rng, 'cv'))),
+            'lettre_motivation': ('lettre.pdf', fake_document(rng, document_size(rng, 'lettre_motivation'))),
+        }
+        if rng.random() < 0.3:
+            fichiers['portfolio_fichier'] = ('portfolio.pdf', fake_document(rng, document_size(rng, 'portfolio_fichier')))
+        payloads.append(multipart_body(fake_candidature(rng, count + index), fichiers))
+
+    def postuler(rng):
+        corps, content_type = rng.choice(payloads)
+        return 'POST', '/postuler', corps, {'Content-Type': content_type}
+
+    def get(path):
+        return lambda rng: ('GET', path(rng) if callable(path) else path, None, {})
+
+    pages = max(1, count // 20)
+    return [
+        Scenario('postuler', 'postuler', postuler, admin=False),
+        Scenario('liste_candidatures', 'liste_candidatures', get('/admin/candidatures')),
+        Scenario('liste_candidatures_statut', 'liste_candidatures',
+                 get('/admin/candidatures?' + urlencode({'statut': 'En revue'}))),
+        Scenario('liste_candidatures_recherche', 'liste_candidatures',
+                 get(lambda rng: '/admin/candidatures?' + urlencode({'search': rng.choice(['SEO', 'Douala', 'Mbarga', 'Canva'])}))),
+        Scenario('liste_candidatures_page', 'liste_candidatures',
+                 get(lambda rng: f'/admin/candidatures?page={rng.randint(1, pages)}')),
+        Scenario('statistiques', 'statistiques', get('/admin/statistiques')),
+        Scenario('download_all_documents', 'download_all_documents',
+                 get(lambda rng: f'/admin/download-all/{rng.randint(1, max(1, count))}')),
+    ]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def percentile(valeurs, p):
+    """Percentile par rang le plus proche sur une liste triée"""
+    if not valeurs:
+        return None
+    return valeurs[min(len(valeurs) - 1, max(0, math.ceil(p / 100 * len(valeurs)) - 1))]
+
+
+def process_tree(pid):
+    """PID du processus et de ses descendants (via /proc)"""
+    enfants = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        enfants.setdefault(ppid, []).append(int(entry))
+    pids, pile = [], [pid]
+    while pile:
+        courant = pile.pop()
+        pids.append(courant)
+        pile.extend(enfants.get(courant, []))
+    return pids
+
+
+def rss_bytes(pid):
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for ligne in f:
+                if ligne.startswith('VmRSS:'):
+                    return int(ligne.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+class RSSSampler:
+    """Pic de RSS (total et par processus) de l'arbre de processus gunicorn"""
+
+    def __init__(self, pid, interval=0.05):
+        self.pid = pid
+        self.interval = interval
+        self.disponible = os.path.isdir('/proc')
+        self._stop = threading.Event()
+        self._thread = None
+        self.reset()
+
+    def reset(self):
+        self.pic_total = 0
+        self.pic_processus = 0
+
+    def sample(self):
+        if not self.disponible:
+            return
+        tailles = [rss_bytes(pid) for pid in process_tree(self.pid)]
+        self.pic_total = max(self.pic_total, sum(tailles))
+        self.pic_processus = max(self.pic_processus, max(tailles, default=0))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        if self.disponible:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+
+class Client:
+    """Requêtes HTTP vers le serveur de test, avec le cookie de session admin"""
+
+    def __init__(self, port, timeout=120):
+        self.port = port
+        self.timeout = timeout
+        self.cookie = None
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        if self.cookie:
+            headers['Cookie'] = self.cookie
+        # Nouvelle connexion par requête: les workers sync de gunicorn ne gardent pas la connexion
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=self.timeout)
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            while response.read(256 * 1024):
+                pass
+            return response
+        finally:
+            connection.close()
+
+    def login(self):
+        corps = urlencode({'username': ADMIN_USERNAME, 'password': ADMIN_PASSWORD})
+        response = self.request('POST', '/admin/login', corps, {'Content-Type': 'application/x-www-form-urlencoded'})
+        cookie = response.getheader('Set-Cookie')
+        if response.status != 302 or not cookie:
+            raise RuntimeError(f"Connexion admin impossible (HTTP {response.status})")
+        self.cookie = cookie.split(';', 1)[0]
+
+
+def run_scenario(port, scenario, cookie, concurrency, duration, warmup, seed):
+    """Boucle fermée: `concurrency` clients enchaînent les requêtes pendant `duration` secondes"""
+    latences, statuts, erreurs = [], {}, []
+    verrou = threading.Lock()
+    debut_mesure = time.perf_counter() + warmup
+    fin = debut_mesure + duration
+
+    def client(numero):
+        rng = random.Random(seed * 1000 + numero)
+        http_client = Client(port)
+        http_client.cookie = cookie if scenario.admin else None
+        while True:
+            debut = time.perf_counter()
+            if debut >= fin:
+                return
+            method, path, body, headers = scenario.request(rng)
+            try:
+                statut = http_client.request(method, path, body, headers).status
+            except (OSError, http.client.HTTPException) as e:
+                statut, message = 'erreur', f'{type(e).__name__}: {e}'
+            else:
+                message = None
+            latence = time.perf_counter() - debut
+            if debut < debut_mesure:
+                continue
+            with verrou:
+                latences.append(latence)
+                statuts[str(statut)] = statuts.get(str(statut), 0) + 1
+                if message and len(erreurs) < 5:
+                    erreurs.append(message)
+
+    threads = [threading.Thread(target=client, args=(numero,)) for numero in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    ecoule = max(time.perf_counter() - debut_mesure, 1e-9)
+
+    latences.sort()
+    en_erreur = sum(total for statut, total in statuts.items() if not statut.startswith(('2', '3')))
+    return {
+        'route': scenario.route,
+        'concurrency': concurrency,
+        'requests': len(latences),
+        'errors': en_erreur,
+        'status': statuts,
+        'error_samples': erreurs,
+        'throughput_rps': round((len(latences) - en_erreur) / ecoule, 2),
+        'latency_ms': {
+            'p50': _ms(percentile(latences, 50)),
+            'p95': _ms(percentile(latences, 95)),
+            'p99': _ms(percentile(latences, 99)),
+            'max': _ms(latences[-1] if latences else None),
+            'mean': _ms(sum(latences) / len(latences) if latences else None),
+        },
+    }
+
+
+def _ms(secondes):
+    return round(secondes * 1000, 2) if secondes is not None else None
+
+
+def backend_name(database_url):
+    return urlsplit(database_url).scheme.split('+', 1)[0]
+
+
+def redact(database_url):
+    """URL sans mot de passe, pour les résultats"""
+    parts = urlsplit(database_url)
+    if parts.password:
+        netloc = parts.netloc.replace(f':{parts.password}@', ':***@')
+        return urlunsplit(parts._replace(netloc=netloc))
+    return database_url
+
+
+def wait_ready(client, process, timeout=60):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn s'est arrêté au démarrage (code {process.returncode})")
+        try:
+            if client.request('GET', '/ready').status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("gunicorn ne répond pas sur /ready")
+
+
+def run_backend(database_url, args, workdir):
+    """Préparer la base, démarrer gunicorn et jouer les scénarios; retourne le résultat de la base"""
+    backend = backend_name(database_url)
+    upload_folder = os.path.join(workdir, f'uploads-{backend}')
+    os.makedirs(upload_folder, exist_ok=True)
+    metrics_dir = os.path.join(workdir, f'metrics-{backend}')
+    os.makedirs(metrics_dir, exist_ok=True)
+    log_path = os.path.join(workdir, f'gunicorn-{backend}.log')
+
+    smtp = SMTPStub(delay=args.smtp_delay).start()
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        UPLOAD_FOLDER=upload_folder,
+        DATE_LIMITE='2999-12-31',
+        ADMIN_USERNAME=ADMIN_USERNAME,
+        ADMIN_PASSWORD=ADMIN_PASSWORD,
+        MAIL_SERVER='127.0.0.1',
+        MAIL_PORT=str(smtp.port),
+        MAIL_USE_TLS='false',
+        MAIL_USE_SSL='false',
+        PREVIEW_WORKERS='0',
+        PROMETHEUS_MULTIPROC_DIR=metrics_dir,
+        INGESTION_MODE=args.ingestion_mode,
+        INGESTION_JOURNAL_DIR=os.path.join(workdir, f'journal-{backend}'),
+        # Tous les clients du benchmark ont la même IP
+        SUBMISSION_RATE_BURST='0',
+    )
+    env.pop('ADMIN_PASSWORD_HASH', None)
+    env.pop('MAIL_USERNAME', None)
+    env.pop('MAIL_PASSWORD', None)
+
+    print(f"[{backend}] génération de {args.count} candidature(s)...", flush=True)
+    debut = time.perf_counter()
+    subprocess.run(
+        [sys.executable, '-m', 'benchmarks.dataset', '--count', str(args.count), '--seed', str(args.seed), '--reset'],
+        cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL,
+    )
+    dataset = {'candidatures': args.count, 'seconds': round(time.perf_counter() - debut, 2)}
+
+    port = free_port()
+    with open(log_path, 'w') as log:
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '--workers', str(args.workers), '--bind', f'127.0.0.1:{port}',
+             '--timeout', '300', 'app:create_app()'],
+            cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT,
+        )
+    try:
+        client = Client(port)
+        wait_ready(client, process)
+        client.login()
+        sampler = RSSSampler(process.pid).start()
+
+        routes = {}
+        for scenario in build_scenarios(args.count, args.seed):
+            if args.scenario and scenario.name not in args.scenario:
+                continue
+            sampler.reset()
+            sampler.sample()
+            resultat = run_scenario(port, scenario, client.cookie, scenario.concurrency or args.concurrency,
+                                    args.duration, args.warmup, args.seed)
+            sampler.sample()
+            resultat['peak_rss_mb'] = round(sampler.pic_total / 2 ** 20, 1) if sampler.disponible else None
+            resultat['peak_process_rss_mb'] = round(sampler.pic_processus / 2 ** 20, 1) if sampler.disponible else None
+            routes[scenario.name] = resultat
+            latence = resultat['latency_ms']
+            print(
+                f"[{backend}] {scenario.name}: {resultat['throughput_rps']} req/s, "
+                f"p50 {latence['p50']} ms, p95 {latence['p95']} ms, p99 {latence['p99']} ms, "
+                f"{resultat['errors']} erreur(s), RSS {resultat['peak_rss_mb']} Mo",
+                flush=True,
+            )
+        sampler.stop()
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    # Journal alimenté par /postuler (mode journal), inséré par lots
+    ingestion_writer = None
+    if 'postuler' in routes and args.ingestion_mode == 'journal':
+        entrees, _ = backlog(env['INGESTION_JOURNAL_DIR'])
+        debut = time.perf_counter()
+        subprocess.run(
+            [sys.executable, '-m', 'flask', '--app', 'app.py', 'ingestion-writer', '--once'],
+            cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        secondes = time.perf_counter() - debut
+        ingestion_writer = {
+            'entries': entrees,
+            'seconds': round(secondes, 2),
+            'entries_per_second': round(entrees / secondes, 2) if secondes else None,
+        }
+        print(f"[{backend}] ingestion-writer: {entrees} candidature(s) en {secondes:.1f} s", flush=True)
+
+    # File d'emails alimentée par /postuler, drainée vers le SMTP local
+    mail_worker = None
+    if 'postuler' in routes:
+        recus = smtp.messages
+        debut = time.perf_counter()
+        subprocess.run(
+            [sys.executable, '-m', 'flask', '--app', 'app.py', 'mail-worker', '--once'],
+            cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        secondes = time.perf_counter() - debut
+        envoyes = smtp.messages - recus
+        mail_worker = {
+            'messages': envoyes,
+            'seconds': round(secondes, 2),
+            'messages_per_second': round(envoyes / secondes, 2) if secondes else None,
+        }
+        print(f"[{backend}] mail-worker: {envoyes} email(s) en {secondes:.1f} s", flush=True)
+    smtp.stop()
+
+    return {
+        'backend': backend,
+        'database_url': redact(database_url),
+        'dataset': dataset,
+        'routes': routes,
+        'ingestion_writer': ingestion_writer,
+        'mail_worker': mail_worker,
+        'log': log_path,
+    }
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                                    capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de charge de /postuler et de l'administration")
+    parser.add_argument('--database-url', action='append',
+                        help="Base à tester, répétable ('sqlite' pour une base SQLite temporaire; défaut: sqlite)")
+    parser.add_argument('--count', type=int, default=10000, help="Candidatures du jeu de données")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=4, help="Workers gunicorn")
+    parser.add_argument('--concurrency', type=int, default=8, help="Clients simultanés par scénario")
+    parser.add_argument('--duration', type=float, default=20, help="Durée mesurée par scénario (secondes)")
+    parser.add_argument('--warmup', type=float, default=2, help="Échauffement non mesuré (secondes)")
+    parser.add_argument('--scenario', action='append', help="Ne jouer que ce scénario (répétable)")
+    parser.add_argument('--ingestion-mode', choices=('direct', 'journal'), default='direct',
+                        help="INGESTION_MODE de /postuler (journal: insertion par `flask ingestion-writer`)")
+    parser.add_argument('--smtp-delay', type=float, default=0.0, help="Latence simulée du SMTP (secondes)")
+    parser.add_argument('--output', help="Fichier JSON des résultats")
+    parser.add_argument('--keep', action='store_true', help="Conserver le dossier de travail (bases, uploads, logs)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='scms-bench-')
+    commit, dirty = git_commit()
+    resultats = {
+        'version': RESULTS_VERSION,
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': commit,
+            'git_dirty': dirty,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'workers': args.workers,
+            'concurrency': args.concurrency,
+            'duration': args.duration,
+            'count': args.count,
+            'seed': args.seed,
+            'ingestion_mode': args.ingestion_mode,
+        },
+        'runs': [],
+    }
+    try:
+        for database_url in args.database_url or ['sqlite']:
+            if database_url == 'sqlite':
+                database_url = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+            resultats['runs'].append(run_backend(database_url, args, workdir))
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+            for run in resultats['runs']:
+                run.pop('log', None)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{commit or 'inconnu'}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(resultats, f, indent=2, ensure_ascii=False)
+    print(f"Résultats: {output}")
+
+
+if __name__ == '__main__':
+    main()
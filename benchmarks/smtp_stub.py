@@ -0,0 +1,98 @@
+"""Serveur SMTP local pour les benchmarks: accepte et compte les messages sans les envoyer.
+
+    python -m benchmarks.smtp_stub --port 2525 --delay 0.05
+
+--delay simule la latence d'un fournisseur SMTP (secondes par message).
+Les destinataires de `refuse` reçoivent une erreur 550 (tests de la file d'emails).
+"""
+import argparse
+import socketserver
+import threading
+import time
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        self.reply('220 smtp-stub ESMTP')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            verb = line[:4].upper()
+            if verb == b'EHLO':
+                self.wfile.write(b'250-smtp-stub\r\n250-8BITMIME\r\n250 SMTPUTF8\r\n')
+            elif verb == b'RCPT' and any(adresse.encode('ascii') in line for adresse in self.server.refuse):
+                self.reply('550 Mailbox unavailable')
+            elif verb in (b'HELO', b'MAIL', b'RCPT', b'RSET', b'NOOP'):
+                self.reply('250 OK')
+            elif verb == b'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                taille = 0
+                for ligne in iter(self.rfile.readline, b''):
+                    if ligne in (b'.\r\n', b'.\n'):
+                        break
+                    taille += len(ligne)
+                if self.server.delay:
+                    time.sleep(self.server.delay)
+                self.server.record(taille)
+                self.reply('250 OK')
+            elif verb == b'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+class SMTPStub(socketserver.ThreadingTCPServer):
+    """Serveur démarré dans un thread; `messages` compte les messages reçus"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=0, delay=0.0, refuse=()):
+        super().__init__((host, port), _SMTPHandler)
+        self.delay = delay
+        self.refuse = tuple(refuse)
+        self.messages = 0
+        self.octets = 0
+        self._lock = threading.Lock()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def record(self, taille):
+        with self._lock:
+            self.messages += 1
+            self.octets += taille
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur SMTP local qui accepte tous les messages")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=2525)
+    parser.add_argument('--delay', type=float, default=0.0, help="Latence simulée par message (secondes)")
+    args = parser.parse_args()
+
+    stub = SMTPStub(args.host, args.port, args.delay).start()
+    print(f"SMTP de test sur {args.host}:{stub.port}")
+    try:
+        while True:
+            time.sleep(10)
+            print(f"{stub.messages} message(s) reçu(s)")
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == '__main__':
+    main()
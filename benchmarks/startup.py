@@ -0,0 +1,265 @@
+"""Temps de démarrage d'un worker: import, create_app, première requête, et démarrage de gunicorn.
+
+    python -m benchmarks.startup --repeat 10 --workers 4
+
+Modes comparés:
+- schema: schéma créé au démarrage (SCHEMA_AUTO_CREATE), sans cache de bytecode Jinja;
+- migrations: schéma géré par `flask db upgrade` seulement, cache de bytecode
+  rempli par `flask templates-compile`;
+- migrations-preload: comme migrations, avec `gunicorn --preload` et
+  TEMPLATES_PRECOMPILE (application chargée une fois par le maître).
+
+Les mesures de l'application sont faites chacune dans un nouvel interpréteur.
+Pour gunicorn: délai jusqu'à ce que tous les workers aient chargé l'application
+(hook post_worker_init), délai de remplacement d'un worker tué, et RSS de
+l'arbre de processus. Résultats au format de benchmarks.run, comparables avec
+`python -m benchmarks.compare`.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.run import (
+    RESULTS_DIR, RESULTS_VERSION, ROOT, Client, free_port, git_commit, percentile, process_tree, rss_bytes,
+    wait_ready,
+)
+
+# Modules qui ne doivent pas être chargés par un worker web
+HEAVY_MODULES = ('flask_migrate', 'alembic', 'flask_mail', 'smtplib', 'multiprocessing')
+
+# Exécuté dans un nouvel interpréteur: durées en secondes et modules lourds chargés
+PROBE = """
+import json, sys, time
+debut = time.perf_counter()
+import app
+importe = time.perf_counter()
+application = app.create_app()
+cree = time.perf_counter()
+client = application.test_client()
+statut = client.get('/').status_code
+premiere = time.perf_counter()
+print(json.dumps({
+    'import': importe - debut,
+    'create_app': cree - importe,
+    'premiere_requete': premiere - cree,
+    'status': statut,
+    'modules': [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+# Hook gunicorn: horodatage de chaque worker prêt (application chargée)
+GUNICORN_CONFIG = """
+import os, time
+
+def post_worker_init(worker):
+    with open(os.environ['STARTUP_BENCH_READY'], 'a') as f:
+        f.write(f"{worker.pid} {time.time()}\\n")
+"""
+
+MODES = {
+    'schema': {'SCHEMA_AUTO_CREATE': 'true', 'preload': False},
+    'migrations': {'SCHEMA_AUTO_CREATE': 'false', 'preload': False},
+    'migrations-preload': {'SCHEMA_AUTO_CREATE': 'false', 'preload': True, 'TEMPLATES_PRECOMPILE': 'true'},
+}
+
+
+def summarize(durees):
+    """Résultat d'une mesure répétée, au format des routes de benchmarks.run"""
+    durees = sorted(durees)
+    return {
+        'requests': len(durees),
+        'latency_ms': {
+            'p50': _ms(percentile(durees, 50)),
+            'p95': _ms(percentile(durees, 95)),
+            'p99': _ms(percentile(durees, 99)),
+            'max': _ms(durees[-1] if durees else None),
+            'mean': _ms(sum(durees) / len(durees) if durees else None),
+        },
+    }
+
+
+def _ms(secondes):
+    return round(secondes * 1000, 2) if secondes is not None else None
+
+
+def ready_lines(path):
+    try:
+        with open(path) as f:
+            return [ligne.split() for ligne in f if ligne.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def wait_lines(path, nombre, process, timeout=60):
+    """Attendre `nombre` workers prêts; retourne leurs lignes (pid, horodatage)"""
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        lignes = ready_lines(path)
+        if len(lignes) >= nombre:
+            return lignes
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn s'est arrêté au démarrage (code {process.returncode})")
+        time.sleep(0.005)
+    raise RuntimeError(f"{nombre} worker(s) attendu(s), {len(ready_lines(path))} prêt(s)")
+
+
+def measure_app(env, repeat):
+    mesures = {'import': [], 'create_app': [], 'premiere_requete': []}
+    modules = set()
+    for _ in range(repeat):
+        sortie = subprocess.run(
+            [sys.executable, '-c', PROBE], cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+        ).stdout
+        resultat = json.loads(sortie.strip().splitlines()[-1])
+        if resultat['status'] != 200:
+            raise RuntimeError(f"GET / a répondu {resultat['status']}")
+        for cle in mesures:
+            mesures[cle].append(resultat[cle])
+        modules.update(resultat['modules'])
+    return mesures, sorted(modules)
+
+
+def measure_gunicorn(mode, env, workers, repeat, workdir):
+    preload = MODES[mode]['preload']
+    config_path = os.path.join(workdir, 'gunicorn_startup.py')
+    with open(config_path, 'w') as f:
+        f.write(GUNICORN_CONFIG)
+
+    prets, redemarrages, rss = [], [], []
+    for numero in range(repeat):
+        ready_path = os.path.join(workdir, f'ready-{mode}-{numero}.log')
+        port = free_port()
+        commande = [sys.executable, '-m', 'gunicorn', '--config', config_path, '--workers', str(workers),
+                    '--bind', f'127.0.0.1:{port}', '--timeout', '300']
+        if preload:
+            commande.append('--preload')
+        debut = time.time()
+        process = subprocess.Popen(
+            commande + ['app:create_app()'], cwd=ROOT, env=dict(env, STARTUP_BENCH_READY=ready_path),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            lignes = wait_lines(ready_path, workers, process)
+            prets.append(max(float(horodatage) for _, horodatage in lignes) - debut)
+            wait_ready(Client(port), process)
+            rss.append(sum(rss_bytes(pid) for pid in process_tree(process.pid)))
+
+            # Worker tué: délai jusqu'à ce que son remplaçant ait chargé l'application
+            arret = time.time()
+            os.kill(int(lignes[0][0]), signal.SIGKILL)
+            remplacant = wait_lines(ready_path, workers + 1, process)[-1]
+            redemarrages.append(float(remplacant[1]) - arret)
+        finally:
+            process.send_signal(signal.SIGTERM)
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    routes = {
+        'gunicorn_workers_prets': summarize(prets),
+        'gunicorn_remplacement_worker': summarize(redemarrages),
+    }
+    routes['gunicorn_workers_prets']['peak_rss_mb'] = round(max(rss) / 1024 / 1024, 1) if rss else None
+    return routes
+
+
+def prepare(workdir):
+    """Base migrée, dossiers et environnement communs à tous les modes"""
+    base = dict(
+        os.environ,
+        DATABASE_URL='sqlite:///' + os.path.join(workdir, 'startup.db'),
+        UPLOAD_FOLDER=os.path.join(workdir, 'uploads'),
+        PREVIEW_WORKERS='0',
+        PROMETHEUS_MULTIPROC_DIR=os.path.join(workdir, 'metrics'),
+    )
+    os.makedirs(base['UPLOAD_FOLDER'], exist_ok=True)
+    os.makedirs(base['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+    subprocess.run(
+        [sys.executable, '-m', 'flask', '--app', 'app.py', 'db', 'upgrade'],
+        cwd=ROOT, env=dict(base, SCHEMA_AUTO_CREATE='false'), check=True,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    return base
+
+
+def mode_env(base, mode, workdir):
+    options = MODES[mode]
+    env = dict(base, **{cle: valeur for cle, valeur in options.items() if cle != 'preload'})
+    if mode == 'schema':
+        env['JINJA_BYTECODE_CACHE_DIR'] = ''
+    else:
+        env['JINJA_BYTECODE_CACHE_DIR'] = os.path.join(workdir, 'jinja_cache')
+        subprocess.run(
+            [sys.executable, '-m', 'flask', '--app', 'app.py', 'templates-compile'],
+            cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+    return env
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Temps de démarrage des workers")
+    parser.add_argument('--repeat', type=int, default=10, help="Démarrages mesurés de l'application par mode")
+    parser.add_argument('--gunicorn-repeat', type=int, default=3, help="Démarrages de gunicorn par mode")
+    parser.add_argument('--workers', type=int, default=4, help="Workers gunicorn")
+    parser.add_argument('--mode', action='append', choices=sorted(MODES), help="Ne mesurer que ce mode (répétable)")
+    parser.add_argument('--output', help="Fichier JSON des résultats")
+    parser.add_argument('--keep', action='store_true', help="Conserver le dossier de travail")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='scms-startup-')
+    commit, dirty = git_commit()
+    resultats = {
+        'version': RESULTS_VERSION,
+        'meta': {
+            'benchmark': 'startup',
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': commit,
+            'git_dirty': dirty,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'workers': args.workers,
+            'repeat': args.repeat,
+        },
+        'runs': [],
+    }
+    try:
+        base = prepare(workdir)
+        for mode in args.mode or list(MODES):
+            env = mode_env(base, mode, workdir)
+            routes, modules = {}, None
+            if not MODES[mode]['preload']:
+                mesures, modules = measure_app(env, args.repeat)
+                routes.update({cle: summarize(durees) for cle, durees in mesures.items()})
+            routes.update(measure_gunicorn(mode, env, args.workers, args.gunicorn_repeat, workdir))
+            resultats['runs'].append({'backend': mode, 'routes': routes, 'heavy_modules': modules})
+
+            for nom, resultat in routes.items():
+                latences = resultat['latency_ms']
+                print(f"[{mode}] {nom:<30} p50 {latences['p50']:>9} ms  p95 {latences['p95']:>9} ms", flush=True)
+            if modules:
+                print(f"[{mode}] modules lourds chargés: {', '.join(modules)}", flush=True)
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{commit or 'inconnu'}-startup.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(resultats, f, indent=2, ensure_ascii=False)
+    print(f"Résultats: {output}")
+
+
+if __name__ == '__main__':
+    main()
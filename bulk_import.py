@@ -0,0 +1,196 @@
+import csv
+import io
+import json
+import re
+import unicodedata
+from datetime import datetime
+
+# Lecture et validation des fichiers d'import de candidatures (`flask candidatures-import`).
+# Les lignes sont lues en flux: le fichier n'est jamais chargé entièrement en mémoire.
+
+# En-têtes acceptés (normalisés par normalize_header) -> colonne de la table.
+# Les libellés de l'export CSV/XLSX de l'administration sont reconnus.
+COLUMN_ALIASES = {
+    'nom_complet': 'nom_complet', 'nom': 'nom_complet',
+    'email': 'email', 'e_mail': 'email', 'courriel': 'email',
+    'telephone': 'telephone', 'tel': 'telephone',
+    'ville': 'ville',
+    'portfolio_lien': 'portfolio_lien', 'lien_portfolio': 'portfolio_lien',
+    'lettre_motivation_text': 'lettre_motivation_text', 'lettre_de_motivation': 'lettre_motivation_text',
+    'motivation': 'lettre_motivation_text',
+    'competences_marketing': 'competences_marketing', 'competences': 'competences_marketing',
+    'notes_admin': 'notes_admin',
+    'statut': 'statut',
+    'date_soumission': 'date_soumission', 'date_de_soumission': 'date_soumission', 'date': 'date_soumission',
+    # Documents: chemin du fichier source, relatif au dossier des documents
+    'cv': 'cv', 'cv_path': 'cv', 'fichier_cv': 'cv',
+    'lettre_motivation': 'lettre_motivation', 'lettre_motivation_path': 'lettre_motivation',
+    'fichier_lettre': 'lettre_motivation',
+    'portfolio': 'portfolio_fichier', 'portfolio_fichier': 'portfolio_fichier',
+    'portfolio_fichier_path': 'portfolio_fichier',
+}
+
+# Longueurs maximales des colonnes texte bornées
+MAX_LENGTHS = {
+    'nom_complet': 200,
+    'email': 120,
+    'telephone': 20,
+    'ville': 100,
+    'portfolio_lien': 500,
+    'statut': 50,
+}
+
+DOCUMENT_FIELDS = ('cv', 'lettre_motivation', 'portfolio_fichier')
+
+DATE_FORMATS = ('%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%d/%m/%Y', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d')
+
+_EMAIL = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+
+class ImportRowError(ValueError):
+    """Ligne rejetée (le message est repris dans le fichier des rejets)"""
+
+
+class ImportSourceChangedError(Exception):
+    """Le fichier d'un import interrompu a été modifié: la reprise réinsérerait des lignes"""
+
+
+def normalize_header(header):
+    sans_accents = unicodedata.normalize('NFKD', header or '').encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '_', sans_accents.lower()).strip('_')
+
+
+def detect_format(path):
+    extension = path.rsplit('.', 1)[-1].lower() if '.' in path else ''
+    if extension in ('json', 'jsonl', 'ndjson'):
+        return 'json'
+    return 'csv'
+
+
+def _iter_csv(f):
+    echantillon = f.read(64 * 1024)
+    f.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(echantillon, delimiters=',;\t')
+    except csv.Error:
+        dialect = csv.excel
+    # Numéro de ligne du fichier (les champs sur plusieurs lignes sont possibles)
+    reader = csv.DictReader(f, dialect=dialect)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _iter_json(f, chunk_size=64 * 1024):
+    """Tableau JSON ou JSON Lines, décodé objet par objet"""
+    decoder = json.JSONDecoder()
+    tampon = f.read(chunk_size).lstrip()
+    dans_tableau = tampon.startswith('[')
+    if dans_tableau:
+        tampon = tampon[1:]
+    numero = 0
+    while True:
+        tampon = tampon.lstrip().lstrip(',').lstrip()
+        if dans_tableau and tampon.startswith(']'):
+            return
+        try:
+            objet, fin = decoder.raw_decode(tampon)
+        except ValueError:
+            suite = f.read(chunk_size)
+            if not suite:
+                if tampon.strip():
+                    raise ValueError(f"JSON invalide après l'objet {numero}")
+                return
+            tampon += suite
+            continue
+        numero += 1
+        yield numero, objet
+        tampon = tampon[fin:]
+
+
+def read_rows(path, format_=None, encoding='utf-8-sig'):
+    """Itérer sur (position, ligne brute) d'un fichier CSV ou JSON.
+
+    La position est le numéro de ligne (CSV) ou d'objet (JSON) dans le fichier.
+    """
+    with open(path, encoding=encoding, newline='') as f:
+        if (format_ or detect_format(path)) == 'json':
+            yield from _iter_json(f)
+        else:
+            yield from _iter_csv(f)
+
+
+def _parse_date(valeur):
+    if isinstance(valeur, datetime):
+        return valeur
+    valeur = str(valeur).strip()
+    try:
+        return datetime.fromisoformat(valeur.replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        pass
+    for format_ in DATE_FORMATS:
+        try:
+            return datetime.strptime(valeur, format_)
+        except ValueError:
+            continue
+    raise ImportRowError(f"Date invalide: {valeur}")
+
+
+def validate_row(brute, statuts, date_defaut):
+    """Colonnes de la candidature et documents à copier d'une ligne brute.
+
+    Retourne (valeurs, documents) où documents associe un champ de
+    DOCUMENT_FIELDS au chemin source; lève ImportRowError si la ligne est invalide.
+    """
+    if not isinstance(brute, dict):
+        raise ImportRowError("Objet attendu")
+
+    valeurs, documents = {}, {}
+    for entete, valeur in brute.items():
+        colonne = COLUMN_ALIASES.get(normalize_header(entete))
+        if colonne is None or valeur is None:
+            continue
+        valeur = valeur.strip() if isinstance(valeur, str) else valeur
+        if valeur == '':
+            continue
+        if colonne in DOCUMENT_FIELDS:
+            documents[colonne] = str(valeur)
+        else:
+            valeurs[colonne] = valeur
+
+    for colonne in ('nom_complet', 'email'):
+        if not valeurs.get(colonne):
+            raise ImportRowError(f"Colonne obligatoire manquante: {colonne}")
+    if not _EMAIL.match(str(valeurs['email'])):
+        raise ImportRowError(f"Email invalide: {valeurs['email']}")
+
+    for colonne, longueur in MAX_LENGTHS.items():
+        if colonne in valeurs:
+            valeurs[colonne] = str(valeurs[colonne])
+            if len(valeurs[colonne]) > longueur:
+                raise ImportRowError(f"{colonne} dépasse {longueur} caractères")
+
+    statut = valeurs.get('statut') or 'Nouvelle'
+    if statut not in statuts:
+        raise ImportRowError(f"Statut inconnu: {statut}")
+    valeurs['statut'] = statut
+
+    valeurs['date_soumission'] = _parse_date(valeurs['date_soumission']) if 'date_soumission' in valeurs else date_defaut
+    for colonne in ('lettre_motivation_text', 'competences_marketing', 'notes_admin'):
+        if colonne in valeurs:
+            valeurs[colonne] = str(valeurs[colonne])
+    return valeurs, documents
+
+
+def copy_rows_csv(lignes, colonnes):
+    """Tampon CSV des lignes pour COPY ... FROM STDIN (NULL: champ vide non entre guillemets)"""
+    tampon = io.StringIO()
+    writer = csv.writer(tampon, lineterminator='\n')
+    for ligne in lignes:
+        writer.writerow([
+            '' if ligne.get(colonne) is None else (
+                ligne[colonne].isoformat(sep=' ') if isinstance(ligne[colonne], datetime) else ligne[colonne]
+            )
+            for colonne in colonnes
+        ])
+    tampon.seek(0)
+    return tampon
@@ -13,10 +13,79 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'sqlite:///' + os.path.join(basedir, 'instance', 'scms_candidatures.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Lectures de l'administration (listes, statistiques, exports): réplica en lecture seule.
+    # Sans réplica, une base SQLite fichier utilise un pool en lecture seule (mode WAL).
+    SQLALCHEMY_READ_URI = os.environ.get('DATABASE_READ_URL')
+    SQLITE_READ_POOL = os.environ.get('SQLITE_READ_POOL', 'true').lower() in ['true', 'on', '1']
+    # Lectures maintenues sur le primaire après une écriture de l'admin (retard du réplica), en secondes
+    READ_AFTER_WRITE_WINDOW = int(os.environ.get('READ_AFTER_WRITE_WINDOW', 5))
     
     # Uploads
-    UPLOAD_FOLDER = os.path.join(basedir, 'static', 'uploads')
+    UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or os.path.join(basedir, 'static', 'uploads')
     MAX_CONTENT_LENGTH = 20 * 1024 * 1024  # 20MB
+    # Documents servis (/uploads, /admin/download): cache navigateur privé, en secondes
+    DOCUMENT_CACHE_MAX_AGE = int(os.environ.get('DOCUMENT_CACHE_MAX_AGE', 3600))
+    # Délégation de la lecture des fichiers au proxy: préfixe de la location interne nginx
+    # (alias vers UPLOAD_FOLDER) pour X-Accel-Redirect, ou X-Sendfile (Apache, lighttpd)
+    X_ACCEL_REDIRECT_PREFIX = os.environ.get('X_ACCEL_REDIRECT_PREFIX')
+    USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE', 'false').lower() in ['true', 'on', '1']
+    
+    # Aperçus des documents (pool de processus; 0 = uniquement via `flask previews-backfill`)
+    PREVIEW_WORKERS = int(os.environ.get('PREVIEW_WORKERS', 2))
+    
+    # Extraction du texte des documents (`flask text-worker`)
+    TEXT_WORKERS = int(os.environ.get('TEXT_WORKERS', 2))
+    TEXT_WORKER_BATCH_SIZE = int(os.environ.get('TEXT_WORKER_BATCH_SIZE', 100))
+    TEXT_WORKER_POLL_INTERVAL = float(os.environ.get('TEXT_WORKER_POLL_INTERVAL', 30))
+    TEXT_EXTRACTION_MAX_CHARS = int(os.environ.get('TEXT_EXTRACTION_MAX_CHARS', 100000))
+    
+    # Envois par morceaux (/api/uploads): expiration après inactivité, fréquence de purge
+    UPLOAD_EXPIRATION = int(os.environ.get('UPLOAD_EXPIRATION', 24 * 3600))
+    UPLOAD_EXPIRE_INTERVAL = int(os.environ.get('UPLOAD_EXPIRE_INTERVAL', 600))
+    # Délai avant suppression d'un contenu non référencé (`flask documents-gc`)
+    DOCUMENTS_GC_GRACE = int(os.environ.get('DOCUMENTS_GC_GRACE', 24 * 3600))
+    
+    # Ingestion de /postuler: 'direct' (insertion dans la requête) ou 'journal' (écriture durable
+    # dans un journal local, insertion par lots par `flask ingestion-writer`)
+    INGESTION_MODE = os.environ.get('INGESTION_MODE', 'direct').lower()
+    INGESTION_JOURNAL_DIR = os.environ.get('INGESTION_JOURNAL_DIR') or os.path.join(basedir, 'instance', 'ingestion')
+    INGESTION_BATCH_SIZE = int(os.environ.get('INGESTION_BATCH_SIZE', 200))
+    INGESTION_POLL_INTERVAL = float(os.environ.get('INGESTION_POLL_INTERVAL', 1))
+    INGESTION_LOCK_TIMEOUT = int(os.environ.get('INGESTION_LOCK_TIMEOUT', 300))  # reprise des lots d'un writer arrêté
+    # Au-delà de ce nombre d'entrées en attente, /postuler répond 503 (Retry-After)
+    INGESTION_MAX_BACKLOG = int(os.environ.get('INGESTION_MAX_BACKLOG', 20000))
+    # Limite par IP de /postuler (seau à jetons partagé par les workers): rafale, puis jetons
+    # regagnés par minute; 0 désactive (par défaut, active seulement en mode journal)
+    SUBMISSION_RATE_BURST = int(os.environ.get('SUBMISSION_RATE_BURST', 5 if INGESTION_MODE == 'journal' else 0))
+    SUBMISSION_RATE_PER_MINUTE = float(os.environ.get('SUBMISSION_RATE_PER_MINUTE', 2))
+    # Proxies de confiance devant l'application (nginx: 1). L'adresse du client (limite par IP,
+    # journaux) et le schéma sont lus dans X-Forwarded-For / X-Forwarded-Proto ajoutés par ces
+    # proxies; 0: adresse de la connexion (aucun proxy, en-têtes ignorés)
+    TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS', 0))
+    
+    # Compteurs par statut: nombre de lignes par statut (limite la contention en écriture)
+    STATUS_COUNTER_SLOTS = int(os.environ.get('STATUS_COUNTER_SLOTS', 8))
+    
+    # Compteur public de candidatures (/api/candidatures/count): durée de cache en secondes
+    PUBLIC_COUNT_CACHE_TTL = int(os.environ.get('PUBLIC_COUNT_CACHE_TTL', 60))
+    
+    # Liste admin: durée de cache du nombre total de résultats (secondes)
+    LIST_COUNT_CACHE_TTL = int(os.environ.get('LIST_COUNT_CACHE_TTL', 60))
+    
+    # Import en masse (`flask candidatures-import`): lignes par transaction, threads de copie des documents
+    IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 1000))
+    IMPORT_COPY_WORKERS = int(os.environ.get('IMPORT_COPY_WORKERS', 8))
+    
+    # Export ZIP groupé
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 100))
+    EXPORT_PREFETCH_WORKERS = int(os.environ.get('EXPORT_PREFETCH_WORKERS', 4))
+    EXPORT_PREFETCH_WINDOW = int(os.environ.get('EXPORT_PREFETCH_WINDOW', 8))  # fichiers ouverts d'avance
+    
+    # API admin
+    BULK_UPDATE_CHUNK_SIZE = int(os.environ.get('BULK_UPDATE_CHUNK_SIZE', 500))
+    API_PAGE_SIZE = 50
+    API_MAX_PAGE_SIZE = 500
+    API_STREAM_BATCH_SIZE = int(os.environ.get('API_STREAM_BATCH_SIZE', 1000))
     
     # Extensions autorisées
     ALLOWED_EXTENSIONS = {
@@ -32,7 +101,19 @@ class Config:
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER', 'noreply@example.com')
-    
+
+    # File d'attente des emails (worker: `flask mail-worker`)
+    MAIL_QUEUE_BATCH_SIZE = int(os.environ.get('MAIL_QUEUE_BATCH_SIZE', 50))
+    MAIL_QUEUE_MAX_ATTEMPTS = int(os.environ.get('MAIL_QUEUE_MAX_ATTEMPTS', 6))
+    MAIL_QUEUE_RETRY_DELAY = int(os.environ.get('MAIL_QUEUE_RETRY_DELAY', 30))  # secondes, doublé à chaque échec
+    MAIL_QUEUE_POLL_INTERVAL = float(os.environ.get('MAIL_QUEUE_POLL_INTERVAL', 5))
+    MAIL_QUEUE_LOCK_TIMEOUT = int(os.environ.get('MAIL_QUEUE_LOCK_TIMEOUT', 300))  # reprise des envois bloqués
+
+    # Instrumentation (/metrics): jeton Bearer exigé si défini; requêtes plus lentes (secondes)
+    # journalisées avec leur détail SQL
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    SLOW_REQUEST_THRESHOLD = float(os.environ.get('SLOW_REQUEST_THRESHOLD', 1.0))
+
     # Admin credentials
     ADMIN_USERNAME = os.environ.get('ADMIN_USERNAME', 'admin')
     ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD', 'admin123')  # Mot de passe en clair pour dev
@@ -40,7 +121,7 @@ class Config:
     
     # Application settings
     APPLICATION_NAME = "SCMS SARL - Candidatures"
-    DATE_LIMITE = datetime(2026, 1, 31).date()
+    DATE_LIMITE = datetime.strptime(os.environ.get('DATE_LIMITE', '2026-01-31'), '%Y-%m-%d').date()
     
     # Emails de contact
     EMAIL_CONTACT = os.environ.get('EMAIL_CONTACT', 'scsmaubma@gmail.com')
@@ -49,6 +130,26 @@ class Config:
     # Session settings
     PERMANENT_SESSION_LIFETIME = 3600  # 1 heure
     
+    # Démarrage des workers
+    # Création du schéma au démarrage (db.create_all + index plein texte); sinon `flask db upgrade` uniquement
+    SCHEMA_AUTO_CREATE = os.environ.get('SCHEMA_AUTO_CREATE', 'true').lower() in ['true', 'on', '1']
+    # Cache de bytecode des templates (vide: désactivé), rempli par `flask templates-compile`
+    JINJA_BYTECODE_CACHE_DIR = os.environ.get('JINJA_BYTECODE_CACHE_DIR', os.path.join(basedir, 'instance', 'jinja_cache'))
+    # Compiler tous les templates dans create_app (une seule fois pour tous les workers avec gunicorn --preload)
+    TEMPLATES_PRECOMPILE = os.environ.get('TEMPLATES_PRECOMPILE', 'false').lower() in ['true', 'on', '1']
+    
+    # Styles et scripts des pages
+    # Servir les bundles de `flask assets-build` (static/dist) quand ils existent; sinon les sources
+    ASSETS_BUNDLES = os.environ.get('ASSETS_BUNDLES', 'true').lower() in ['true', 'on', '1']
+    # Durée de cache des bundles (noms hachés: jamais modifiés)
+    ASSETS_MAX_AGE = int(os.environ.get('ASSETS_MAX_AGE', 365 * 24 * 3600))
+    
+    # Cache des pages publiques (accueil, formulaire, contact, confirmation), en mémoire de chaque worker
+    PAGE_CACHE = os.environ.get('PAGE_CACHE', 'true').lower() in ['true', 'on', '1']
+    PAGE_CACHE_MAX_ENTRIES = int(os.environ.get('PAGE_CACHE_MAX_ENTRIES', 64))
+    # Cache-Control max-age des pages (0: revalidation à chaque visite, réponse 304 si inchangée)
+    PAGE_CACHE_MAX_AGE = int(os.environ.get('PAGE_CACHE_MAX_AGE', 0))
+    
     @staticmethod
     def init_app(app):
         # Créer les dossiers nécessaires
@@ -61,12 +162,16 @@ class Config:
 
 class DevelopmentConfig(Config):
     DEBUG = True
+    # En développement, les templates modifiés sont rechargés: pas de cache des pages par défaut
+    PAGE_CACHE = os.environ.get('PAGE_CACHE', 'false').lower() in ['true', 'on', '1']
 
 
 class ProductionConfig(Config):
     DEBUG = False
     # En production, utiliser PostgreSQL ou MySQL
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
+    # En production, le schéma est géré par les migrations (`flask db upgrade` avant le déploiement)
+    SCHEMA_AUTO_CREATE = os.environ.get('SCHEMA_AUTO_CREATE', 'false').lower() in ['true', 'on', '1']
     # En production, SECRET_KEY doit être définie dans les variables d'environnement
     SECRET_KEY = os.environ.get('SECRET_KEY')
 
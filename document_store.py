@@ -0,0 +1,120 @@
+import hashlib
+import os
+import shutil
+import time
+import uuid
+
+from werkzeug.security import safe_join
+
+from upload_pipeline import PARTIAL_DIR
+
+# Stockage adressé par contenu: UPLOAD_FOLDER/documents/ab/cd/<sha256>.<ext>
+# Les chemins relatifs à UPLOAD_FOLDER sont ceux enregistrés dans Candidature.
+STORE_DIR = 'documents'
+
+
+def store_path(sha256, extension):
+    """Chemin relatif (à UPLOAD_FOLDER) d'un contenu"""
+    filename = f"{sha256}.{extension}" if extension else sha256
+    return '/'.join((STORE_DIR, sha256[:2], sha256[2:4], filename))
+
+
+def is_stored(path):
+    return bool(path) and path.startswith(STORE_DIR + '/')
+
+
+def _reuse(destination):
+    """Le contenu est-il déjà stocké ? Si oui, sa date est remise à maintenant.
+
+    La nouvelle référence n'est comptée qu'au commit de la candidature: d'ici
+    là, le contenu peut sembler orphelin, et le ramasse-miettes ne supprime que
+    ceux inchangés depuis le délai de grâce.
+    """
+    try:
+        os.utime(destination)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def commit_upload(stream, upload_folder, extension):
+    """Placer un StreamingUpload dans le stockage; retourne (chemin, nouveau)"""
+    path = store_path(stream.sha256, extension)
+    destination = os.path.join(upload_folder, *path.split('/'))
+
+    if _reuse(destination):
+        # Contenu déjà présent: le fichier reçu est abandonné (supprimé à la fermeture)
+        stream.close()
+        return path, False
+
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    stream.commit(destination)
+    return path, True
+
+
+def hash_file(filepath, chunk_size=1024 * 1024):
+    sha256 = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def import_file(filepath, upload_folder, extension=None):
+    """Copier un fichier existant dans le stockage; retourne (chemin, sha256, taille).
+
+    L'original n'est pas supprimé: l'appelant le retire une fois la base à jour.
+    """
+    if extension is None:
+        name = os.path.basename(filepath)
+        extension = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+    sha256 = hash_file(filepath)
+    taille = os.path.getsize(filepath)
+    path = store_path(sha256, extension)
+    destination = os.path.join(upload_folder, *path.split('/'))
+
+    if not _reuse(destination):
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        try:
+            # Lien physique: ni copie ni fenêtre où la destination serait incomplète
+            os.link(filepath, destination)
+        except FileExistsError:
+            pass
+        except OSError:
+            partial_folder = os.path.join(upload_folder, PARTIAL_DIR)
+            os.makedirs(partial_folder, exist_ok=True)
+            temporary = os.path.join(partial_folder, uuid.uuid4().hex)
+            shutil.copyfile(filepath, temporary)
+            os.replace(temporary, destination)
+    return path, sha256, taille
+
+
+def resolve(upload_folder, path):
+    """Chemin absolu d'un document enregistré (stockage par contenu ou ancien nom à plat)"""
+    if not path or any(part.startswith('.') for part in path.split('/')):
+        # Fichiers techniques (réceptions en cours) jamais servis
+        return None
+    return safe_join(upload_folder, path)
+
+
+def iter_stored(upload_folder):
+    """Parcourir les contenus stockés: (chemin relatif, chemin absolu)"""
+    root = os.path.join(upload_folder, STORE_DIR)
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            absolute = os.path.join(dirpath, filename)
+            yield os.path.relpath(absolute, upload_folder).replace(os.sep, '/'), absolute
+
+
+def purge_partials(upload_folder, older_than):
+    """Supprimer les réceptions interrompues plus anciennes que `older_than` secondes"""
+    root = os.path.join(upload_folder, PARTIAL_DIR)
+    if not os.path.isdir(root):
+        return 0
+    limite = time.time() - older_than
+    count = 0
+    for entry in os.scandir(root):
+        if entry.is_file() and entry.stat().st_mtime < limite:
+            os.remove(entry.path)
+            count += 1
+    return count
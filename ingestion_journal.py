@@ -0,0 +1,128 @@
+import json
+import os
+import secrets
+import time
+import uuid
+
+# Journal d'ingestion des candidatures (INGESTION_MODE=journal).
+# Une candidature acceptée est écrite de façon durable avant la réponse, puis
+# insérée en base par lots par `flask ingestion-writer`. Sur disque, partagé par
+# tous les workers:
+#   <journal>/tmp/         entrée en cours d'écriture
+#   <journal>/pending/     entrées à insérer (fsync puis renommage depuis tmp/)
+#   <journal>/processing/  entrées réservées par un writer
+#   <journal>/rejets/      entrées impossibles à insérer, avec leur erreur (.erreur)
+# Les noms commencent par l'horodatage d'acceptation: l'ordre d'arrivée est conservé.
+TMP_DIR = 'tmp'
+PENDING_DIR = 'pending'
+PROCESSING_DIR = 'processing'
+REJECTED_DIR = 'rejets'
+
+
+def ensure_dirs(journal_dir):
+    for nom in (TMP_DIR, PENDING_DIR, PROCESSING_DIR, REJECTED_DIR):
+        os.makedirs(os.path.join(journal_dir, nom), exist_ok=True)
+
+
+def new_reference():
+    """Référence remise au candidat avant l'insertion; empêche aussi d'insérer deux fois une entrée"""
+    return f"DEP-{time.strftime('%Y%m%d')}-{secrets.token_hex(4).upper()}"
+
+
+def _fsync_dir(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def spool(journal_dir, entree):
+    """Écrire une entrée de façon durable; retourne son nom"""
+    nom = f"{time.time_ns():020d}-{uuid.uuid4().hex}.json"
+    temporaire = os.path.join(journal_dir, TMP_DIR, nom)
+    with open(temporaire, 'w', encoding='utf-8') as f:
+        json.dump(entree, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    pending = os.path.join(journal_dir, PENDING_DIR)
+    os.rename(temporaire, os.path.join(pending, nom))
+    _fsync_dir(pending)
+    return nom
+
+
+def backlog(journal_dir):
+    """(entrées en attente ou en cours d'insertion, âge en secondes de la plus ancienne)"""
+    noms = []
+    for dossier in (PENDING_DIR, PROCESSING_DIR):
+        try:
+            noms.extend(entry.name for entry in os.scandir(os.path.join(journal_dir, dossier)))
+        except FileNotFoundError:
+            pass
+    if not noms:
+        return 0, 0.0
+    plus_ancienne = int(min(noms).split('-', 1)[0]) / 1e9
+    return len(noms), max(0.0, time.time() - plus_ancienne)
+
+
+def claim(journal_dir, limit):
+    """Réserver les `limit` plus anciennes entrées; retourne [(nom, entrée ou None si illisible)]"""
+    pending = os.path.join(journal_dir, PENDING_DIR)
+    processing = os.path.join(journal_dir, PROCESSING_DIR)
+    reservees = []
+    for nom in sorted(os.listdir(pending))[:limit]:
+        chemin = os.path.join(processing, nom)
+        try:
+            # Renommage atomique: une entrée n'est réservée que par un seul writer
+            os.rename(os.path.join(pending, nom), chemin)
+        except FileNotFoundError:
+            continue
+        # Date de réservation, pour la reprise après l'arrêt d'un writer (recover)
+        os.utime(chemin)
+        try:
+            with open(chemin, encoding='utf-8') as f:
+                reservees.append((nom, json.load(f)))
+        except ValueError:
+            reservees.append((nom, None))
+    return reservees
+
+
+def complete(journal_dir, noms):
+    """Supprimer des entrées insérées (après le commit)"""
+    for nom in noms:
+        try:
+            os.remove(os.path.join(journal_dir, PROCESSING_DIR, nom))
+        except FileNotFoundError:
+            pass
+
+
+def release(journal_dir, noms):
+    """Remettre des entrées réservées en attente (nouvel essai au prochain lot)"""
+    for nom in noms:
+        try:
+            os.rename(os.path.join(journal_dir, PROCESSING_DIR, nom), os.path.join(journal_dir, PENDING_DIR, nom))
+        except FileNotFoundError:
+            pass
+
+
+def reject(journal_dir, nom, erreur):
+    """Écarter une entrée réservée dans rejets/, avec son erreur"""
+    rejets = os.path.join(journal_dir, REJECTED_DIR)
+    with open(os.path.join(rejets, f'{nom}.erreur'), 'w', encoding='utf-8') as f:
+        f.write(str(erreur))
+    os.rename(os.path.join(journal_dir, PROCESSING_DIR, nom), os.path.join(rejets, nom))
+
+
+def recover(journal_dir, older_than):
+    """Remettre en attente les entrées réservées depuis `older_than` secondes (writer arrêté)"""
+    processing = os.path.join(journal_dir, PROCESSING_DIR)
+    limite = time.time() - older_than
+    noms = []
+    for entry in os.scandir(processing):
+        try:
+            if entry.stat().st_mtime < limite:
+                noms.append(entry.name)
+        except FileNotFoundError:
+            continue
+    release(journal_dir, noms)
+    return len(noms)
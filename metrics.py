@@ -0,0 +1,161 @@
+import os
+import re
+import time
+
+from flask import g, has_request_context
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess
+from sqlalchemy import event
+
+# Métriques Prometheus exposées sur /metrics.
+# Sous gunicorn, PROMETHEUS_MULTIPROC_DIR doit désigner un dossier vidé à chaque
+# démarrage et défini avant le lancement des processus: chaque worker y écrit ses
+# valeurs et /metrics agrège tous les processus de l'hôte (workers web,
+# `flask mail-worker`, `flask text-worker`). Sans cette variable, seules les
+# valeurs du processus qui répond sont exposées.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+REQUESTS = Counter(
+    'scms_http_requests_total', 'Requêtes HTTP traitées',
+    ['route', 'method', 'status']
+)
+REQUEST_DURATION = Histogram(
+    'scms_http_request_duration_seconds', "Durée des requêtes HTTP, jusqu'à la fin des réponses streamées",
+    ['route', 'method'], buckets=LATENCY_BUCKETS
+)
+SQL_QUERIES = Histogram(
+    'scms_sql_queries_per_request', 'Requêtes SQL exécutées par requête HTTP',
+    ['route'], buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 1000)
+)
+SQL_DURATION = Histogram(
+    'scms_sql_duration_seconds_per_request', 'Temps SQL cumulé par requête HTTP',
+    ['route'], buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 10)
+)
+FILE_IO_BYTES = Counter(
+    'scms_file_io_bytes_total', 'Octets de documents écrits (upload) ou envoyés (download, zip)',
+    ['operation']
+)
+FILE_IO_DURATION = Histogram(
+    'scms_file_io_duration_seconds', 'Durée des écritures et envois de documents',
+    ['operation'], buckets=LATENCY_BUCKETS
+)
+MAIL_SEND_DURATION = Histogram(
+    'scms_mail_send_duration_seconds', "Durée d'envoi SMTP d'un email",
+    ['result'], buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+SUBMISSIONS = Counter(
+    'scms_submissions_total', "Soumissions de /postuler: enregistrées (direct), journalisées, ou refusées",
+    ['result']
+)
+# Mis à jour à chaque lecture de /metrics et par le writer; valeur du dernier processus à l'avoir mesurée
+INGESTION_BACKLOG = Gauge(
+    'scms_ingestion_backlog', "Candidatures du journal en attente d'insertion",
+    multiprocess_mode='livemostrecent'
+)
+INGESTION_BACKLOG_AGE = Gauge(
+    'scms_ingestion_backlog_age_seconds', "Âge de la plus ancienne candidature en attente d'insertion",
+    multiprocess_mode='livemostrecent'
+)
+INGESTION_WRITTEN = Counter(
+    'scms_ingestion_entries_total', 'Entrées du journal traitées par le writer',
+    ['result']
+)
+INGESTION_BATCH_DURATION = Histogram(
+    'scms_ingestion_batch_duration_seconds', "Durée d'insertion d'un lot du journal",
+    buckets=LATENCY_BUCKETS
+)
+PAGE_CACHE = Counter(
+    'scms_page_cache_total', 'Pages publiques servies depuis le cache (hit), rendues (miss) ou non cachables (bypass)',
+    ['route', 'result']
+)
+
+_SPACES = re.compile(r'\s+')
+
+
+class RequestMetrics:
+    """Mesures d'une requête HTTP en cours (stockée dans g.metrics)"""
+
+    def __init__(self):
+        self.debut = time.perf_counter()
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        # Requête SQL normalisée -> [exécutions, secondes]
+        self.statements = {}
+
+    def record_query(self, statement, duree):
+        self.sql_count += 1
+        self.sql_seconds += duree
+        cle = _SPACES.sub(' ', statement).strip()[:300]
+        cumul = self.statements.setdefault(cle, [0, 0.0])
+        cumul[0] += 1
+        cumul[1] += duree
+
+    def finish(self, route, method, status):
+        """Enregistrer la requête terminée; retourne sa durée en secondes"""
+        duree = time.perf_counter() - self.debut
+        REQUESTS.labels(route, method, str(status)).inc()
+        REQUEST_DURATION.labels(route, method).observe(duree)
+        SQL_QUERIES.labels(route).observe(self.sql_count)
+        SQL_DURATION.labels(route).observe(self.sql_seconds)
+        return duree
+
+    def summary(self, limit=5):
+        """Répartition du temps SQL, requêtes les plus coûteuses d'abord"""
+        lignes = [f"{self.sql_count} requête(s) SQL en {self.sql_seconds * 1000:.1f} ms"]
+        plus_couteuses = sorted(self.statements.items(), key=lambda item: item[1][1], reverse=True)
+        for statement, (nombre, secondes) in plus_couteuses[:limit]:
+            lignes.append(f"  {nombre}x {secondes * 1000:.1f} ms  {statement}")
+        return '\n'.join(lignes)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_debuts', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    debuts = conn.info.get('metrics_debuts')
+    if not debuts:
+        return
+    duree = time.perf_counter() - debuts.pop()
+    if has_request_context():
+        suivi = g.get('metrics')
+        if suivi is not None:
+            suivi.record_query(statement, duree)
+
+
+def _handle_error(exception_context):
+    # Requête en erreur: after_cursor_execute n'est pas appelé
+    connection = exception_context.connection
+    if connection is not None and connection.info.get('metrics_debuts'):
+        connection.info['metrics_debuts'].pop()
+
+
+def instrument_engine(engine):
+    """Compter les requêtes SQL de `engine` et leur durée dans la requête HTTP courante"""
+    if event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        return
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(engine, 'handle_error', _handle_error)
+
+
+def observe_file_io(operation, octets, secondes=None):
+    FILE_IO_BYTES.labels(operation).inc(octets)
+    if secondes is not None:
+        FILE_IO_DURATION.labels(operation).observe(secondes)
+
+
+def observe_backlog(entrees, age):
+    INGESTION_BACKLOG.set(entrees)
+    INGESTION_BACKLOG_AGE.set(age)
+
+
+def render():
+    """Corps et type de contenu de /metrics (tous les processus en mode multiprocessus)"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,75 @@
+"""schema initial (candidatures, email_queue, index plein texte)
+
+Revision ID: 3f1c9a2b7d10
+Revises: 
+Create Date: 2026-10-18 10:05:00.000000
+
+Les bases créées avant Flask-Migrate par db.create_all() ont déjà ces
+tables: elles sont ignorées si présentes.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import search_index
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a2b7d10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table('candidatures'):
+        op.create_table('candidatures',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('nom_complet', sa.String(length=200), nullable=False),
+            sa.Column('email', sa.String(length=120), nullable=False),
+            sa.Column('telephone', sa.String(length=20), nullable=True),
+            sa.Column('ville', sa.String(length=100), nullable=True),
+            sa.Column('portfolio_lien', sa.String(length=500), nullable=True),
+            sa.Column('cv_path', sa.String(length=500), nullable=True),
+            sa.Column('lettre_motivation_path', sa.String(length=500), nullable=True),
+            sa.Column('lettre_motivation_text', sa.Text(), nullable=True),
+            sa.Column('portfolio_fichier_path', sa.String(length=500), nullable=True),
+            sa.Column('competences_marketing', sa.Text(), nullable=True),
+            sa.Column('date_soumission', sa.DateTime(), nullable=True),
+            sa.Column('statut', sa.String(length=50), nullable=True),
+            sa.Column('notes_admin', sa.Text(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if not inspector.has_table('email_queue'):
+        op.create_table('email_queue',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('subject', sa.String(length=255), nullable=False),
+            sa.Column('sender', sa.String(length=255), nullable=True),
+            sa.Column('recipients', sa.Text(), nullable=False),
+            sa.Column('body', sa.Text(), nullable=True),
+            sa.Column('statut', sa.String(length=20), nullable=True),
+            sa.Column('tentatives', sa.Integer(), nullable=False),
+            sa.Column('prochaine_tentative', sa.DateTime(), nullable=True),
+            sa.Column('verrouille_le', sa.DateTime(), nullable=True),
+            sa.Column('verrouille_par', sa.String(length=32), nullable=True),
+            sa.Column('derniere_erreur', sa.Text(), nullable=True),
+            sa.Column('date_creation', sa.DateTime(), nullable=True),
+            sa.Column('date_envoi', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_email_queue_statut', 'email_queue', ['statut'])
+        op.create_index('ix_email_queue_prochaine_tentative', 'email_queue', ['prochaine_tentative'])
+
+    search_index.install(op.get_bind())
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        for suffix in ('_ai', '_ad', '_au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {search_index.FTS_TABLE}{suffix}")
+        op.execute(f"DROP TABLE IF EXISTS {search_index.FTS_TABLE}")
+    op.drop_table('email_queue')
+    op.drop_table('candidatures')
@@ -0,0 +1,40 @@
+"""agrégat quotidien des statistiques (jour x statut x ville)
+
+Revision ID: 5b8f1e3d9c42
+Revises: c7d2e9f4a613
+Create Date: 2026-10-18 11:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8f1e3d9c42'
+down_revision = 'c7d2e9f4a613'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not sa.inspect(op.get_bind()).has_table('stats_quotidiennes'):
+        op.create_table('stats_quotidiennes',
+            sa.Column('jour', sa.Date(), nullable=False),
+            sa.Column('statut', sa.String(length=50), nullable=False),
+            sa.Column('ville', sa.String(length=100), nullable=False),
+            sa.Column('total', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('jour', 'statut', 'ville')
+        )
+
+    # Initialisation depuis les candidatures existantes (date() existe sous SQLite et PostgreSQL)
+    op.execute("DELETE FROM stats_quotidiennes")
+    op.execute(
+        "INSERT INTO stats_quotidiennes (jour, statut, ville, total) "
+        "SELECT date(date_soumission), COALESCE(statut, ''), COALESCE(TRIM(ville), ''), COUNT(*) "
+        "FROM candidatures "
+        "GROUP BY date(date_soumission), COALESCE(statut, ''), COALESCE(TRIM(ville), '')"
+    )
+
+
+def downgrade():
+    op.drop_table('stats_quotidiennes')
@@ -0,0 +1,39 @@
+"""index composites de la liste admin, date_soumission non nulle
+
+Revision ID: 8a4e6d0c5b21
+Revises: 3f1c9a2b7d10
+Create Date: 2026-10-18 10:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import search_index
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4e6d0c5b21'
+down_revision = '3f1c9a2b7d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Le tri keyset (date_soumission, id) suppose une date toujours renseignée
+    op.execute("UPDATE candidatures SET date_soumission = CURRENT_TIMESTAMP WHERE date_soumission IS NULL")
+    with op.batch_alter_table('candidatures') as batch_op:
+        batch_op.alter_column('date_soumission', existing_type=sa.DateTime(), nullable=False)
+    # Sur SQLite la table est recréée: ses triggers FTS doivent l'être aussi
+    search_index.install(op.get_bind())
+
+    # IF NOT EXISTS: db.create_all() a pu créer ces index sur les bases récentes
+    op.execute("CREATE INDEX IF NOT EXISTS ix_candidatures_statut_date_id ON candidatures (statut, date_soumission, id)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_candidatures_date_id ON candidatures (date_soumission, id)")
+
+
+def downgrade():
+    op.drop_index('ix_candidatures_date_id', table_name='candidatures')
+    op.drop_index('ix_candidatures_statut_date_id', table_name='candidatures')
+    with op.batch_alter_table('candidatures') as batch_op:
+        batch_op.alter_column('date_soumission', existing_type=sa.DateTime(), nullable=True)
+    search_index.install(op.get_bind())
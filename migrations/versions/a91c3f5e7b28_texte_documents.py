@@ -0,0 +1,47 @@
+"""texte extrait des documents, indexé avec les champs du formulaire
+
+Revision ID: a91c3f5e7b28
+Revises: e2a7b4c81f05
+Create Date: 2026-10-18 14:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import search_index
+
+
+# revision identifiers, used by Alembic.
+revision = 'a91c3f5e7b28'
+down_revision = 'e2a7b4c81f05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table('textes_documents'):
+        op.create_table('textes_documents',
+            sa.Column('sha256', sa.String(length=64), nullable=False),
+            sa.Column('statut', sa.String(length=20), nullable=False),
+            sa.Column('texte', sa.Text(), nullable=True),
+            sa.Column('date_extraction', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('sha256')
+        )
+
+    # Le schéma de l'index change (nouvelle colonne): triggers et table FTS recréés
+    search_index.uninstall(bind)
+    if 'texte_documents' not in {col['name'] for col in inspector.get_columns('candidatures')}:
+        op.add_column('candidatures', sa.Column('texte_documents', sa.Text(), nullable=True))
+    search_index.install(bind)
+    # Les documents existants sont traités par `flask text-worker`
+
+
+def downgrade():
+    bind = op.get_bind()
+    search_index.uninstall(bind)
+    with op.batch_alter_table('candidatures') as batch_op:
+        batch_op.drop_column('texte_documents')
+    search_index.install(bind)
+    op.drop_table('textes_documents')
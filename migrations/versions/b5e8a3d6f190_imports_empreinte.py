@@ -0,0 +1,30 @@
+"""points de reprise de l'import identifiés par l'empreinte du fichier
+
+Revision ID: b5e8a3d6f190
+Revises: f3b9d1c7e254
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e8a3d6f190'
+down_revision = 'f3b9d1c7e254'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'fichier' not in {col['name'] for col in inspector.get_columns('imports_candidatures')}:
+        op.add_column('imports_candidatures', sa.Column('fichier', sa.String(length=255), nullable=True))
+    if 'ix_imports_candidatures_fichier' not in {index['name'] for index in inspector.get_indexes('imports_candidatures')}:
+        op.create_index('ix_imports_candidatures_fichier', 'imports_candidatures', ['fichier'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_imports_candidatures_fichier', table_name='imports_candidatures')
+    with op.batch_alter_table('imports_candidatures') as batch_op:
+        batch_op.drop_column('fichier')
@@ -0,0 +1,37 @@
+"""compteurs de candidatures par statut
+
+Revision ID: c7d2e9f4a613
+Revises: 8a4e6d0c5b21
+Create Date: 2026-10-18 10:45:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d2e9f4a613'
+down_revision = '8a4e6d0c5b21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not sa.inspect(op.get_bind()).has_table('compteurs_statut'):
+        op.create_table('compteurs_statut',
+            sa.Column('statut', sa.String(length=50), nullable=False),
+            sa.Column('slot', sa.Integer(), nullable=False),
+            sa.Column('total', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('statut', 'slot')
+        )
+
+    # Initialisation depuis les candidatures existantes
+    op.execute("DELETE FROM compteurs_statut")
+    op.execute(
+        "INSERT INTO compteurs_statut (statut, slot, total) "
+        "SELECT COALESCE(statut, ''), 0, COUNT(*) FROM candidatures GROUP BY COALESCE(statut, '')"
+    )
+
+
+def downgrade():
+    op.drop_table('compteurs_statut')
@@ -0,0 +1,33 @@
+"""points de reprise de l'import en masse des candidatures
+
+Revision ID: d4c6b2e8a017
+Revises: a91c3f5e7b28
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4c6b2e8a017'
+down_revision = 'a91c3f5e7b28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not sa.inspect(op.get_bind()).has_table('imports_candidatures'):
+        op.create_table('imports_candidatures',
+            sa.Column('source', sa.String(length=255), nullable=False),
+            sa.Column('position', sa.Integer(), nullable=False),
+            sa.Column('inserees', sa.Integer(), nullable=False),
+            sa.Column('rejetees', sa.Integer(), nullable=False),
+            sa.Column('termine', sa.Boolean(), nullable=False),
+            sa.Column('date_maj', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('source')
+        )
+
+
+def downgrade():
+    op.drop_table('imports_candidatures')
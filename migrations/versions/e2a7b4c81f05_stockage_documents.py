@@ -0,0 +1,35 @@
+"""stockage des documents par empreinte (références)
+
+Revision ID: e2a7b4c81f05
+Revises: 5b8f1e3d9c42
+Create Date: 2026-10-18 12:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a7b4c81f05'
+down_revision = '5b8f1e3d9c42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Les fichiers existants restent à plat: `flask documents-migrate` les déplace
+    if not sa.inspect(op.get_bind()).has_table('documents'):
+        op.create_table('documents',
+            sa.Column('chemin', sa.String(length=255), nullable=False),
+            sa.Column('sha256', sa.String(length=64), nullable=False),
+            sa.Column('taille', sa.BigInteger(), nullable=True),
+            sa.Column('total', sa.Integer(), nullable=False),
+            sa.Column('date_creation', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('chemin')
+        )
+        op.create_index(op.f('ix_documents_sha256'), 'documents', ['sha256'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_documents_sha256'), table_name='documents')
+    op.drop_table('documents')
@@ -0,0 +1,36 @@
+"""référence de dépôt des candidatures reçues par le journal d'ingestion
+
+Revision ID: f3b9d1c7e254
+Revises: d4c6b2e8a017
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import search_index
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b9d1c7e254'
+down_revision = 'd4c6b2e8a017'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'reference_depot' not in {col['name'] for col in inspector.get_columns('candidatures')}:
+        op.add_column('candidatures', sa.Column('reference_depot', sa.String(length=32), nullable=True))
+    if 'ix_candidatures_reference_depot' not in {index['name'] for index in inspector.get_indexes('candidatures')}:
+        op.create_index('ix_candidatures_reference_depot', 'candidatures', ['reference_depot'], unique=True)
+
+
+def downgrade():
+    bind = op.get_bind()
+    op.drop_index('ix_candidatures_reference_depot', table_name='candidatures')
+    # La table est recréée sous SQLite: triggers de l'index plein texte supprimés puis réinstallés
+    search_index.uninstall(bind)
+    with op.batch_alter_table('candidatures') as batch_op:
+        batch_op.drop_column('reference_depot')
+    search_index.install(bind)
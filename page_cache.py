@@ -0,0 +1,74 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+
+from flask import Response
+
+# Cache des pages publiques rendues, en mémoire de chaque worker.
+# Clé: (route, préfixe de l'application, jour, version) où la version regroupe
+# tout ce qui entre dans la page en dehors de la date (configuration, manifeste
+# des bundles): une modification donne une nouvelle clé, les anciennes entrées
+# sortent du cache par ancienneté (LRU).
+
+# Corps de la page, sa version gzip et son ETag (empreinte du contenu)
+Entry = namedtuple('Entry', ['body', 'gzip_body', 'etag', 'mimetype'])
+
+
+class PageCache:
+    """Pages rendues par clé (LRU borné, partagé par les threads du worker)"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entree = self._entries.get(key)
+            if entree is not None:
+                self._entries.move_to_end(key)
+            return entree
+
+    def set(self, key, entree):
+        with self._lock:
+            self._entries[key] = entree
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def make_entry(response):
+    """Entrée de cache d'une réponse rendue (200, corps en mémoire)"""
+    body = response.get_data()
+    return Entry(
+        body=body,
+        # mtime=0: même page, même version gzip
+        gzip_body=gzip.compress(body, compresslevel=6, mtime=0),
+        etag=hashlib.sha256(body).hexdigest()[:20],
+        mimetype=response.mimetype,
+    )
+
+
+def respond(entree, request, max_age):
+    """Réponse d'une entrée: gzip si accepté, ETag par encodage et 304 si la page n'a pas changé"""
+    if request.accept_encodings['gzip']:
+        body, etag = entree.gzip_body, f'{entree.etag}-gz'
+        headers = {'Content-Encoding': 'gzip'}
+    else:
+        body, etag = entree.body, entree.etag
+        headers = {}
+    headers['ETag'] = f'"{etag}"'
+    headers['Vary'] = 'Accept-Encoding'
+    # max-age 0: revalidation à chaque visite (304 sans rendu tant que la page est en cache)
+    headers['Cache-Control'] = f'public, max-age={max_age}' if max_age else 'public, no-cache'
+    if etag in request.if_none_match:
+        return Response(status=304, headers=headers)
+    return Response(body, mimetype=entree.mimetype, headers=headers)
@@ -0,0 +1,99 @@
+import os
+import uuid
+
+import document_store
+
+# Aperçus des documents, rangés par empreinte comme le stockage:
+#   UPLOAD_FOLDER/.previews/ab/cd/<sha256>-preview.webp  (première page, lisible)
+#   UPLOAD_FOLDER/.previews/ab/cd/<sha256>-thumb.webp    (vignette de la fiche)
+# Le dossier commence par un point: il n'est pas servi par /uploads.
+PREVIEWS_DIR = '.previews'
+
+# Largeur en pixels de chaque variante
+SIZES = {
+    'preview': 1000,
+    'thumb': 240,
+}
+
+PDF_EXTENSIONS = {'pdf'}
+IMAGE_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif'}
+PREVIEWABLE_EXTENSIONS = PDF_EXTENSIONS | IMAGE_EXTENSIONS
+
+
+def _sha256_of(chemin):
+    return chemin.rsplit('/', 1)[-1].split('.', 1)[0]
+
+
+def can_preview(chemin):
+    """Aperçu possible: contenu du stockage par empreinte, PDF ou image"""
+    if not document_store.is_stored(chemin):
+        return False
+    return chemin.rsplit('.', 1)[-1].lower() in PREVIEWABLE_EXTENSIONS
+
+
+def preview_path(upload_folder, chemin, taille):
+    """Chemin absolu d'une variante d'aperçu (existante ou non)"""
+    sha256 = _sha256_of(chemin)
+    return os.path.join(upload_folder, PREVIEWS_DIR, sha256[:2], sha256[2:4], f'{sha256}-{taille}.webp')
+
+
+def has_previews(upload_folder, chemin):
+    return all(os.path.exists(preview_path(upload_folder, chemin, taille)) for taille in SIZES)
+
+
+def _first_page(source, extension, width):
+    """Image PIL de la première page (PDF) ou de la première image, d'environ `width` pixels de large"""
+    from PIL import Image
+
+    if extension in PDF_EXTENSIONS:
+        import pypdfium2
+
+        pdf = pypdfium2.PdfDocument(source)
+        try:
+            page = pdf[0]
+            # Rendu directement à la taille voulue: pas de page pleine résolution en mémoire
+            image = page.render(scale=width / page.get_width()).to_pil()
+            page.close()
+        finally:
+            pdf.close()
+        return image
+
+    image = Image.open(source)
+    # JPEG: décodage réduit (1/2, 1/4, 1/8) quand l'original est bien plus grand
+    image.draft('RGB', (width, int(width * image.height / max(image.width, 1))))
+    image.seek(0)
+    return image
+
+
+def render_previews(upload_folder, chemin):
+    """Générer les variantes manquantes d'un document; exécuté dans un processus du pool.
+
+    Retourne le nombre de fichiers écrits (0 si tout existait déjà).
+    """
+    from PIL import Image
+
+    source = document_store.resolve(upload_folder, chemin)
+    extension = chemin.rsplit('.', 1)[-1].lower()
+    manquantes = [taille for taille in SIZES if not os.path.exists(preview_path(upload_folder, chemin, taille))]
+    if not manquantes:
+        return 0
+
+    image = _first_page(source, extension, max(SIZES[taille] for taille in manquantes))
+    try:
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+        for taille in sorted(manquantes, key=SIZES.get, reverse=True):
+            # Réductions successives: chaque vignette part de la précédente
+            largeur = SIZES[taille]
+            if image.width > largeur:
+                image = image.resize((largeur, max(1, round(image.height * largeur / image.width))), Image.LANCZOS)
+
+            destination = preview_path(upload_folder, chemin, taille)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            temporary = f'{destination}.{uuid.uuid4().hex}'
+            image.save(temporary, 'WEBP', quality=80, method=4)
+            os.replace(temporary, destination)
+    finally:
+        image.close()
+    return len(manquantes)
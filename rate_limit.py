@@ -0,0 +1,58 @@
+import fcntl
+import hashlib
+import os
+import time
+
+# Limitation de débit par seau à jetons, partagée par tous les workers de l'hôte.
+# Un fichier par clé (IP), verrouillé pendant la mise à jour:
+#   <dossier>/ab/<sha256 de la clé>  "jetons horodatage"
+
+
+def _path(state_dir, cle):
+    empreinte = hashlib.sha256(cle.encode('utf-8')).hexdigest()
+    return os.path.join(state_dir, empreinte[:2], empreinte)
+
+
+def take_token(state_dir, cle, capacite, par_seconde):
+    """Consommer un jeton du seau de `cle`.
+
+    Retourne 0 si la requête est admise, sinon le délai en secondes avant
+    le prochain jeton (pour Retry-After). Le seau contient au plus
+    `capacite` jetons et en regagne `par_seconde` par seconde.
+    """
+    chemin = _path(state_dir, cle)
+    os.makedirs(os.path.dirname(chemin), exist_ok=True)
+    with open(os.open(chemin, os.O_RDWR | os.O_CREAT, 0o600), 'r+') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        maintenant = time.time()
+        try:
+            jetons, dernier = (float(valeur) for valeur in f.read().split())
+        except ValueError:
+            # Nouveau seau (ou contenu illisible): plein
+            jetons, dernier = capacite, maintenant
+        jetons = min(capacite, jetons + max(0.0, maintenant - dernier) * par_seconde)
+        if jetons < 1:
+            return (1 - jetons) / par_seconde
+        f.seek(0)
+        f.truncate()
+        f.write(f"{jetons - 1} {maintenant}")
+        return 0
+
+
+def purge(state_dir, max_age):
+    """Supprimer les seaux inchangés depuis `max_age` secondes (de nouveau pleins); retourne leur nombre"""
+    if not os.path.isdir(state_dir):
+        return 0
+    limite = time.time() - max_age
+    count = 0
+    for dossier in os.scandir(state_dir):
+        if not dossier.is_dir():
+            continue
+        for entry in os.scandir(dossier.path):
+            try:
+                if entry.stat().st_mtime < limite:
+                    os.remove(entry.path)
+                    count += 1
+            except FileNotFoundError:
+                continue
+    return count
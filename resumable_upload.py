@@ -0,0 +1,202 @@
+import base64
+import binascii
+import fcntl
+import json
+import os
+import re
+import time
+import uuid
+
+import document_store
+from upload_pipeline import HEAD_SIZE, matches_signature
+
+# Envois par morceaux (protocole tus 1.0: creation, expiration, termination).
+# État sur disque, partagé par tous les workers:
+#   UPLOAD_FOLDER/.uploads/<id>.part  octets reçus (leur taille est l'offset)
+#   UPLOAD_FOLDER/.uploads/<id>.json  métadonnées; modifié à chaque morceau
+UPLOADS_DIR = '.uploads'
+TUS_VERSION = '1.0.0'
+TUS_EXTENSIONS = 'creation,expiration,termination'
+
+_UPLOAD_ID = re.compile(r'^[0-9a-f]{32}$')
+
+
+class UploadError(Exception):
+    """Requête d'envoi refusée (avec le code HTTP à renvoyer)"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _paths(upload_folder, upload_id):
+    root = os.path.join(upload_folder, UPLOADS_DIR)
+    return os.path.join(root, f'{upload_id}.part'), os.path.join(root, f'{upload_id}.json')
+
+
+def _write_meta(meta_path, meta):
+    temporary = f'{meta_path}.{uuid.uuid4().hex}'
+    with open(temporary, 'w') as f:
+        json.dump(meta, f)
+    os.replace(temporary, meta_path)
+
+
+def parse_metadata(header):
+    """Décoder l'en-tête Upload-Metadata ("clé base64,clé base64")"""
+    metadata = {}
+    for pair in (header or '').split(','):
+        parts = pair.strip().split(' ', 1)
+        if not parts[0]:
+            continue
+        try:
+            metadata[parts[0]] = base64.b64decode(parts[1]).decode('utf-8') if len(parts) > 1 else ''
+        except (binascii.Error, UnicodeDecodeError):
+            raise UploadError('Upload-Metadata invalide')
+    return metadata
+
+
+def create_upload(upload_folder, length, filename, extension):
+    """Réserver un envoi de `length` octets; retourne son identifiant"""
+    upload_id = uuid.uuid4().hex
+    part_path, meta_path = _paths(upload_folder, upload_id)
+    os.makedirs(os.path.dirname(part_path), exist_ok=True)
+
+    open(part_path, 'wb').close()
+    _write_meta(meta_path, {
+        'id': upload_id,
+        'length': length,
+        'filename': filename,
+        'extension': extension,
+        'created': time.time(),
+    })
+    return upload_id
+
+
+def load_upload(upload_folder, upload_id):
+    """Métadonnées d'un envoi, avec son offset courant; None s'il n'existe pas"""
+    if not _UPLOAD_ID.match(upload_id or ''):
+        return None
+    part_path, meta_path = _paths(upload_folder, upload_id)
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        meta['activite'] = os.path.getmtime(meta_path)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    if meta.get('chemin'):
+        meta['offset'] = meta['length']
+    else:
+        try:
+            meta['offset'] = os.path.getsize(part_path)
+        except FileNotFoundError:
+            return None
+    return meta
+
+
+def completed_upload(upload_folder, upload_id):
+    """Envoi terminé et validé (clé 'chemin' dans le stockage), sinon None"""
+    meta = load_upload(upload_folder, upload_id)
+    return meta if meta and meta.get('chemin') else None
+
+
+def append_chunk(upload_folder, upload_id, offset, stream, chunk_size=64 * 1024):
+    """Ajouter le corps d'un PATCH à partir de `offset`; retourne les métadonnées à jour.
+
+    Les octets reçus avant une coupure sont conservés: le client reprend à
+    l'offset renvoyé par HEAD.
+    """
+    meta = load_upload(upload_folder, upload_id)
+    if meta is None:
+        raise UploadError('Envoi inconnu ou expiré', 404)
+    if meta.get('chemin'):
+        raise UploadError('Envoi déjà terminé', 409)
+
+    part_path, meta_path = _paths(upload_folder, upload_id)
+    with open(part_path, 'ab') as f:
+        # Un seul PATCH à la fois par envoi, quel que soit le worker
+        fcntl.flock(f, fcntl.LOCK_EX)
+        current = f.seek(0, os.SEEK_END)
+        if offset != current:
+            raise UploadError(f'Upload-Offset attendu: {current}', 409)
+
+        restant = meta['length'] - current
+        try:
+            while restant > 0:
+                chunk = stream.read(min(chunk_size, restant))
+                if not chunk:
+                    break
+                f.write(chunk)
+                restant -= len(chunk)
+        finally:
+            f.flush()
+            os.utime(meta_path)
+
+        if restant == 0 and stream.read(1):
+            # Morceau refusé en entier: l'offset revient à sa valeur précédente
+            f.truncate(current)
+            raise UploadError('Le contenu dépasse Upload-Length', 413)
+
+        if restant == 0:
+            os.fsync(f.fileno())
+            meta.update(_finalize(upload_folder, meta, part_path, meta_path))
+
+    meta['offset'] = meta['length'] - restant
+    return meta
+
+
+def _finalize(upload_folder, meta, part_path, meta_path):
+    """Vérifier la signature puis placer le fichier dans le stockage par empreinte"""
+    with open(part_path, 'rb') as f:
+        head = f.read(HEAD_SIZE)
+    if not matches_signature(meta['extension'], head):
+        delete_upload(upload_folder, meta['id'])
+        raise UploadError(f"Contenu non conforme à l'extension .{meta['extension']}", 415)
+
+    chemin, sha256, taille = document_store.import_file(part_path, upload_folder, meta['extension'])
+    meta = dict(meta, chemin=chemin, sha256=sha256, taille=taille)
+    _write_meta(meta_path, {key: value for key, value in meta.items() if key not in ('offset', 'activite')})
+    os.remove(part_path)
+    return meta
+
+
+def delete_upload(upload_folder, upload_id):
+    """Abandonner un envoi (les contenus déjà stockés relèvent de documents-gc)"""
+    if not _UPLOAD_ID.match(upload_id or ''):
+        return False
+    removed = False
+    for path in _paths(upload_folder, upload_id):
+        try:
+            os.remove(path)
+            removed = True
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def expire_uploads(upload_folder, max_age):
+    """Supprimer les envois sans activité depuis `max_age` secondes"""
+    root = os.path.join(upload_folder, UPLOADS_DIR)
+    if not os.path.isdir(root):
+        return 0
+    limite = time.time() - max_age
+    count = 0
+    for entry in os.scandir(root):
+        try:
+            if entry.stat().st_mtime >= limite:
+                continue
+        except FileNotFoundError:
+            continue
+
+        if entry.name.endswith('.json'):
+            count += delete_upload(upload_folder, entry.name[:-len('.json')])
+        elif entry.name.endswith('.part') and os.path.exists(entry.path[:-len('.part')] + '.json'):
+            # L'activité d'un envoi se lit sur ses métadonnées
+            continue
+        else:
+            # .part sans métadonnées, écriture de métadonnées interrompue
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+    return count
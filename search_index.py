@@ -0,0 +1,166 @@
+# Index plein texte des candidatures
+# - SQLite: table virtuelle FTS5 (contenu externe) tenue à jour par triggers
+# - PostgreSQL: colonne tsvector ('french' + unaccent) tenue à jour par trigger, index GIN
+# - Autres bases: recherche ILIKE sur les mêmes colonnes
+import re
+from sqlalchemy import column, func, inspect, literal_column, or_, table, text
+
+# Colonnes indexées et leur poids (bm25 côté SQLite, setweight côté PostgreSQL)
+INDEXED_COLUMNS = (
+    ('nom_complet', 10.0, 'A'),
+    ('competences_marketing', 5.0, 'B'),
+    ('ville', 2.0, 'C'),
+    ('email', 2.0, 'C'),
+    ('lettre_motivation_text', 1.0, 'D'),
+    ('texte_documents', 1.0, 'D'),  # texte extrait du CV et de la lettre (`flask text-worker`)
+)
+
+FTS_TABLE = 'candidatures_fts'
+
+
+def sqlite_ddl(columns):
+    """Table FTS5 à contenu externe et triggers de synchronisation"""
+    names = ', '.join(name for name, _, _ in columns)
+    new_values = ', '.join(f'new.{name}' for name, _, _ in columns)
+    old_values = ', '.join(f'old.{name}' for name, _, _ in columns)
+    return [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+            {names},
+            content='candidatures', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )""",
+        f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON candidatures BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, {names}) VALUES (new.id, {new_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON candidatures BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {names}) VALUES ('delete', old.id, {old_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {names} ON candidatures BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {names}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO {FTS_TABLE}(rowid, {names}) VALUES (new.id, {new_values});
+        END""",
+    ]
+
+
+def postgres_ddl(columns):
+    """Colonne tsvector, fonction et trigger de mise à jour, index GIN"""
+    names = ', '.join(name for name, _, _ in columns)
+    tsvector = ' ||\n        '.join(
+        f"setweight(to_tsvector('french', unaccent(coalesce(NEW.{name}, ''))), '{weight}')"
+        for name, _, weight in columns
+    )
+    return [
+        "CREATE EXTENSION IF NOT EXISTS unaccent",
+        "ALTER TABLE candidatures ADD COLUMN IF NOT EXISTS search_vector tsvector",
+        f"""CREATE OR REPLACE FUNCTION candidatures_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+            {tsvector};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql""",
+        "DROP TRIGGER IF EXISTS candidatures_search_vector_trigger ON candidatures",
+        f"""CREATE TRIGGER candidatures_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF {names} ON candidatures
+            FOR EACH ROW EXECUTE FUNCTION candidatures_search_vector_update()""",
+        "CREATE INDEX IF NOT EXISTS ix_candidatures_search_vector ON candidatures USING GIN (search_vector)",
+    ]
+
+
+def indexed_columns(connection):
+    """Colonnes indexées présentes dans la table (les migrations anciennes n'ont pas toutes)"""
+    existing = {col['name'] for col in inspect(connection).get_columns('candidatures')}
+    return [entry for entry in INDEXED_COLUMNS if entry[0] in existing]
+
+
+def detect_backend(connection):
+    """Retourner 'fts5', 'postgresql' ou None si l'index n'est pas installé"""
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        found = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {'name': FTS_TABLE}
+        ).first()
+        return 'fts5' if found else None
+    if dialect == 'postgresql':
+        found = connection.execute(text(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_name = 'candidatures' AND column_name = 'search_vector'"
+        )).first()
+        return 'postgresql' if found else None
+    return None
+
+
+def install(connection):
+    """Créer l'index et ses triggers (idempotent), puis l'alimenter si besoin"""
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        existed = detect_backend(connection) is not None
+        for statement in sqlite_ddl(indexed_columns(connection)):
+            connection.execute(text(statement))
+        if not existed:
+            rebuild(connection)
+    elif dialect == 'postgresql':
+        for statement in postgres_ddl(indexed_columns(connection)):
+            connection.execute(text(statement))
+        connection.execute(text(
+            "UPDATE candidatures SET nom_complet = nom_complet WHERE search_vector IS NULL"
+        ))
+    return detect_backend(connection)
+
+
+def uninstall(connection):
+    """Supprimer triggers et table FTS (SQLite) ou trigger et fonction (PostgreSQL)"""
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        for suffix in ('_ai', '_ad', '_au'):
+            connection.execute(text(f"DROP TRIGGER IF EXISTS {FTS_TABLE}{suffix}"))
+        connection.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+    elif dialect == 'postgresql':
+        connection.execute(text("DROP TRIGGER IF EXISTS candidatures_search_vector_trigger ON candidatures"))
+        connection.execute(text("DROP FUNCTION IF EXISTS candidatures_search_vector_update()"))
+
+
+def rebuild(connection):
+    """Reconstruire entièrement l'index à partir de la table candidatures"""
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    elif dialect == 'postgresql':
+        # Le trigger BEFORE UPDATE recalcule search_vector
+        connection.execute(text("UPDATE candidatures SET nom_complet = nom_complet"))
+
+
+def tokenize(term):
+    """Découper la saisie en mots (les opérateurs FTS sont ignorés)"""
+    return re.findall(r'\w+', term or '')
+
+
+def apply_search(query, model, term, backend):
+    """Filtrer `query` sur `term`; retourne (query, clause de tri par pertinence)"""
+    tokens = tokenize(term)
+    if not tokens:
+        return query, None
+
+    if backend == 'fts5':
+        # Recherche par préfixe: utilisable pendant la frappe
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        fts = table(FTS_TABLE, column('rowid'))
+        weights = [weight for _, weight, _ in INDEXED_COLUMNS]
+        query = query.join(fts, fts.c.rowid == model.id).filter(
+            literal_column(FTS_TABLE).op('MATCH')(match)
+        )
+        return query, func.bm25(literal_column(FTS_TABLE), *weights).asc()
+
+    if backend == 'postgresql':
+        tsquery = func.to_tsquery('french', func.unaccent(' & '.join(f'{token}:*' for token in tokens)))
+        vector = literal_column('candidatures.search_vector')
+        query = query.filter(vector.op('@@')(tsquery))
+        return query, func.ts_rank(vector, tsquery).desc()
+
+    # Pas d'index: recherche ILIKE sur les mêmes colonnes
+    for token in tokens:
+        query = query.filter(or_(*(
+            getattr(model, name).ilike(f'%{token}%') for name, _, _ in INDEXED_COLUMNS
+        )))
+    return query, None
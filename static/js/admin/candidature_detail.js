@@ -0,0 +1,96 @@
+// Données de la page: <script id="donnees-page" type="application/json">
+const PAGE = JSON.parse(document.getElementById('donnees-page').textContent);
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Mettre à jour la dernière mise à jour
+    const now = new Date();
+    const options = { 
+        hour: '2-digit', 
+        minute: '2-digit',
+        second: '2-digit'
+    };
+    document.getElementById('lastUpdate').textContent = now.toLocaleTimeString('fr-FR', options);
+
+    // Définir le statut actuel dans le modal
+    const currentStatus = PAGE.statut;
+    document.getElementById('newStatus').value = currentStatus;
+
+    // Confirmer la suppression
+    window.confirmDelete = function() {
+        if (confirm('Êtes-vous sûr de vouloir supprimer cette candidature ? Cette action est irréversible.')) {
+            // Ici, vous devriez faire un appel AJAX pour supprimer la candidature
+            // Pour l'instant, on redirige vers la liste
+            alert('Fonctionnalité de suppression à implémenter.');
+            // window.location.href = '/admin/candidatures/delete/' + PAGE.id;
+        }
+    };
+
+    // Mettre à jour le statut via le modal
+    window.updateStatus = function() {
+        const newStatus = document.getElementById('newStatus').value;
+        const notes = document.getElementById('statusNotes').value;
+
+        // Mettre à jour le formulaire principal
+        document.getElementById('statut').value = newStatus;
+        if (notes) {
+            document.getElementById('notes_admin').value = 
+                (document.getElementById('notes_admin').value ? 
+                 document.getElementById('notes_admin').value + '\n\n' : '') + 
+                `[Changement de statut: ${newStatus}] ${notes}`;
+        }
+
+        // Soumettre le formulaire
+        document.querySelector('form').submit();
+    };
+
+    // Mettre en évidence les champs vides
+    const emptyFields = [];
+    if (!(PAGE.telephone || '').trim()) emptyFields.push('téléphone');
+    if (!(PAGE.portfolio_lien || '').trim()) emptyFields.push('portfolio en ligne');
+    if (!(PAGE.competences_marketing || '').trim()) emptyFields.push('compétences marketing');
+
+    if (emptyFields.length > 0) {
+        const alertDiv = document.createElement('div');
+        alertDiv.className = 'alert alert-warning mt-3';
+        alertDiv.innerHTML = `
+            <i class="fas fa-exclamation-triangle"></i>
+            <strong>Informations manquantes:</strong> 
+            ${emptyFields.join(', ')}.
+        `;
+        document.querySelector('.candidature-header').appendChild(alertDiv);
+    }
+
+    // Auto-sauvegarde des notes
+    const notesTextarea = document.getElementById('notes_admin');
+    if (notesTextarea) {
+        let saveTimeout;
+        notesTextarea.addEventListener('input', function() {
+            clearTimeout(saveTimeout);
+            saveTimeout = setTimeout(function() {
+                // Ici, vous pourriez faire un appel AJAX pour sauvegarder automatiquement
+                console.log('Notes modifiées, auto-sauvegarde...');
+            }, 2000);
+        });
+    }
+
+    // Calcul de l'âge de la candidature
+    const submissionDate = new Date(PAGE.date_soumission);
+    const ageInDays = Math.floor((new Date() - submissionDate) / (1000 * 60 * 60 * 24));
+
+    if (ageInDays > 7 && PAGE.statut === 'Nouvelle') {
+        const alertDiv = document.createElement('div');
+        alertDiv.className = 'alert alert-danger mt-3';
+        alertDiv.innerHTML = `
+            <i class="fas fa-clock"></i>
+            <strong>Candidature ancienne:</strong> 
+            Cette candidature est en attente depuis ${ageInDays} jours. 
+            Veuillez l'examiner rapidement.
+        `;
+        document.querySelector('.candidature-header').appendChild(alertDiv);
+    }
+});
+
+// Fonction nl2br pour l'affichage du texte
+function nl2br(str) {
+    return str.replace(/\n/g, '<br>');
+}
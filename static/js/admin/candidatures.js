@@ -0,0 +1,131 @@
+// Données de la page: <script id="donnees-page" type="application/json">
+const PAGE = JSON.parse(document.getElementById('donnees-page').textContent);
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Mettre à jour la dernière mise à jour
+    const now = new Date();
+    const options = { 
+        hour: '2-digit', 
+        minute: '2-digit',
+        second: '2-digit'
+    };
+    document.getElementById('lastUpdate').textContent = now.toLocaleTimeString('fr-FR', options);
+
+    // Initialiser DataTable si disponible
+    if (typeof window.jQuery !== 'undefined' && typeof $.fn.DataTable !== 'undefined') {
+        $('#candidaturesTable').DataTable({
+            language: {
+                url: '//cdn.datatables.net/plug-ins/1.13.6/i18n/fr-FR.json'
+            },
+            pageLength: 25,
+            order: [[1, 'desc']],
+            columnDefs: [{ orderable: false, targets: 0 }]
+        });
+    }
+
+    // Sélection des lignes pour les actions groupées
+    const rowCheckboxes = document.querySelectorAll('.row-select');
+    const selectedIds = () => Array.from(rowCheckboxes)
+        .filter(checkbox => checkbox.checked)
+        .map(checkbox => parseInt(checkbox.value, 10));
+    const refreshSelection = () => {
+        document.getElementById('bulkSelectionOption').textContent = `Sélection (${selectedIds().length})`;
+    };
+    document.getElementById('selectAll').addEventListener('change', (e) => {
+        rowCheckboxes.forEach(checkbox => { checkbox.checked = e.target.checked; });
+        refreshSelection();
+    });
+    rowCheckboxes.forEach(checkbox => checkbox.addEventListener('change', refreshSelection));
+
+    async function bulkUpdate(payload) {
+        const response = await fetch(PAGE.bulk_update_url, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(payload)
+        });
+        const result = await response.json();
+        if (!result.success) {
+            throw new Error(result.error || `Erreur ${response.status}`);
+        }
+        return result.updated;
+    }
+
+    // Statut et/ou note appliqués à la sélection ou à tout le filtre courant
+    window.applyBulkAction = async function() {
+        const payload = {
+            statut: document.getElementById('bulkStatut').value || null,
+            note: document.getElementById('bulkNote').value.trim() || null
+        };
+        if (!payload.statut && !payload.note) {
+            alert('Choisissez un statut ou saisissez une note');
+            return;
+        }
+
+        if (document.getElementById('bulkScope').value === 'filtre') {
+            if (!confirm(`Appliquer à ${PAGE.total} candidature(s) ?`)) {
+                return;
+            }
+            payload.filtre = { statut: PAGE.statut, search: PAGE.search };
+        } else {
+            payload.ids = selectedIds();
+            if (!payload.ids.length) {
+                alert('Aucune candidature sélectionnée');
+                return;
+            }
+        }
+
+        const button = document.getElementById('bulkApply');
+        button.disabled = true;
+        try {
+            const updated = await bulkUpdate(payload);
+            alert(`${updated} candidature(s) mise(s) à jour`);
+            window.location.reload();
+        } catch (error) {
+            alert(`Erreur: ${error.message}`);
+            button.disabled = false;
+        }
+    };
+
+    // Fonction pour changer le statut
+    window.changeStatus = async function(candidatureId) {
+        const newStatus = prompt(`Changer le statut (${PAGE.statuts.join(', ')}):`, 'En revue');
+        if (newStatus && PAGE.statuts.includes(newStatus)) {
+            try {
+                await bulkUpdate({ ids: [candidatureId], statut: newStatus });
+                window.location.reload();
+            } catch (error) {
+                alert(`Erreur: ${error.message}`);
+            }
+        }
+    };
+
+    // Auto-refresh toutes les 2 minutes pour les nouvelles candidatures
+    // (sauf pendant une sélection en cours)
+    setTimeout(function refresh() {
+        if (selectedIds().length) {
+            setTimeout(refresh, 2 * 60 * 1000);
+            return;
+        }
+        window.location.reload();
+    }, 2 * 60 * 1000);
+
+    // Mettre en évidence les nouvelles candidatures
+    const newCandidates = document.querySelectorAll('.status-nouvelle');
+    newCandidates.forEach(badge => {
+        const row = badge.closest('tr');
+        if (row) {
+            row.style.animation = 'highlight 2s infinite';
+
+            // Ajouter le style pour l'animation
+            const style = document.createElement('style');
+            style.textContent = `
+                @keyframes highlight {
+                    0% { background-color: rgba(220, 53, 69, 0.05); }
+                    50% { background-color: rgba(220, 53, 69, 0.1); }
+                    100% { background-color: rgba(220, 53, 69, 0.05); }
+                }
+            `;
+            document.head.appendChild(style);
+        }
+    });
+});
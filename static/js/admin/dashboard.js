@@ -0,0 +1,24 @@
+// Gestion de la navigation active
+const currentPath = window.location.pathname;
+const navItems = document.querySelectorAll('.nav-item');
+
+navItems.forEach(item => {
+    if (item.getAttribute('href') === currentPath) {
+        item.classList.add('active');
+    }
+});
+
+// Confirmation de déconnexion
+const logoutBtn = document.querySelector('.logout-btn');
+if (logoutBtn) {
+    logoutBtn.addEventListener('click', function(e) {
+        if (!confirm('Êtes-vous sûr de vouloir vous déconnecter ?')) {
+            e.preventDefault();
+        }
+    });
+}
+
+// Auto-refresh des statistiques toutes les 30 secondes
+setTimeout(() => {
+    window.location.reload();
+}, 30000);
@@ -0,0 +1,56 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Basculer la visibilité du mot de passe
+    const togglePassword = document.getElementById('togglePassword');
+    const passwordInput = document.getElementById('password');
+
+    if (togglePassword && passwordInput) {
+        togglePassword.addEventListener('click', function(e) {
+            e.preventDefault();
+
+            const type = passwordInput.getAttribute('type') === 'password' ? 'text' : 'password';
+            passwordInput.setAttribute('type', type);
+
+            const icon = this.querySelector('i');
+            if (type === 'password') {
+                icon.className = 'fas fa-eye';
+                this.innerHTML = '<i class="fas fa-eye"></i> Afficher le mot de passe';
+            } else {
+                icon.className = 'fas fa-eye-slash';
+                this.innerHTML = '<i class="fas fa-eye-slash"></i> Masquer le mot de passe';
+            }
+        });
+    }
+
+    // Détection de la touche Entrée
+    document.addEventListener('keypress', function(e) {
+        if (e.key === 'Enter' && e.target.type !== 'textarea') {
+            const form = document.querySelector('form');
+            if (form) {
+                form.submit();
+            }
+        }
+    });
+
+    // Effet de frappe pour le placeholder
+    const usernameInput = document.getElementById('username');
+    if (usernameInput) {
+        const placeholder = usernameInput.getAttribute('placeholder');
+        let i = 0;
+
+        function typeWriter() {
+            if (i < placeholder.length) {
+                usernameInput.setAttribute('placeholder', placeholder.substring(0, i+1));
+                i++;
+                setTimeout(typeWriter, 50);
+            }
+        }
+
+        // Démarrer l'effet après un délai
+        setTimeout(typeWriter, 1000);
+    }
+
+    // Vérification de la sécurité
+    if (window.location.protocol !== 'https:' && window.location.hostname !== 'localhost') {
+        console.warn('Connexion non sécurisée détectée. Veuillez utiliser HTTPS en production.');
+    }
+});
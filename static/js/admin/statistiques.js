@@ -0,0 +1,153 @@
+// Données de la page: <script id="donnees-page" type="application/json">
+const PAGE = JSON.parse(document.getElementById('donnees-page').textContent);
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Données pour les graphiques
+    const statusData = {
+        labels: PAGE.statuts.map(([libelle, count]) => libelle),
+        datasets: [{
+            data: PAGE.statuts.map(([libelle, count]) => count),
+            backgroundColor: [
+                '#28a745', // Nouvelle
+                '#ffc107', // En revue
+                '#007bff', // Contacté
+                '#dc3545'  // Rejeté
+            ],
+            borderWidth: 2,
+            borderColor: '#fff'
+        }]
+    };
+
+    const monthlyData = {
+        labels: PAGE.mois.map(([libelle, count]) => libelle),
+        datasets: [{
+            label: 'Candidatures',
+            data: PAGE.mois.map(([libelle, count]) => count),
+            backgroundColor: 'rgba(102, 126, 234, 0.2)',
+            borderColor: 'rgba(102, 126, 234, 1)',
+            borderWidth: 2,
+            fill: true,
+            tension: 0.4
+        }]
+    };
+
+    const citiesData = {
+        labels: PAGE.villes.map(([libelle, count]) => libelle),
+        datasets: [{
+            label: 'Candidatures par ville',
+            data: PAGE.villes.map(([libelle, count]) => count),
+            backgroundColor: [
+                '#667eea', '#764ba2', '#28a745', '#ffc107', '#dc3545',
+                '#17a2b8', '#6f42c1', '#e83e8c', '#fd7e14', '#20c997'
+            ],
+            borderWidth: 2,
+            borderColor: '#fff'
+        }]
+    };
+
+    // Initialiser les graphiques
+    const statusCtx = document.getElementById('statusChart').getContext('2d');
+    const statusChart = new Chart(statusCtx, {
+        type: 'doughnut',
+        data: statusData,
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: {
+                    position: 'right',
+                    labels: {
+                        padding: 20,
+                        usePointStyle: true
+                    }
+                }
+            }
+        }
+    });
+
+    const monthlyCtx = document.getElementById('monthlyChart').getContext('2d');
+    const monthlyChart = new Chart(monthlyCtx, {
+        type: 'line',
+        data: monthlyData,
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            scales: {
+                y: {
+                    beginAtZero: true,
+                    ticks: {
+                        stepSize: 1
+                    }
+                }
+            },
+            plugins: {
+                legend: {
+                    display: false
+                }
+            }
+        }
+    });
+
+    const citiesCtx = document.getElementById('citiesChart').getContext('2d');
+    const citiesChart = new Chart(citiesCtx, {
+        type: 'bar',
+        data: citiesData,
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            scales: {
+                y: {
+                    beginAtZero: true,
+                    ticks: {
+                        stepSize: 1
+                    }
+                }
+            },
+            plugins: {
+                legend: {
+                    display: false
+                }
+            }
+        }
+    });
+
+    // Fonctions utilitaires
+    window.exportCharts = function() {
+        alert('Fonctionnalité d\'export à implémenter. Les données sont disponibles dans les tableaux.');
+    };
+
+    window.refreshStats = function() {
+        window.location.reload();
+    };
+
+    window.updatePeriod = function() {
+        const period = document.getElementById('periodSelect').value;
+        alert(`Filtre période: ${period}. Cette fonctionnalité nécessite une implémentation backend.`);
+    };
+
+    // Mettre à jour la date de génération
+    const now = new Date();
+    const options = { 
+        year: 'numeric', 
+        month: 'long', 
+        day: 'numeric',
+        hour: '2-digit',
+        minute: '2-digit',
+        second: '2-digit'
+    };
+    document.getElementById('generationDate').textContent = now.toLocaleDateString('fr-FR', options);
+
+    // Calculer les statistiques avancées
+    const total = PAGE.total;
+    const joursRestants = PAGE.jours_restants;
+
+    if (total > 0 && joursRestants > 0) {
+        const projection = total + Math.round(total / 30 * joursRestants);
+        document.getElementById('projection').textContent = projection;
+    }
+
+    // Auto-refresh toutes les 5 minutes
+    setTimeout(() => {
+        window.location.reload();
+    }, 5 * 60 * 1000);
+});
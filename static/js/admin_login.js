@@ -0,0 +1,20 @@
+// Focus sur le champ utilisateur
+document.getElementById('username').focus();
+
+// Empêcher la soumission multiple
+const form = document.querySelector('form');
+form.addEventListener('submit', function(e) {
+    const submitBtn = this.querySelector('button[type="submit"]');
+    submitBtn.disabled = true;
+    submitBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Connexion...';
+});
+
+// Entrée pour soumettre le formulaire
+document.addEventListener('keydown', function(e) {
+    if (e.key === 'Enter' && e.target.tagName !== 'TEXTAREA') {
+        const activeElement = document.activeElement;
+        if (activeElement.tagName === 'INPUT') {
+            form.dispatchEvent(new Event('submit'));
+        }
+    }
+});
@@ -0,0 +1,64 @@
+// Données de la page: <script id="donnees-page" type="application/json">
+const PAGE = JSON.parse(document.getElementById('donnees-page').textContent);
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Compte à rebours pour la redirection
+    let countdown = 10;
+    const countdownElement = document.getElementById('countdown');
+    const countdownInterval = setInterval(() => {
+        countdown--;
+        countdownElement.textContent = countdown;
+
+        if (countdown <= 0) {
+            clearInterval(countdownInterval);
+            window.location.href = PAGE.accueil_url;
+        }
+    }, 1000);
+
+    // Référence remise par /postuler (la même que dans l'email de confirmation)
+    const lastRef = localStorage.getItem('lastCandidatureRef');
+    if (lastRef) {
+        document.getElementById('confirmationRef').textContent = lastRef;
+    }
+
+    // Effet de confetti (simplifié)
+    function createConfetti() {
+        const confettiCount = 50;
+        const container = document.querySelector('.confirmation-container');
+
+        for (let i = 0; i < confettiCount; i++) {
+            const confetti = document.createElement('div');
+            confetti.innerHTML = '🎉';
+            confetti.style.position = 'fixed';
+            confetti.style.fontSize = Math.random() * 20 + 10 + 'px';
+            confetti.style.left = Math.random() * 100 + 'vw';
+            confetti.style.top = '-50px';
+            confetti.style.opacity = '0.8';
+            confetti.style.zIndex = '9999';
+            confetti.style.pointerEvents = 'none';
+            confetti.style.animation = `fall ${Math.random() * 3 + 2}s linear forwards`;
+
+            document.body.appendChild(confetti);
+
+            // Supprimer après l'animation
+            setTimeout(() => {
+                confetti.remove();
+            }, 5000);
+        }
+    }
+
+    // Créer des confettis au chargement
+    createConfetti();
+
+    // Ajouter le style pour l'animation de chute
+    const style = document.createElement('style');
+    style.textContent = `
+        @keyframes fall {
+            to {
+                transform: translateY(100vh) rotate(${Math.random() * 360}deg);
+                opacity: 0;
+            }
+        }
+    `;
+    document.head.appendChild(style);
+});
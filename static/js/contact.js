@@ -0,0 +1,30 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const contactForm = document.getElementById('contactForm');
+
+    if (contactForm) {
+        contactForm.addEventListener('submit', function(e) {
+            e.preventDefault();
+
+            // Récupérer les données du formulaire
+            const formData = {
+                name: document.getElementById('name').value,
+                email: document.getElementById('email').value,
+                subject: document.getElementById('subject').value,
+                category: document.getElementById('category').value,
+                message: document.getElementById('message').value
+            };
+
+            // Simuler l'envoi (à remplacer par un vrai appel API si nécessaire)
+            console.log('Données du formulaire:', formData);
+
+            // Afficher un message de succès
+            alert('Merci pour votre message ! Nous vous répondrons dans les plus brefs délais.\n\nNote: Ce formulaire est actuellement en démonstration. En production, vos messages seraient envoyés à notre équipe.');
+
+            // Réinitialiser le formulaire
+            contactForm.reset();
+        });
+    }
+
+    // Ajuster la hauteur de la page pour la navigation fixe
+    document.body.style.paddingTop = '70px';
+});
@@ -0,0 +1,94 @@
+// Données de la page: <script id="donnees-page" type="application/json">
+const PAGE = JSON.parse(document.getElementById('donnees-page').textContent);
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Afficher l'URL actuelle
+    document.getElementById('currentUrl').textContent = window.location.pathname;
+
+    // Mettre à jour l'heure
+    function updateTime() {
+        const now = new Date();
+        const timeString = now.toLocaleTimeString('fr-FR', { 
+            hour: '2-digit', 
+            minute: '2-digit',
+            second: '2-digit'
+        });
+        document.getElementById('currentTime').textContent = timeString;
+    }
+
+    updateTime();
+    setInterval(updateTime, 1000);
+
+    // Fonction de recherche
+    window.performSearch = function() {
+        const query = document.getElementById('searchInput').value;
+        if (query.trim()) {
+            // Rediriger vers Google avec la recherche
+            window.location.href = `https://www.google.com/search?q=site:${window.location.hostname}+${encodeURIComponent(query)}`;
+        }
+    };
+
+    // Permettre la recherche avec la touche Entrée
+    document.getElementById('searchInput').addEventListener('keypress', function(e) {
+        if (e.key === 'Enter') {
+            performSearch();
+        }
+    });
+
+    // Effet de particules pour l'arrière-plan
+    createParticles();
+
+    // Redirection automatique après 30 secondes
+    setTimeout(() => {
+        window.location.href = PAGE.accueil_url;
+    }, 30000);
+
+    // Compte à rebours pour la redirection
+    let countdown = 30;
+    const countdownInterval = setInterval(() => {
+        countdown--;
+        if (countdown <= 0) {
+            clearInterval(countdownInterval);
+        }
+    }, 1000);
+});
+
+function createParticles() {
+    const container = document.querySelector('.error-container');
+
+    for (let i = 0; i < 20; i++) {
+        const particle = document.createElement('div');
+        particle.innerHTML = '404';
+        particle.style.position = 'fixed';
+        particle.style.color = 'rgba(255,255,255,0.1)';
+        particle.style.fontSize = Math.random() * 20 + 10 + 'px';
+        particle.style.left = Math.random() * 100 + 'vw';
+        particle.style.top = Math.random() * 100 + 'vh';
+        particle.style.opacity = '0.3';
+        particle.style.zIndex = '-1';
+        particle.style.pointerEvents = 'none';
+        particle.style.userSelect = 'none';
+        particle.style.animation = `floatParticle ${Math.random() * 10 + 10}s linear infinite`;
+
+        document.body.appendChild(particle);
+    }
+
+    // Ajouter le style pour l'animation des particules
+    const style = document.createElement('style');
+    style.textContent = `
+        @keyframes floatParticle {
+            0% {
+                transform: translateY(0) rotate(0deg);
+                opacity: 0.3;
+            }
+            50% {
+                opacity: 0.1;
+            }
+            100% {
+                transform: translateY(-100vh) rotate(360deg);
+                opacity: 0.3;
+            }
+        }
+    `;
+    document.head.appendChild(style);
+}
@@ -0,0 +1,111 @@
+// Données de la page: <script id="donnees-page" type="application/json">
+const PAGE = JSON.parse(document.getElementById('donnees-page').textContent);
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Afficher l'URL actuelle
+    document.getElementById('currentUrl').textContent = window.location.pathname;
+
+    // Mettre à jour l'heure
+    function updateTime() {
+        const now = new Date();
+        const timeString = now.toLocaleTimeString('fr-FR', { 
+            hour: '2-digit', 
+            minute: '2-digit',
+            second: '2-digit'
+        });
+        document.getElementById('currentTime').textContent = timeString;
+    }
+
+    updateTime();
+    setInterval(updateTime, 1000);
+
+    // Simuler une récupération automatique
+    setTimeout(() => {
+        document.querySelector('.status-indicator').style.background = '#28a745';
+        document.querySelector('.status-indicator').style.animation = 'none';
+        document.querySelector('.status-indicator').nextElementSibling.textContent = 'Système stabilisé';
+    }, 10000);
+
+    // Tentative automatique de récupération
+    let retryCount = 0;
+    const maxRetries = 3;
+
+    function tryRecovery() {
+        retryCount++;
+        if (retryCount <= maxRetries) {
+            console.log(`Tentative de récupération ${retryCount}/${maxRetries}...`);
+            // Simuler une tentative de récupération
+            setTimeout(tryRecovery, 5000);
+        }
+    }
+
+    tryRecovery();
+
+    // Redirection automatique après 60 secondes
+    setTimeout(() => {
+        window.location.href = PAGE.accueil_url;
+    }, 60000);
+
+    // Compte à rebours pour la redirection
+    let countdown = 60;
+    const countdownElement = document.createElement('div');
+    countdownElement.className = 'mt-3 text-center';
+    countdownElement.innerHTML = `<small>Redirection automatique dans <span id="countdown">${countdown}</span> secondes</small>`;
+    document.querySelector('.contact-support').appendChild(countdownElement);
+
+    const countdownInterval = setInterval(() => {
+        countdown--;
+        document.getElementById('countdown').textContent = countdown;
+
+        if (countdown <= 0) {
+            clearInterval(countdownInterval);
+        }
+    }, 1000);
+
+    // Effet de réparation visuelle
+    createRepairEffect();
+});
+
+function createRepairEffect() {
+    // Créer des éléments de "réparation"
+    for (let i = 0; i < 10; i++) {
+        setTimeout(() => {
+            const repair = document.createElement('div');
+            repair.innerHTML = '🔧';
+            repair.style.position = 'fixed';
+            repair.style.fontSize = '24px';
+            repair.style.left = Math.random() * 100 + 'vw';
+            repair.style.top = Math.random() * 100 + 'vh';
+            repair.style.zIndex = '9999';
+            repair.style.opacity = '0.7';
+            repair.style.pointerEvents = 'none';
+            repair.style.animation = `repairAnimation 2s linear forwards`;
+
+            document.body.appendChild(repair);
+
+            // Supprimer après l'animation
+            setTimeout(() => {
+                repair.remove();
+            }, 2000);
+        }, i * 500);
+    }
+
+    // Ajouter le style pour l'animation de réparation
+    const style = document.createElement('style');
+    style.textContent = `
+        @keyframes repairAnimation {
+            0% {
+                transform: translateY(0) rotate(0deg);
+                opacity: 0.7;
+            }
+            50% {
+                opacity: 1;
+            }
+            100% {
+                transform: translateY(-100px) rotate(360deg);
+                opacity: 0;
+            }
+        }
+    `;
+    document.head.appendChild(style);
+}
@@ -0,0 +1,22 @@
+// Données de la page: <script id="donnees-page" type="application/json">
+const PAGE = JSON.parse(document.getElementById('donnees-page').textContent);
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Calculer les jours restants
+    const dateLimite = new Date(PAGE.date_limite);
+    const aujourdhui = new Date();
+    const diffTime = dateLimite - aujourdhui;
+    const diffDays = Math.ceil(diffTime / (1000 * 60 * 60 * 24));
+
+    document.getElementById('joursRestant').textContent = diffDays > 0 ? diffDays : 0;
+
+    // Charger le nombre de candidatures
+    fetch('/api/candidatures/count')
+        .then(response => response.json())
+        .then(data => {
+            if (data.candidatures_count !== undefined) {
+                document.getElementById('totalCandidatures').textContent = data.candidatures_count;
+            }
+        })
+        .catch(error => console.error('Erreur:', error));
+});
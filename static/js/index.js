@@ -0,0 +1,495 @@
+// Données de la page: <script id="donnees-page" type="application/json">
+const PAGE = JSON.parse(document.getElementById('donnees-page').textContent);
+
+// Afficher l'URL actuelle
+document.getElementById('current-url').textContent = window.location.href;
+
+// Initialisation au chargement de la page
+document.addEventListener('DOMContentLoaded', function() {
+    initializeFileUploads();
+    initializePortfolioTabs();
+    setupDragAndDrop();
+    initializeFormValidation();
+    loadStatistics();
+
+    // Charger le nombre de candidatures
+    fetch('/api/candidatures/count')
+        .then(response => response.json())
+        .then(data => {
+            if (data.candidatures_count !== undefined) {
+                document.getElementById('total-candidatures').textContent = data.candidatures_count;
+            }
+        })
+        .catch(error => console.error('Erreur chargement statistiques:', error));
+});
+
+// Gestion de l'upload des fichiers
+function initializeFileUploads() {
+    const fileInputs = document.querySelectorAll('input[type="file"]');
+
+    fileInputs.forEach(input => {
+        input.addEventListener('change', function(e) {
+            handleFileSelect(this, e);
+        });
+    });
+}
+
+function handleFileSelect(input, event) {
+    const file = input.files[0];
+    const parent = input.closest('.document-upload');
+    const statusDiv = parent.querySelector('.file-status');
+
+    if (!file) {
+        statusDiv.innerHTML = '';
+        return;
+    }
+
+    // Vérifier la taille (20MB max)
+    const maxSize = 20 * 1024 * 1024;
+    if (file.size > maxSize) {
+        statusDiv.innerHTML = `
+            <div class="file-name-display upload-error">
+                <i class="fas fa-exclamation-triangle"></i>
+                Fichier trop volumineux (${(file.size / (1024*1024)).toFixed(2)} MB > 20 MB)
+            </div>
+        `;
+        input.value = '';
+        return;
+    }
+
+    // Vérifier l'extension
+    const allowedExtensions = ['pdf', 'doc', 'docx', 'txt', 'jpg', 'jpeg', 'png', 'gif'];
+    const extension = file.name.split('.').pop().toLowerCase();
+
+    if (!allowedExtensions.includes(extension)) {
+        statusDiv.innerHTML = `
+            <div class="file-name-display upload-error">
+                <i class="fas fa-exclamation-triangle"></i>
+                Extension non autorisée: .${extension}
+            </div>
+        `;
+        input.value = '';
+        return;
+    }
+
+    // Afficher le succès
+    statusDiv.innerHTML = `
+        <div class="file-name-display upload-success">
+            <i class="fas fa-check-circle"></i>
+            ${file.name} (${(file.size / 1024).toFixed(0)} KB)
+        </div>
+    `;
+
+    // Ajouter un effet visuel sur la zone d'upload
+    const uploadZone = parent.querySelector('.upload-zone');
+    uploadZone.classList.add('upload-success');
+    setTimeout(() => {
+        uploadZone.classList.remove('upload-success');
+    }, 1000);
+}
+
+// Gestion des onglets portfolio
+function initializePortfolioTabs() {
+    const tabBtns = document.querySelectorAll('.tab-btn');
+    const tabContents = document.querySelectorAll('.tab-content');
+
+    tabBtns.forEach(btn => {
+        btn.addEventListener('click', function() {
+            const tabId = this.getAttribute('data-tab');
+
+            // Mettre à jour les boutons
+            tabBtns.forEach(b => b.classList.remove('active'));
+            this.classList.add('active');
+
+            // Mettre à jour les contenus
+            tabContents.forEach(content => {
+                content.classList.remove('active');
+                if (content.id === tabId + '-tab') {
+                    content.classList.add('active');
+                }
+            });
+        });
+    });
+}
+
+// Drag and drop
+function setupDragAndDrop() {
+    const uploadZones = document.querySelectorAll('.upload-zone');
+
+    uploadZones.forEach(zone => {
+        zone.addEventListener('dragover', function(e) {
+            e.preventDefault();
+            this.classList.add('dragover');
+        });
+
+        zone.addEventListener('dragleave', function(e) {
+            e.preventDefault();
+            this.classList.remove('dragover');
+        });
+
+        zone.addEventListener('drop', function(e) {
+            e.preventDefault();
+            this.classList.remove('dragover');
+
+            const files = e.dataTransfer.files;
+            if (files.length > 0) {
+                const input = this.querySelector('input[type="file"]');
+                input.files = files;
+
+                // Déclencher l'événement change
+                const event = new Event('change', { bubbles: true });
+                input.dispatchEvent(event);
+            }
+        });
+    });
+}
+
+// Validation du formulaire
+function initializeFormValidation() {
+    const form = document.getElementById('candidatureForm');
+    if (!form) return;
+
+    // Validation en temps réel de l'email
+    const emailInput = document.getElementById('email');
+    if (emailInput) {
+        emailInput.addEventListener('blur', function() {
+            const email = this.value.trim();
+            const validationDiv = document.getElementById('email-validation');
+
+            if (email && !isValidEmail(email)) {
+                validationDiv.innerHTML = '<span style="color: #dc3545;">Email invalide</span>';
+            } else {
+                validationDiv.innerHTML = '';
+            }
+        });
+    }
+
+    // Compteurs de caractères
+    const motivationTextarea = document.getElementById('motivation');
+    const competencesTextarea = document.getElementById('competences');
+
+    if (motivationTextarea) {
+        motivationTextarea.addEventListener('input', function() {
+            document.getElementById('motivation-chars').textContent = this.value.length;
+        });
+    }
+
+    if (competencesTextarea) {
+        competencesTextarea.addEventListener('input', function() {
+            document.getElementById('competences-chars').textContent = this.value.length;
+        });
+    }
+
+    // Soumission du formulaire
+    form.addEventListener('submit', handleFormSubmit);
+
+    // Bouton de réinitialisation
+    const resetBtn = document.getElementById('resetBtn');
+    if (resetBtn) {
+        resetBtn.addEventListener('click', function() {
+            if (confirm('Êtes-vous sûr de vouloir réinitialiser le formulaire ?')) {
+                form.reset();
+                document.querySelectorAll('.file-status').forEach(el => {
+                    el.innerHTML = '';
+                });
+                // Réactiver l'onglet lien par défaut
+                document.querySelector('.tab-btn[data-tab="lien"]').click();
+            }
+        });
+    }
+
+    // Bouton de prévisualisation
+    const previewBtn = document.getElementById('previewBtn');
+    if (previewBtn) {
+        previewBtn.addEventListener('click', showPreview);
+    }
+}
+
+function isValidEmail(email) {
+    const re = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
+    return re.test(email);
+}
+
+function handleFormSubmit(e) {
+    e.preventDefault();
+
+    // Validation des fichiers obligatoires
+    const cvFile = document.getElementById('cv').files[0];
+    const lettreFile = document.getElementById('lettre_motivation').files[0];
+
+    if (!cvFile) {
+        showError('Le CV est obligatoire');
+        return;
+    }
+
+    if (!lettreFile) {
+        showError('La lettre de motivation est obligatoire');
+        return;
+    }
+
+    // Vérifier la taille des fichiers
+    const maxSize = 20 * 1024 * 1024;
+    if (cvFile.size > maxSize) {
+        showError('Le CV dépasse la taille maximale de 20MB');
+        return;
+    }
+
+    if (lettreFile.size > maxSize) {
+        showError('La lettre de motivation dépasse la taille maximale de 20MB');
+        return;
+    }
+
+    // Afficher le progress bar
+    const progressSection = document.getElementById('progressSection');
+    const progressBar = document.getElementById('progressBar');
+    const progressText = document.getElementById('progressText');
+    const progressPercent = document.getElementById('progressPercent');
+
+    progressSection.style.display = 'block';
+    progressBar.style.width = '0%';
+    progressPercent.textContent = '0%';
+    progressText.textContent = 'Préparation de l\'envoi...';
+
+    // Désactiver le bouton de soumission
+    const submitBtn = document.getElementById('submitBtn');
+    const originalText = submitBtn.innerHTML;
+    submitBtn.innerHTML = '<span class="spinner-border spinner-border-sm" role="status" aria-hidden="true"></span> Envoi en cours...';
+    submitBtn.disabled = true;
+
+    const form = this;
+    let uploads = {};
+
+    // Envoyer les documents par morceaux (reprise automatique après coupure)
+    uploadDocuments(form, (sent, total) => {
+        const percent = total ? Math.floor(sent * 95 / total) : 95;
+        progressBar.style.width = `${percent}%`;
+        progressPercent.textContent = `${percent}%`;
+        progressText.textContent = `Envoi des documents... ${(sent / 1048576).toFixed(1)} / ${(total / 1048576).toFixed(1)} Mo`;
+    })
+    .then(result => {
+        uploads = result;
+        progressText.textContent = 'Enregistrement de la candidature...';
+        return fetch('/postuler', {
+            method: 'POST',
+            body: applicationFormData(form, uploads)
+        });
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            Object.values(uploads).forEach(upload => upload.forget());
+        }
+        progressBar.style.width = '100%';
+        progressPercent.textContent = '100%';
+        progressText.textContent = 'Terminé !';
+
+        setTimeout(() => {
+            if (data.success) {
+                // Afficher le message de succès avec détails
+                const successMessage = document.getElementById('successMessage');
+                const fileDetails = document.getElementById('fileDetails');
+
+                successMessage.textContent = data.message.split('\n')[0];
+                if (data.reference) {
+                    // Affichée par la page de confirmation
+                    localStorage.setItem('lastCandidatureRef', data.reference);
+                    localStorage.setItem('lastCandidatureDate', new Date().toISOString());
+                }
+
+                if (data.file_status) {
+                    let fileDetailsHTML = '<h4>Détails des fichiers:</h4><ul>';
+                    for (const [doc, status] of Object.entries(data.file_status)) {
+                        fileDetailsHTML += `<li>${status}</li>`;
+                    }
+                    fileDetailsHTML += '</ul>';
+                    fileDetails.innerHTML = fileDetailsHTML;
+                }
+
+                // Afficher la modal de succès
+                showModal('successModal');
+
+                // Réinitialiser le formulaire après 3 secondes
+                setTimeout(() => {
+                    document.getElementById('candidatureForm').reset();
+                    document.querySelectorAll('.file-status').forEach(el => {
+                        el.innerHTML = '';
+                    });
+                    progressSection.style.display = 'none';
+                    progressBar.style.width = '0%';
+                }, 3000);
+
+            } else {
+                // Afficher l'erreur
+                document.getElementById('errorMessage').textContent = data.error;
+                showModal('errorModal');
+            }
+        }, 500);
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        document.getElementById('errorMessage').textContent = error instanceof UploadError
+            ? error.message
+            : 'Une erreur réseau est survenue. Veuillez réessayer.';
+        showModal('errorModal');
+    })
+    .finally(() => {
+        // Restaurer le bouton
+        setTimeout(() => {
+            submitBtn.innerHTML = originalText;
+            submitBtn.disabled = false;
+            progressSection.style.display = 'none';
+            progressBar.style.width = '0%';
+        }, 2000);
+    });
+}
+
+function showError(message) {
+    document.getElementById('errorMessage').textContent = message;
+    showModal('errorModal');
+}
+
+function showPreview() {
+    const form = document.getElementById('candidatureForm');
+    const previewContent = document.getElementById('previewContent');
+
+    let html = '<div class="preview-content">';
+    html += '<h3>Prévisualisation de votre candidature</h3>';
+
+    // Informations personnelles
+    html += '<h4>Informations personnelles:</h4>';
+    html += '<ul>';
+    html += `<li><strong>Nom complet:</strong> ${form.nom_complet.value}</li>`;
+    html += `<li><strong>Email:</strong> ${form.email.value}</li>`;
+    html += `<li><strong>Téléphone:</strong> ${form.telephone.value || 'Non renseigné'}</li>`;
+    html += `<li><strong>Ville:</strong> ${form.ville.value}</li>`;
+    html += '</ul>';
+
+    // Documents
+    html += '<h4>Documents:</h4>';
+    html += '<ul>';
+
+    // CV
+    const cvFile = form.cv.files[0];
+    html += `<li><strong>CV:</strong> ${cvFile ? cvFile.name : 'Non uploadé'}</li>`;
+
+    // Lettre de motivation
+    const lettreFile = form.lettre_motivation.files[0];
+    html += `<li><strong>Lettre de motivation:</strong> ${lettreFile ? lettreFile.name : 'Non uploadé'}</li>`;
+
+    // Portfolio
+    const portfolioFile = form.portfolio_fichier ? form.portfolio_fichier.files[0] : null;
+    const portfolioLink = form.portfolio_lien ? form.portfolio_lien.value : '';
+    if (portfolioFile) {
+        html += `<li><strong>Portfolio (fichier):</strong> ${portfolioFile.name}</li>`;
+    } else if (portfolioLink) {
+        html += `<li><strong>Portfolio (lien):</strong> ${portfolioLink}</li>`;
+    } else {
+        html += `<li><strong>Portfolio:</strong> Non fourni</li>`;
+    }
+
+    html += '</ul>';
+
+    // Contenu
+    html += '<h4>Lettre de motivation:</h4>';
+    html += `<div style="white-space: pre-wrap; background: #f8f9fa; padding: 10px; border-radius: 5px;">${form.motivation.value.substring(0, 500)}${form.motivation.value.length > 500 ? '...' : ''}</div>`;
+
+    if (form.competences.value) {
+        html += '<h4>Compétences:</h4>';
+        html += `<div style="white-space: pre-wrap; background: #f8f9fa; padding: 10px; border-radius: 5px;">${form.competences.value.substring(0, 300)}${form.competences.value.length > 300 ? '...' : ''}</div>`;
+    }
+
+    html += '</div>';
+
+    previewContent.innerHTML = html;
+    showModal('previewModal');
+}
+
+// Fonctions pour les modals
+function showModal(modalId) {
+    document.getElementById(modalId).style.display = 'block';
+}
+
+function closeModal(modalId) {
+    document.getElementById(modalId).style.display = 'none';
+}
+
+// Copier le lien
+function copyLink() {
+    const url = window.location.href;
+    navigator.clipboard.writeText(url).then(() => {
+        alert('Lien copié dans le presse-papier !');
+    });
+}
+
+// Fonctions de partage
+function shareOnWhatsApp() {
+    const url = encodeURIComponent(window.location.href);
+    const text = encodeURIComponent("Postulez chez SCSM SARL - Formulaire de candidature en ligne");
+    window.open(`https://wa.me/?text=${text}%20${url}`, '_blank');
+}
+
+function shareOnLinkedIn() {
+    const url = encodeURIComponent(window.location.href);
+    window.open(`https://www.linkedin.com/sharing/share-offsite/?url=${url}`, '_blank');
+}
+
+function shareByEmail() {
+    const subject = encodeURIComponent("Formulaire de candidature SCSM SARL");
+    const body = encodeURIComponent(`Je vous invite à postuler chez SCSM SARL via ce lien: ${window.location.href}`);
+    window.location.href = `mailto:?subject=${subject}&body=${body}`;
+}
+
+function copyShareLink() {
+    copyLink();
+}
+
+// Charger les statistiques
+function loadStatistics() {
+    // Calculer les jours restants
+    const dateLimite = new Date(PAGE.date_limite);
+    const aujourdhui = new Date();
+    const diffTime = dateLimite - aujourdhui;
+    const diffDays = Math.ceil(diffTime / (1000 * 60 * 60 * 24));
+
+    document.getElementById('jours-restants').textContent = diffDays > 0 ? diffDays : 0;
+}
+
+// Compte à rebours
+function initializeCountdown() {
+    const countdownElement = document.getElementById('countdown');
+    if (!countdownElement) return;
+
+    const dateLimite = new Date(PAGE.date_limite);
+
+    function updateCountdown() {
+        const maintenant = new Date();
+        const difference = dateLimite - maintenant;
+
+        if (difference <= 0) {
+            countdownElement.textContent = "Terminé";
+            return;
+        }
+
+        const jours = Math.floor(difference / (1000 * 60 * 60 * 24));
+        const heures = Math.floor((difference % (1000 * 60 * 60 * 24)) / (1000 * 60 * 60));
+        const minutes = Math.floor((difference % (1000 * 60 * 60)) / (1000 * 60));
+
+        countdownElement.textContent = `${jours}j ${heures}h ${minutes}m`;
+    }
+
+    updateCountdown();
+    setInterval(updateCountdown, 60000); // Mise à jour chaque minute
+}
+
+// Initialiser le compte à rebours
+initializeCountdown();
+
+// Fermer les modals en cliquant en dehors
+window.addEventListener('click', function(event) {
+    const modals = document.querySelectorAll('.modal');
+    modals.forEach(modal => {
+        if (event.target == modal) {
+            modal.style.display = 'none';
+        }
+    });
+});
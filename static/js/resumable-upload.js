@@ -0,0 +1,172 @@
+// Envoi reprenable des documents par morceaux (protocole tus 1.0, voir /api/uploads)
+const UPLOAD_API_URL = '/api/uploads';
+const UPLOAD_CHUNK_SIZE = 512 * 1024; // 512 Ko: une coupure ne fait perdre qu'un morceau
+const UPLOAD_RETRY_DELAYS = [1000, 2000, 5000, 10000, 20000, 30000];
+const TUS_VERSION = '1.0.0';
+const DOCUMENT_FIELDS = ['cv', 'lettre_motivation', 'portfolio_fichier'];
+
+class UploadError extends Error {
+    constructor(message, status) {
+        super(message);
+        this.status = status;
+        // 409: offset désynchronisé, on le relit; les autres 4xx ne se corrigent pas en réessayant
+        this.fatal = status >= 400 && status < 500 && status !== 409;
+    }
+}
+
+class ResumableUpload {
+    constructor(file, onProgress) {
+        this.file = file;
+        this.onProgress = onProgress || (() => {});
+        this.url = null;
+        this.offset = 0;
+        // Retrouver l'envoi après un rechargement de la page
+        this.fingerprint = `upload::${file.name}::${file.size}::${file.lastModified}`;
+    }
+
+    get id() {
+        return this.url ? this.url.split('/').pop() : null;
+    }
+
+    async start() {
+        if (!this.file.size) {
+            throw new UploadError(`Le fichier ${this.file.name} est vide`, 400);
+        }
+
+        this.url = localStorage.getItem(this.fingerprint);
+        if (this.url) {
+            this.offset = await this.fetchOffset().catch(() => null);
+            if (this.offset === null) {
+                this.forget();
+            }
+        }
+        if (!this.url) {
+            await this.create();
+        }
+
+        let attempt = 0;
+        while (this.offset < this.file.size) {
+            try {
+                this.offset = await this.sendChunk();
+                attempt = 0;
+            } catch (error) {
+                if (error.fatal || attempt >= UPLOAD_RETRY_DELAYS.length) {
+                    throw error;
+                }
+                await new Promise(resolve => setTimeout(resolve, UPLOAD_RETRY_DELAYS[attempt++]));
+                // Reprendre à l'offset connu du serveur (morceau partiellement reçu)
+                const offset = await this.fetchOffset().catch(() => this.offset);
+                if (offset === null) {
+                    this.forget();
+                    throw new UploadError(`L'envoi de ${this.file.name} a expiré, veuillez réessayer`, 404);
+                }
+                this.offset = offset;
+            }
+        }
+
+        this.onProgress(this.file.size, this.file.size);
+        return this.id;
+    }
+
+    async create() {
+        const filename = btoa(unescape(encodeURIComponent(this.file.name)));
+        const response = await fetch(UPLOAD_API_URL, {
+            method: 'POST',
+            headers: {
+                'Tus-Resumable': TUS_VERSION,
+                'Upload-Length': String(this.file.size),
+                'Upload-Metadata': `filename ${filename}`
+            }
+        });
+        if (response.status !== 201) {
+            throw await responseError(response);
+        }
+        this.url = response.headers.get('Location');
+        this.offset = 0;
+        localStorage.setItem(this.fingerprint, this.url);
+    }
+
+    async fetchOffset() {
+        const response = await fetch(this.url, {
+            method: 'HEAD',
+            headers: { 'Tus-Resumable': TUS_VERSION },
+            cache: 'no-store'
+        });
+        if (response.status === 404) {
+            return null;
+        }
+        if (!response.ok) {
+            throw new UploadError('Serveur indisponible', response.status);
+        }
+        return parseInt(response.headers.get('Upload-Offset'), 10);
+    }
+
+    sendChunk() {
+        // XMLHttpRequest: fetch ne donne pas la progression de l'envoi
+        return new Promise((resolve, reject) => {
+            const chunk = this.file.slice(this.offset, this.offset + UPLOAD_CHUNK_SIZE);
+            const xhr = new XMLHttpRequest();
+            xhr.open('PATCH', this.url);
+            xhr.setRequestHeader('Tus-Resumable', TUS_VERSION);
+            xhr.setRequestHeader('Upload-Offset', String(this.offset));
+            xhr.setRequestHeader('Content-Type', 'application/offset+octet-stream');
+            xhr.upload.onprogress = (e) => this.onProgress(this.offset + e.loaded, this.file.size);
+            xhr.onload = () => {
+                if (xhr.status === 204) {
+                    resolve(parseInt(xhr.getResponseHeader('Upload-Offset'), 10));
+                    return;
+                }
+                let message = `Erreur ${xhr.status}`;
+                try {
+                    message = JSON.parse(xhr.responseText).error || message;
+                } catch (e) {}
+                reject(new UploadError(message, xhr.status));
+            };
+            xhr.onerror = () => reject(new UploadError('Connexion interrompue', 0));
+            xhr.ontimeout = xhr.onerror;
+            xhr.send(chunk);
+        });
+    }
+
+    forget() {
+        localStorage.removeItem(this.fingerprint);
+        this.url = null;
+        this.offset = 0;
+    }
+}
+
+async function responseError(response) {
+    let message = `Erreur ${response.status}`;
+    try {
+        message = (await response.json()).error || message;
+    } catch (e) {}
+    return new UploadError(message, response.status);
+}
+
+// Envoyer les documents du formulaire l'un après l'autre; onProgress(octets envoyés, total)
+async function uploadDocuments(form, onProgress) {
+    const files = DOCUMENT_FIELDS
+        .filter(field => form[field] && form[field].files.length)
+        .map(field => [field, form[field].files[0]]);
+    const total = files.reduce((sum, [, file]) => sum + file.size, 0);
+
+    let done = 0;
+    const uploads = {};
+    for (const [field, file] of files) {
+        const upload = new ResumableUpload(file, (sent) => onProgress(done + sent, total));
+        await upload.start();
+        done += file.size;
+        uploads[field] = upload;
+    }
+    return uploads;
+}
+
+// Données de /postuler: les fichiers sont remplacés par les identifiants d'envoi
+function applicationFormData(form, uploads) {
+    const formData = new FormData(form);
+    DOCUMENT_FIELDS.forEach(field => formData.delete(field));
+    for (const [field, upload] of Object.entries(uploads)) {
+        formData.append(`${field}_upload`, upload.id);
+    }
+    return formData;
+}
@@ -309,20 +309,22 @@ class CandidatureApp {
         this.updateProgress(0, 'Préparation de l\'envoi...');
         
         try {
-            const formData = new FormData(this.form);
-            
-            // Simuler la progression
-            this.simulateProgress();
+            // Documents envoyés par morceaux (reprise automatique après coupure)
+            const uploads = await uploadDocuments(this.form, (sent, total) => {
+                const percent = total ? Math.floor(sent * 95 / total) : 95;
+                this.updateProgress(percent, `Envoi des documents... ${this.formatBytes(sent)} / ${this.formatBytes(total)}`);
+            });
             
-            // Envoyer la requête
+            this.updateProgress(95, 'Enregistrement de la candidature...');
             const response = await fetch(API_URL, {
                 method: 'POST',
-                body: formData
+                body: applicationFormData(this.form, uploads)
             });
             
             const result = await response.json();
             
             if (result.success) {
+                Object.values(uploads).forEach(upload => upload.forget());
                 this.updateProgress(100, 'Candidature envoyée !');
                 this.showSuccess(result);
                 this.resetForm();
@@ -371,18 +373,6 @@ class CandidatureApp {
         return isValid;
     }
     
-    simulateProgress() {
-        let progress = 0;
-        const interval = setInterval(() => {
-            if (progress >= 90) {
-                clearInterval(interval);
-                return;
-            }
-            progress += 10;
-            this.updateProgress(progress, `Envoi... ${progress}%`);
-        }, 300);
-    }
-    
     updateProgress(percent, text) {
         this.progressBar.style.width = `${percent}%`;
         this.progressText.textContent = text;
@@ -509,10 +499,10 @@ function initializeCountdown() {
 
 async function loadStatistics() {
     try {
-        const response = await fetch('/api/candidatures');
-        const candidatures = await response.json();
+        const response = await fetch('/api/candidatures/count');
+        const data = await response.json();
         
-        document.getElementById('total-candidatures').textContent = candidatures.length;
+        document.getElementById('total-candidatures').textContent = data.candidatures_count;
     } catch (error) {
         console.error('Erreur chargement statistiques:', error);
     }
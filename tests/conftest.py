@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pytest
+
+# Métriques du processus de test uniquement (pas de dossier multiprocessus)
+os.environ.pop('PROMETHEUS_MULTIPROC_DIR', None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config as config_module  # noqa: E402
+from app import create_app, db  # noqa: E402
+
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    """Créer une application sur une base SQLite et des dossiers propres au test"""
+    def factory(base=config_module.DevelopmentConfig, **overrides):
+        valeurs = {
+            'TESTING': True,
+            'SECRET_KEY': 'test',
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+            'UPLOAD_FOLDER': str(tmp_path / 'uploads'),
+            'JINJA_BYTECODE_CACHE_DIR': '',
+            'PREVIEW_WORKERS': 0,
+            'INGESTION_JOURNAL_DIR': str(tmp_path / 'ingestion'),
+        }
+        valeurs.update(overrides)
+        monkeypatch.setitem(config_module.config, 'test', type('TestConfig', (base,), valeurs))
+        return create_app('test')
+    return factory
+
+
+@pytest.fixture
+def app(make_app):
+    application = make_app()
+    with application.app_context():
+        yield application
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,64 @@
+import pytest
+
+import bulk_import
+from app import Candidature, import_candidatures
+
+EN_TETE = 'nom_complet,email,ville\n'
+
+
+def write(path, lignes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(EN_TETE + ''.join(lignes), encoding='utf-8')
+    return str(path)
+
+
+class Interruption(Exception):
+    pass
+
+
+def interrompre(stats):
+    raise Interruption
+
+
+def test_same_name_and_size_is_a_different_import(app, tmp_path):
+    premier = write(tmp_path / '2024' / 'candidatures.csv', ['Alice,alice@example.com,Douala\n'])
+    second = write(tmp_path / '2025' / 'candidatures.csv', ['Alina,alina@example.com,Douala\n'])
+
+    assert import_candidatures(premier)['inserees'] == 1
+    stats = import_candidatures(second)
+    assert not stats['deja_termine']
+    assert stats['inserees'] == 1
+    assert import_candidatures(second)['deja_termine']
+    assert Candidature.query.count() == 2
+
+
+def test_interrupted_import_resumes_after_last_batch(app, tmp_path):
+    lignes = [f'Candidat {i},c{i}@example.com,Douala\n' for i in range(4)]
+    source = write(tmp_path / 'candidatures.csv', lignes)
+    with pytest.raises(Interruption):
+        import_candidatures(source, batch_size=2, progress=interrompre)
+    assert Candidature.query.count() == 2
+
+    # Même contenu: reprise après le dernier lot validé (ligne 3, en-tête compris)
+    stats = import_candidatures(source, batch_size=2)
+    assert (stats['reprise'], stats['inserees']) == (3, 2)
+    assert Candidature.query.count() == 4
+
+
+def test_modified_file_needs_restart(app, tmp_path):
+    lignes = [f'Candidat {i},c{i}@example.com,Douala\n' for i in range(4)]
+    source = write(tmp_path / 'candidatures.csv', lignes)
+    with pytest.raises(Interruption):
+        import_candidatures(source, batch_size=2, progress=interrompre)
+
+    write(tmp_path / 'candidatures.csv', lignes + ['Nouveau,nouveau@example.com,Douala\n'])
+    with pytest.raises(bulk_import.ImportSourceChangedError):
+        import_candidatures(source, batch_size=2)
+    assert Candidature.query.count() == 2
+
+    result = app.test_cli_runner().invoke(args=['candidatures-import', source])
+    assert result.exit_code != 0
+    assert '--restart' in result.output
+
+    stats = import_candidatures(source, batch_size=2, restart=True)
+    assert (stats['reprise'], stats['inserees']) == (0, 5)
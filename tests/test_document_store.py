@@ -0,0 +1,66 @@
+import os
+import time
+
+import document_store
+from app import purge_orphan_documents
+from upload_pipeline import StreamingUpload
+
+
+def age(path, seconds):
+    passe = time.time() - seconds
+    os.utime(path, (passe, passe))
+
+
+def streamed(upload_folder, data):
+    stream = StreamingUpload(upload_folder)
+    stream.write(data)
+    return stream
+
+
+def test_dedup_upload_refreshes_orphan_before_purge(app):
+    upload_folder = app.config['UPLOAD_FOLDER']
+    chemin, nouveau = document_store.commit_upload(streamed(upload_folder, b'%PDF-1.4 cv'), upload_folder, 'pdf')
+    assert nouveau
+    absolu = document_store.resolve(upload_folder, chemin)
+    # Contenu sans référence depuis longtemps (dernière candidature supprimée)
+    age(absolu, 3600)
+
+    # Nouvel envoi du même contenu, candidature pas encore validée
+    assert document_store.commit_upload(streamed(upload_folder, b'%PDF-1.4 cv'), upload_folder, 'pdf') == (chemin, False)
+
+    purge_orphan_documents(grace=600)
+    assert os.path.isfile(absolu)
+
+    age(absolu, 3600)
+    purge_orphan_documents(grace=600)
+    assert not os.path.exists(absolu)
+
+
+def test_import_existing_content_refreshes_it(app, tmp_path):
+    upload_folder = app.config['UPLOAD_FOLDER']
+    source = tmp_path / 'lettre.pdf'
+    source.write_bytes(b'%PDF-1.4 lettre')
+    chemin, _, _ = document_store.import_file(str(source), upload_folder)
+    absolu = document_store.resolve(upload_folder, chemin)
+    age(absolu, 3600)
+
+    copie = tmp_path / 'copie.pdf'
+    copie.write_bytes(b'%PDF-1.4 lettre')
+    assert document_store.import_file(str(copie), upload_folder)[0] == chemin
+    assert time.time() - os.path.getmtime(absolu) < 60
+
+
+def test_uploads_route_requires_admin(app, client):
+    upload_folder = app.config['UPLOAD_FOLDER']
+    chemin, _ = document_store.commit_upload(streamed(upload_folder, b'%PDF-1.4 cv'), upload_folder, 'pdf')
+
+    response = client.get(f'/uploads/{chemin}')
+    assert response.status_code == 302
+    assert '/admin/login' in response.headers['Location']
+
+    with client.session_transaction() as session:
+        session['admin_logged_in'] = True
+    response = client.get(f'/uploads/{chemin}')
+    assert response.status_code == 200
+    assert response.data == b'%PDF-1.4 cv'
+    response.close()
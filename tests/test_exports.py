@@ -0,0 +1,32 @@
+import io
+import os
+import zipfile
+
+import document_store
+from app import Candidature, db
+
+
+def test_zip_entries_stay_in_candidate_folder(app, client):
+    upload_folder = app.config['UPLOAD_FOLDER']
+    cv = document_store.store_path('a' * 64, 'pdf')
+    chemin = document_store.resolve(upload_folder, cv)
+    os.makedirs(os.path.dirname(chemin), exist_ok=True)
+    with open(chemin, 'wb') as f:
+        f.write(b'%PDF-1.4 cv')
+    candidature = Candidature(nom_complet='../../etc/x\\..', email='x@example.com', cv_path=cv)
+    db.session.add(candidature)
+    db.session.commit()
+
+    with client.session_transaction() as session:
+        session['admin_logged_in'] = True
+
+    for url in ('/admin/export-zip', f'/admin/download-all/{candidature.id}'):
+        response = client.get(url)
+        assert response.status_code == 200
+        noms = zipfile.ZipFile(io.BytesIO(response.get_data())).namelist()
+        assert len(noms) == 2
+        for nom in noms:
+            parties = nom.split('/')
+            assert '\\' not in nom
+            assert not any(partie.startswith('.') for partie in parties)
+            assert len(parties) == (2 if url == '/admin/export-zip' else 1)
@@ -0,0 +1,69 @@
+import io
+import json
+from datetime import date
+
+from app import Candidature, EmailQueue, db, run_ingestion_writer
+
+
+def submit(client):
+    return client.post('/postuler', data={
+        'nom_complet': 'Jean Dupont', 'email': 'jean@example.com', 'ville': 'Douala',
+        'motivation': 'Je suis motivé', 'competences': 'SEO',
+        'cv': (io.BytesIO(b'%PDF-1.4 cv'), 'cv.pdf'),
+        'lettre_motivation': (io.BytesIO(b'%PDF-1.4 lettre'), 'lettre.pdf'),
+    }, content_type='multipart/form-data')
+
+
+def test_confirmation_email_uses_deposit_reference(make_app):
+    application = make_app(INGESTION_MODE='journal', SUBMISSION_RATE_BURST=0, DATE_LIMITE=date(2099, 1, 1))
+    response = submit(application.test_client())
+    assert response.status_code == 202
+    reference = response.get_json()['reference']
+    assert reference.startswith('DEP-')
+
+    with application.app_context():
+        run_ingestion_writer(application, once=True)
+        candidature = Candidature.query.one()
+        assert candidature.reference == reference
+
+        confirmation = EmailQueue.query.filter(EmailQueue.recipients == json.dumps(['jean@example.com'])).one()
+        assert f'Référence: {reference}' in confirmation.body
+        assert f'CAND{candidature.id:06d}' not in confirmation.body
+        db.session.remove()
+
+
+def test_direct_mode_reference_matches_email(app, client):
+    app.config['DATE_LIMITE'] = date(2099, 1, 1)
+    response = submit(client)
+    assert response.status_code == 200
+    reference = response.get_json()['reference']
+    assert reference == f"CAND{response.get_json()['id']:06d}"
+    confirmation = EmailQueue.query.filter(EmailQueue.recipients == json.dumps(['jean@example.com'])).one()
+    assert f'Référence: {reference}' in confirmation.body
+
+
+def test_admin_export_and_search_use_deposit_reference(make_app):
+    application = make_app(INGESTION_MODE='journal', SUBMISSION_RATE_BURST=0, DATE_LIMITE=date(2099, 1, 1))
+    client = application.test_client()
+    reference = submit(client).get_json()['reference']
+
+    with application.app_context():
+        run_ingestion_writer(application, once=True)
+        db.session.remove()
+
+    with client.session_transaction() as session:
+        session['admin_logged_in'] = True
+
+    export = client.get('/admin/export?format=csv').get_data(as_text=True)
+    ligne = export.splitlines()[1]
+    assert f',{reference},' in ligne
+    assert 'CAND' not in ligne
+
+    trouvees = client.get('/admin/export', query_string={'format': 'csv', 'search': reference.lower()})
+    assert reference in trouvees.get_data(as_text=True)
+    autre = client.get('/admin/export', query_string={'format': 'csv', 'search': 'DEP-20000101-00000000'})
+    assert len(autre.get_data(as_text=True).splitlines()) == 1
+
+    candidatures = client.get('/admin/api/candidatures').get_json()['candidatures']
+    assert [c['reference'] for c in candidatures] == [reference]
+    assert f'Référence: {reference}' in client.get(f"/admin/candidature/{candidatures[0]['id']}").get_data(as_text=True)
@@ -0,0 +1,73 @@
+from datetime import datetime
+
+import pytest
+
+from app import KEYSET_ORDER, Candidature, KeysetPagination, db, decode_cursor, encode_cursor
+
+MEME_DATE = datetime(2026, 3, 1, 9, 30)
+
+
+@pytest.fixture
+def candidatures(app):
+    """7 candidatures dont 5 à la même date: l'id départage"""
+    dates = [datetime(2026, 3, 2), MEME_DATE, MEME_DATE, MEME_DATE, MEME_DATE, MEME_DATE, datetime(2026, 2, 1)]
+    for i, date_soumission in enumerate(dates):
+        db.session.add(Candidature(nom_complet=f'Candidat {i}', email=f'c{i}@example.com', date_soumission=date_soumission))
+    db.session.commit()
+    return [c.id for c in Candidature.query.order_by(*KEYSET_ORDER)]
+
+
+def page(after=None, before=None, per_page=2):
+    return KeysetPagination(
+        page=1, per_page=per_page, error_out=False, query=Candidature.query.order_by(*KEYSET_ORDER),
+        keyset=True, after=after, before=before, total=7
+    )
+
+
+def test_cursor_round_trip(app, candidatures):
+    candidature = db.session.get(Candidature, candidatures[2])
+    assert decode_cursor(encode_cursor(candidature)) == (MEME_DATE, candidature.id)
+    for invalide in ('', 'pas-un-curseur', 'WzFd', encode_cursor(candidature)[:-3]):
+        with pytest.raises(ValueError):
+            decode_cursor(invalide)
+
+
+def test_next_pages_break_ties_on_id(app, candidatures):
+    vus, courante = [], page()
+    while True:
+        vus += [c.id for c in courante.items]
+        if not courante.has_next:
+            break
+        courante = page(after=decode_cursor(courante.next_cursor))
+    assert vus == candidatures
+
+
+def test_previous_page_from_equal_timestamp_boundary(app, candidatures):
+    # Page 3 commence au milieu des dates identiques
+    troisieme = page(after=decode_cursor(page(after=decode_cursor(page().next_cursor)).next_cursor))
+    assert [c.id for c in troisieme.items] == candidatures[4:6]
+    assert {c.date_soumission for c in troisieme.items} == {MEME_DATE}
+
+    precedente = page(before=decode_cursor(troisieme.prev_cursor))
+    assert [c.id for c in precedente.items] == candidatures[2:4]
+    assert precedente.has_prev and precedente.has_next
+
+    premiere = page(before=decode_cursor(precedente.prev_cursor))
+    assert [c.id for c in premiere.items] == candidatures[:2]
+    assert not premiere.has_prev
+
+
+def test_api_pages_through_equal_timestamps(app, client, candidatures):
+    with client.session_transaction() as session:
+        session['admin_logged_in'] = True
+
+    vus, cursor = [], None
+    while True:
+        data = client.get('/admin/api/candidatures', query_string={'limit': 2, 'cursor': cursor or ''}).get_json()
+        vus += [c['id'] for c in data['candidatures']]
+        cursor = data['next_cursor']
+        if cursor is None:
+            break
+    assert vus == candidatures
+
+    assert client.get('/admin/api/candidatures?cursor=pas-un-curseur').status_code == 400
@@ -0,0 +1,89 @@
+from datetime import datetime
+
+import pytest
+
+from app import EmailQueue, db, queue_email, run_mail_worker
+from benchmarks.smtp_stub import SMTPStub
+
+
+@pytest.fixture
+def smtp(app):
+    """Serveur SMTP local qui refuse refuse@example.com"""
+    stub = SMTPStub(refuse=['refuse@example.com']).start()
+    app.config.update(
+        MAIL_SERVER='127.0.0.1', MAIL_PORT=stub.port, MAIL_USE_TLS=False, MAIL_USE_SSL=False,
+        MAIL_USERNAME=None, MAIL_PASSWORD=None, MAIL_SUPPRESS_SEND=False,
+        MAIL_QUEUE_MAX_ATTEMPTS=2, MAIL_QUEUE_RETRY_DELAY=30,
+    )
+    yield stub
+    stub.stop()
+
+
+def make_due(email):
+    """Rendre un email replanifié immédiatement disponible pour le worker"""
+    email.prochaine_tentative = datetime.utcnow()
+    db.session.commit()
+
+
+def test_delivers_queued_email(app, smtp):
+    queue_email('Bienvenue', ['candidat@example.com'], 'Bonjour', 'noreply@example.com')
+    db.session.commit()
+
+    run_mail_worker(app, once=True)
+
+    email = EmailQueue.query.one()
+    assert email.statut == 'sent'
+    assert email.date_envoi is not None
+    assert email.tentatives == 0
+    assert smtp.messages == 1
+
+
+def test_refused_email_backs_off_then_goes_dead_and_requeues(app, smtp):
+    queue_email('Refusé', ['refuse@example.com'], 'Bonjour', 'noreply@example.com')
+    queue_email('Accepté', ['candidat@example.com'], 'Bonjour', 'noreply@example.com')
+    db.session.commit()
+
+    # Premier échec: replanifié avec un délai, l'autre message part quand même
+    run_mail_worker(app, once=True)
+    refuse = EmailQueue.query.filter_by(subject='Refusé').one()
+    assert refuse.statut == 'pending'
+    assert refuse.tentatives == 1
+    assert refuse.derniere_erreur
+    assert (refuse.prochaine_tentative - datetime.utcnow()).total_seconds() > 20
+    assert EmailQueue.query.filter_by(subject='Accepté').one().statut == 'sent'
+    assert smtp.messages == 1
+
+    # Pas encore dû: le worker ne le reprend pas
+    run_mail_worker(app, once=True)
+    assert db.session.get(EmailQueue, refuse.id).tentatives == 1
+
+    # Dernière tentative (MAIL_QUEUE_MAX_ATTEMPTS=2): lettre morte
+    make_due(refuse)
+    run_mail_worker(app, once=True)
+    refuse = db.session.get(EmailQueue, refuse.id)
+    assert refuse.statut == 'dead'
+    assert refuse.tentatives == 2
+
+    # `flask mail-requeue-dead` le remet en file; accepté une fois le destinataire débloqué
+    result = app.test_cli_runner().invoke(args=['mail-requeue-dead'])
+    assert result.exit_code == 0, result.output
+    refuse = db.session.get(EmailQueue, refuse.id)
+    assert (refuse.statut, refuse.tentatives) == ('pending', 0)
+
+    smtp.refuse = ()
+    run_mail_worker(app, once=True)
+    assert db.session.get(EmailQueue, refuse.id).statut == 'sent'
+    assert smtp.messages == 2
+
+
+def test_unreachable_server_reschedules_whole_batch(app, smtp):
+    queue_email('A', ['a@example.com'], 'Bonjour', 'noreply@example.com')
+    queue_email('B', ['b@example.com'], 'Bonjour', 'noreply@example.com')
+    db.session.commit()
+    smtp.stop()
+
+    run_mail_worker(app, once=True)
+
+    for email in EmailQueue.query.all():
+        assert (email.statut, email.tentatives) == ('pending', 1)
+        assert email.verrouille_par is None
@@ -0,0 +1,98 @@
+import gzip
+from datetime import date
+
+import pytest
+
+import assets
+import page_cache
+from config import ProductionConfig
+
+
+@pytest.fixture
+def client(make_app):
+    application = make_app(PAGE_CACHE=True, DATE_LIMITE=date(2099, 1, 1))
+    return application.test_client()
+
+
+def get(client, url='/', etag=None, encodage='identity'):
+    headers = {'Accept-Encoding': encodage}
+    if etag:
+        headers['If-None-Match'] = etag
+    return client.get(url, headers=headers)
+
+
+def test_revalidation_returns_304_until_config_changes(client):
+    premiere = get(client)
+    assert premiere.status_code == 200
+    assert premiere.headers['Cache-Control'] == 'public, no-cache'
+    assert '01/01/2099' in premiere.get_data(as_text=True)
+    etag = premiere.headers['ETag']
+
+    revalidation = get(client, etag=etag)
+    assert revalidation.status_code == 304
+    assert revalidation.get_data() == b''
+    assert revalidation.headers['ETag'] == etag
+
+    # Nouvelle date limite: nouvelle version de la page, l'ancien ETag ne correspond plus
+    client.application.config['DATE_LIMITE'] = date(2099, 2, 1)
+    modifiee = get(client, etag=etag)
+    assert modifiee.status_code == 200
+    assert '01/02/2099' in modifiee.get_data(as_text=True)
+    assert modifiee.headers['ETag'] != etag
+    assert get(client, etag=modifiee.headers['ETag']).status_code == 304
+
+
+def test_gzip_has_its_own_etag(client):
+    identite = get(client, '/contact')
+    compressee = get(client, '/contact', encodage='gzip, br')
+    assert compressee.headers['Content-Encoding'] == 'gzip'
+    assert compressee.headers['Vary'] == 'Accept-Encoding'
+    assert gzip.decompress(compressee.get_data()) == identite.get_data()
+    assert compressee.headers['ETag'] == identite.headers['ETag'][:-1] + '-gz"'
+
+    # Une version ne valide pas l'autre
+    assert get(client, '/contact', etag=identite.headers['ETag'], encodage='gzip').status_code == 200
+    assert get(client, '/contact', etag=compressee.headers['ETag'], encodage='gzip').status_code == 304
+
+
+def test_new_asset_build_gives_new_page(make_app):
+    application = make_app(base=ProductionConfig, SCHEMA_AUTO_CREATE=True, PAGE_CACHE=True)
+    client = application.test_client()
+    etag = get(client).headers['ETag']
+    application.extensions['assets_manifest'] = {'home.css': 'home.0123456789ab.css'}
+    page = get(client, etag=etag)
+    assert page.status_code == 200
+    assert '/assets/home.0123456789ab.css' in page.get_data(as_text=True)
+
+
+def test_rebuild_in_debug_gives_new_page(client, monkeypatch):
+    # En développement, le manifeste est relu sur disque à chaque page
+    monkeypatch.setattr(assets, 'is_stale', lambda static_folder: False)
+    monkeypatch.setattr(assets, 'load_manifest', lambda static_folder: {'home.css': 'home.aaaaaaaaaaaa.css'})
+    etag = get(client).headers['ETag']
+    assert get(client, etag=etag).status_code == 304
+
+    monkeypatch.setattr(assets, 'load_manifest', lambda static_folder: {'home.css': 'home.bbbbbbbbbbbb.css'})
+    page = get(client, etag=etag)
+    assert page.status_code == 200
+    assert '/assets/home.bbbbbbbbbbbb.css' in page.get_data(as_text=True)
+
+
+def test_requests_with_a_session_are_not_cached(client):
+    etag = get(client).headers['ETag']
+    with client.session_transaction() as session:
+        session['admin_logged_in'] = True
+    page = get(client, etag=etag)
+    assert page.status_code == 200
+    assert 'ETag' not in page.headers
+
+
+def test_cache_evicts_least_recently_used():
+    cache = page_cache.PageCache(max_entries=2)
+    entrees = {cle: page_cache.Entry(cle.encode(), b'', cle, 'text/html') for cle in 'abc'}
+    cache.set('a', entrees['a'])
+    cache.set('b', entrees['b'])
+    assert cache.get('a') is entrees['a']
+    cache.set('c', entrees['c'])
+    assert (cache.get('a'), cache.get('b'), cache.get('c')) == (entrees['a'], None, entrees['c'])
+    assert len(cache) == 2
@@ -0,0 +1,17 @@
+import os
+
+import config as config_module
+from app import db
+
+
+def test_sqlite_read_pool_does_not_touch_database_at_boot(make_app, tmp_path):
+    application = make_app(config_module.ProductionConfig, SCHEMA_AUTO_CREATE=False, SQLITE_READ_POOL=True)
+    assert application.extensions['read_engine'] is not None
+    assert not os.path.exists(tmp_path / 'test.db')
+
+    # Mode WAL activé à la première connexion du primaire
+    with application.app_context():
+        with db.engine.connect() as connection:
+            assert connection.exec_driver_sql('PRAGMA journal_mode').scalar() == 'wal'
+        db.engine.dispose()
+        application.extensions['read_engine'].dispose()
@@ -0,0 +1,111 @@
+import base64
+import io
+import os
+import time
+from datetime import date
+
+import pytest
+
+import resumable_upload
+
+PDF = b'%PDF-1.4 ' + b'x' * 1000
+TUS = {'Tus-Resumable': resumable_upload.TUS_VERSION}
+
+
+@pytest.fixture
+def client(make_app):
+    application = make_app(DATE_LIMITE=date(2099, 1, 1), SUBMISSION_RATE_BURST=0)
+    return application.test_client()
+
+
+def create(client, filename='cv.pdf', length=len(PDF)):
+    response = client.post('/api/uploads', headers={
+        **TUS, 'Upload-Length': str(length),
+        'Upload-Metadata': 'filename ' + base64.b64encode(filename.encode()).decode(),
+    })
+    assert response.status_code == 201
+    assert response.headers['Upload-Offset'] == '0'
+    return response.headers['Location']
+
+
+def patch(client, location, offset, data):
+    return client.patch(location, data=data, headers={
+        **TUS, 'Upload-Offset': str(offset), 'Content-Type': 'application/offset+octet-stream',
+    })
+
+
+def offset(client, location):
+    response = client.head(location, headers=TUS)
+    return response.status_code, response.headers.get('Upload-Offset')
+
+
+def test_resumes_from_server_offset_and_rejects_wrong_offset(client):
+    location = create(client)
+    assert patch(client, location, 0, PDF[:400]).status_code == 204
+    assert offset(client, location) == (200, '400')
+
+    # Morceau renvoyé deux fois (réponse perdue) ou sauté: 409, rien n'est écrit
+    assert patch(client, location, 0, PDF[:400]).status_code == 409
+    assert patch(client, location, 600, PDF[600:]).status_code == 409
+    assert offset(client, location) == (200, '400')
+
+    response = patch(client, location, 400, PDF[400:])
+    assert response.status_code == 204
+    assert response.headers['Upload-Offset'] == str(len(PDF))
+
+
+def test_oversized_chunk_is_rejected_whole(client):
+    location = create(client)
+    assert patch(client, location, 0, PDF[:100]).status_code == 204
+    assert patch(client, location, 100, PDF[100:] + b'en trop').status_code == 413
+    assert offset(client, location) == (200, '100')
+
+
+def test_content_not_matching_extension_is_discarded(client):
+    executable = b'MZ\x90\x00' + b'\x00' * 60
+    location = create(client, length=len(executable))
+    assert patch(client, location, 0, executable).status_code == 415
+    assert offset(client, location) == (404, None)
+
+
+def test_upload_id_cannot_be_reused_after_completion(client):
+    cv = create(client)
+    assert patch(client, cv, 0, PDF).status_code == 204
+    assert patch(client, cv, len(PDF), b'').status_code == 409
+    assert patch(client, cv, 0, PDF).status_code == 409
+
+    def submit(email):
+        return client.post('/postuler', data={
+            'nom_complet': 'Jean Dupont', 'email': email, 'ville': 'Douala',
+            'motivation': 'Je suis motivé', 'competences': 'SEO',
+            'cv_upload': cv.rsplit('/', 1)[-1],
+            'lettre_motivation': (io.BytesIO(b'%PDF-1.4 lettre'), 'lettre.pdf'),
+        }, content_type='multipart/form-data')
+
+    assert submit('jean@example.com').status_code == 200
+    # Envoi consommé par la candidature: identifiant inconnu ensuite
+    response = submit('autre@example.com')
+    assert response.status_code == 400
+    assert 'cv' in response.get_json()['error']
+    assert offset(client, cv) == (404, None)
+
+
+def test_inactive_uploads_expire(client):
+    upload_folder = client.application.config['UPLOAD_FOLDER']
+    ancien, recent = create(client), create(client)
+    assert patch(client, ancien, 0, PDF[:10]).status_code == 204
+    assert patch(client, recent, 0, PDF[:10]).status_code == 204
+
+    # L'activité se lit sur les métadonnées, modifiées à chaque morceau
+    part_path, meta_path = resumable_upload._paths(upload_folder, ancien.rsplit('/', 1)[-1])
+    passe = time.time() - 7200
+    os.utime(meta_path, (passe, passe))
+    orphelin = os.path.join(os.path.dirname(part_path), 'f' * 32 + '.part')
+    open(orphelin, 'wb').close()
+    os.utime(orphelin, (passe, passe))
+
+    assert resumable_upload.expire_uploads(upload_folder, 3600) == 1
+    assert not os.path.exists(part_path) and not os.path.exists(orphelin)
+    assert offset(client, ancien) == (404, None)
+    assert patch(client, ancien, 10, PDF[10:]).status_code == 404
+    assert offset(client, recent) == (200, '10')
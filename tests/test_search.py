@@ -0,0 +1,74 @@
+from sqlalchemy.dialects import postgresql
+
+import search_index
+from app import Candidature, db
+
+
+def candidat(nom, **valeurs):
+    candidature = Candidature(nom_complet=nom, email=f"{nom.split()[0].lower()}@example.com", **valeurs)
+    db.session.add(candidature)
+    db.session.commit()
+    return candidature
+
+
+def search(term, backend='fts5'):
+    query, rank = search_index.apply_search(Candidature.query, Candidature, term, backend)
+    if rank is not None:
+        query = query.order_by(rank, Candidature.id)
+    return [c.nom_complet for c in query]
+
+
+def test_fts5_folds_accents_and_matches_prefixes(app):
+    assert app.extensions['search_backend'] == 'fts5'
+    candidat('Hélène Ébanda', ville='Yaoundé', competences_marketing='Référencement naturel')
+    candidat('Paul Mbarga', ville='Douala')
+
+    assert search('helene') == ['Hélène Ébanda']
+    assert search('EBANDA') == ['Hélène Ébanda']
+    assert search('yaounde') == ['Hélène Ébanda']
+    assert search('referen') == ['Hélène Ébanda']
+    # Tous les mots doivent correspondre
+    assert search('helene douala') == []
+    # Caractères d'opérateurs FTS ignorés
+    assert search('"paul" *') == ['Paul Mbarga']
+    assert search('  ') == ['Hélène Ébanda', 'Paul Mbarga']
+
+
+def test_fts5_ranks_name_before_letter(app):
+    candidat('Alice Martin', lettre_motivation_text='Je connais Samuel depuis longtemps')
+    candidat('Samuel Eto')
+
+    assert search('samuel') == ['Samuel Eto', 'Alice Martin']
+
+
+def test_fts5_follows_updates_and_deletes(app):
+    candidature = candidat('Jean Dupont')
+    candidature.nom_complet = 'Jeanne Dupré'
+    db.session.commit()
+    assert search('dupre') == ['Jeanne Dupré']
+    assert search('dupont') == []
+
+    db.session.delete(candidature)
+    db.session.commit()
+    assert search('dupre') == []
+
+
+def test_fallback_without_index_uses_like(app):
+    candidat('Paul Mbarga', competences_marketing='SEO, SEA')
+    assert search('mbar', backend=None) == ['Paul Mbarga']
+    assert search('seo paul', backend=None) == ['Paul Mbarga']
+    assert search('inconnu', backend=None) == []
+
+
+def test_postgresql_query_and_trigger_fold_accents():
+    query, rank = search_index.apply_search(
+        db.select(Candidature.id), Candidature, 'Hélène réf', 'postgresql'
+    )
+    sql = str(query.order_by(rank).compile(dialect=postgresql.dialect()))
+    assert 'candidatures.search_vector @@ to_tsquery' in sql
+    assert 'unaccent' in sql
+    assert 'ts_rank(candidatures.search_vector' in sql
+
+    ddl = '\n'.join(search_index.postgres_ddl(search_index.INDEXED_COLUMNS))
+    assert "to_tsvector('french', unaccent(coalesce(NEW.nom_complet, ''))), 'A'" in ddl
+    assert 'USING GIN (search_vector)' in ddl
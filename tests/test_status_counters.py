@@ -0,0 +1,65 @@
+import threading
+
+import app as app_module
+from app import Candidature, CompteurStatut, db, reconcile_status_counters, record_new_candidature, status_counts
+
+
+def add_candidature(nom, statut='Nouvelle'):
+    candidature = Candidature(nom_complet=nom, email=f'{nom}@example.com', statut=statut)
+    db.session.add(candidature)
+    db.session.flush()
+    record_new_candidature(candidature)
+    db.session.commit()
+
+
+def real_counts():
+    return {
+        statut: total for statut, total in db.session.query(
+            Candidature.statut, db.func.count(Candidature.id)
+        ).group_by(Candidature.statut)
+    }
+
+
+def test_reconcile_fixes_drift(app):
+    add_candidature('alice')
+    add_candidature('bruno', 'En revue')
+    db.session.add(CompteurStatut(statut='Nouvelle', slot=99, total=3))
+    db.session.commit()
+
+    assert reconcile_status_counters() == {'Nouvelle': -3}
+    assert status_counts() == real_counts() == {'Nouvelle': 1, 'En revue': 1}
+    assert reconcile_status_counters() == {}
+
+
+def test_insert_during_reconcile_is_not_lost(app, monkeypatch):
+    add_candidature('alice')
+    db.session.add(CompteurStatut(statut='Rejeté', slot=0, total=2))
+    db.session.commit()
+
+    # Une soumission arrive après le comptage, avant la réécriture des compteurs
+    concurrente = {}
+
+    def submit():
+        with app.app_context():
+            add_candidature('chloe')
+            concurrente['fin'] = True
+
+    lire_compteurs = app_module.status_counts
+
+    def status_counts_during_submission():
+        thread = threading.Thread(target=submit)
+        thread.start()
+        # Sans verrou, l'insertion serait validée pendant cette attente
+        thread.join(timeout=1)
+        concurrente['thread'] = thread
+        return lire_compteurs()
+
+    monkeypatch.setattr(app_module, 'status_counts', status_counts_during_submission)
+    reconcile_status_counters()
+    monkeypatch.undo()
+    concurrente['thread'].join(timeout=10)
+
+    assert concurrente.get('fin')
+    db.session.expire_all()
+    assert real_counts() == {'Nouvelle': 2}
+    assert status_counts() == {'Nouvelle': 2}
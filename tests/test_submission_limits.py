@@ -0,0 +1,38 @@
+from datetime import date
+
+from app import db
+
+# Période de candidature ouverte
+OUVERTE = date(2099, 1, 1)
+
+
+def post_from(client, adresse):
+    # Corps vide: refus de validation (400) si la soumission passe la limite
+    return client.post('/postuler', headers={'X-Forwarded-For': adresse}, environ_base={'REMOTE_ADDR': '10.0.0.1'})
+
+
+def test_forwarded_clients_get_separate_buckets(make_app):
+    application = make_app(SUBMISSION_RATE_BURST=1, SUBMISSION_RATE_PER_MINUTE=1, DATE_LIMITE=OUVERTE,
+                           TRUSTED_PROXY_HOPS=1)
+    client = application.test_client()
+
+    assert post_from(client, '203.0.113.7').status_code == 400
+    refus = post_from(client, '203.0.113.7')
+    assert refus.status_code == 429
+    assert int(refus.headers['Retry-After']) > 0
+    # Autre candidat derrière le même proxy
+    assert post_from(client, '198.51.100.4').status_code == 400
+    with application.app_context():
+        db.session.remove()
+
+
+def test_forwarded_header_ignored_without_trusted_proxy(make_app):
+    application = make_app(SUBMISSION_RATE_BURST=1, SUBMISSION_RATE_PER_MINUTE=1, DATE_LIMITE=OUVERTE,
+                           TRUSTED_PROXY_HOPS=0)
+    client = application.test_client()
+
+    assert post_from(client, '203.0.113.7').status_code == 400
+    # Sans proxy de confiance, l'en-tête est falsifiable: la limite porte sur la connexion
+    assert post_from(client, '198.51.100.4').status_code == 429
+    with application.app_context():
+        db.session.remove()
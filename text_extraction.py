@@ -0,0 +1,108 @@
+import os
+import re
+import zipfile
+from xml.etree import ElementTree
+
+import document_store
+
+# Extraction du texte des documents (exécutée dans les processus de `flask text-worker`)
+EXTRACTABLE_EXTENSIONS = {'pdf', 'docx', 'txt'}
+
+_WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_SPACES = re.compile(r'[ \t\r\f\v]+')
+_BLANK_LINES = re.compile(r'\n\s*\n+')
+
+
+def normalize(texte):
+    """Espaces multiples et lignes vides superflues retirés"""
+    texte = _SPACES.sub(' ', texte.replace('\x00', ''))
+    return _BLANK_LINES.sub('\n\n', texte).strip()
+
+
+def _pdf_text(source, max_chars):
+    import pypdfium2
+
+    morceaux, total = [], 0
+    pdf = pypdfium2.PdfDocument(source)
+    try:
+        for index in range(len(pdf)):
+            page = pdf[index]
+            textpage = page.get_textpage()
+            morceau = textpage.get_text_range()
+            textpage.close()
+            page.close()
+            morceaux.append(morceau)
+            total += len(morceau)
+            if total >= max_chars:
+                break
+    finally:
+        pdf.close()
+    return '\n'.join(morceaux)
+
+
+def _docx_text(source, max_chars):
+    # Lecture en flux de word/document.xml: paragraphes, tabulations et sauts de ligne
+    morceaux, total = [], 0
+    with zipfile.ZipFile(source) as archive, archive.open('word/document.xml') as xml:
+        for _, element in ElementTree.iterparse(xml, events=('end',)):
+            tag = element.tag
+            if tag == f'{_WORD_NS}t' and element.text:
+                morceaux.append(element.text)
+                total += len(element.text)
+            elif tag == f'{_WORD_NS}tab':
+                morceaux.append('\t')
+            elif tag in (f'{_WORD_NS}br', f'{_WORD_NS}p'):
+                morceaux.append('\n')
+                if tag == f'{_WORD_NS}p':
+                    element.clear()
+            if total >= max_chars:
+                break
+    return ''.join(morceaux)
+
+
+def _txt_text(source, max_chars):
+    with open(source, 'rb') as f:
+        contenu = f.read(max_chars * 4)
+    try:
+        return contenu.decode('utf-8')
+    except UnicodeDecodeError as e:
+        if e.start >= len(contenu) - 3:
+            # Caractère coupé par la limite de lecture
+            return contenu[:e.start].decode('utf-8')
+        return contenu.decode('cp1252', errors='replace')
+
+
+_EXTRACTORS = {
+    'pdf': _pdf_text,
+    'docx': _docx_text,
+    'txt': _txt_text,
+}
+
+
+def extract_document(upload_folder, chemin, max_chars):
+    """Extraire le texte d'un document; retourne (statut, texte).
+
+    statut vaut 'ok', 'vide' (aucun texte, ex. PDF scanné), 'non_supporte'
+    ou 'erreur' (le texte contient alors le message).
+    """
+    extension = chemin.rsplit('.', 1)[-1].lower() if '.' in chemin else ''
+    extractor = _EXTRACTORS.get(extension)
+    if extractor is None:
+        return 'non_supporte', None
+
+    try:
+        texte = normalize(extractor(document_store.resolve(upload_folder, chemin), max_chars))[:max_chars]
+    except Exception as e:
+        return 'erreur', f'{type(e).__name__}: {e}'[:1000]
+    return ('ok', texte) if texte else ('vide', None)
+
+
+def sha256_of(upload_folder, chemin):
+    """Empreinte d'un document; lue dans le chemin pour le stockage par empreinte"""
+    if document_store.is_stored(chemin):
+        return chemin.rsplit('/', 1)[-1].split('.', 1)[0]
+    # Ancien fichier à plat: haché pour partager le même cache
+    source = document_store.resolve(upload_folder, chemin)
+    if not source or not os.path.isfile(source):
+        return None
+    return document_store.hash_file(source)
@@ -0,0 +1,101 @@
+import hashlib
+import os
+import time
+import uuid
+
+from flask import Request, current_app
+
+# Signatures (premiers octets) attendues pour chaque extension autorisée
+MAGIC_SIGNATURES = {
+    'pdf': (b'%PDF',),
+    'doc': (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',),
+    'docx': (b'PK\x03\x04',),
+    'jpg': (b'\xff\xd8\xff',),
+    'jpeg': (b'\xff\xd8\xff',),
+    'png': (b'\x89PNG\r\n\x1a\n',),
+    'gif': (b'GIF87a', b'GIF89a'),
+}
+
+HEAD_SIZE = 16
+
+PARTIAL_DIR = '.partial'
+
+
+def matches_signature(extension, head):
+    """Vérifier que le contenu correspond à l'extension annoncée"""
+    extension = (extension or '').lower()
+    if extension == 'txt':
+        # Pas de signature: on refuse seulement le binaire évident
+        return b'\x00' not in head
+    signatures = MAGIC_SIGNATURES.get(extension)
+    if signatures is None:
+        return False
+    return any(head.startswith(signature) for signature in signatures)
+
+
+class StreamingUpload:
+    """Fichier de réception écrit directement dans le dossier d'upload.
+
+    Le SHA-256, la taille et les premiers octets sont calculés pendant que
+    Werkzeug écrit le corps multipart: le fichier n'est lu qu'une fois, et
+    `commit` se contente d'un fsync et d'un renommage atomique.
+    """
+
+    def __init__(self, upload_folder):
+        partial_folder = os.path.join(upload_folder, PARTIAL_DIR)
+        os.makedirs(partial_folder, exist_ok=True)
+        self.path = os.path.join(partial_folder, uuid.uuid4().hex)
+        self._file = open(self.path, 'w+b')
+        self._sha256 = hashlib.sha256()
+        self.size = 0
+        self.head = b''
+        self.committed = False
+        # Temps passé dans les écritures disque (métriques d'entrées/sorties)
+        self.io_seconds = 0.0
+
+    def write(self, data):
+        if len(self.head) < HEAD_SIZE:
+            self.head += bytes(data[:HEAD_SIZE - len(self.head)])
+        self._sha256.update(data)
+        self.size += len(data)
+        debut = time.perf_counter()
+        try:
+            return self._file.write(data)
+        finally:
+            self.io_seconds += time.perf_counter() - debut
+
+    @property
+    def sha256(self):
+        return self._sha256.hexdigest()
+
+    def commit(self, destination):
+        """Rendre le fichier durable et le placer à son emplacement final"""
+        debut = time.perf_counter()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self.path, destination)
+        self.io_seconds += time.perf_counter() - debut
+        self.path = destination
+        self.committed = True
+
+    def close(self):
+        # Fichier jamais validé (requête rejetée ou en erreur): on le supprime
+        if not self._file.closed:
+            self._file.close()
+        if not self.committed:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def __getattr__(self, name):
+        # read, seek, tell, readline... délégués au fichier sous-jacent
+        return getattr(self._file, name)
+
+
+class UploadRequest(Request):
+    """Requête dont les fichiers multipart sont reçus via StreamingUpload"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return StreamingUpload(current_app.config['UPLOAD_FOLDER'])
@@ -0,0 +1,73 @@
+from xml.sax.saxutils import escape
+
+from zip_stream import stream_zip
+
+# Classeur XLSX minimal (une feuille, chaînes inline) écrit ligne par ligne:
+# aucune dépendance et une mémoire constante quel que soit le nombre de lignes.
+
+_CONTENT_TYPES = b"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+</Types>"""
+
+_RELS = b"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+
+_WORKBOOK_RELS = b"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+</Relationships>"""
+
+_WORKBOOK = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>
+</workbook>"""
+
+_SHEET_HEADER = b"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>"""
+
+_SHEET_FOOTER = b"</sheetData></worksheet>"
+
+# Caractères de contrôle interdits en XML 1.0 (hors tabulation et retours à la ligne)
+_INVALID_XML = dict.fromkeys(c for c in range(32) if c not in (9, 10, 13))
+
+
+def _cell(value):
+    if value is None or value == '':
+        return '<c/>'
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c><v>{value}</v></c>'
+    text = escape(str(value).translate(_INVALID_XML))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _sheet(rows, flush_every):
+    yield _SHEET_HEADER
+    buffer = []
+    for row in rows:
+        buffer.append('<row>' + ''.join(_cell(value) for value in row) + '</row>')
+        if len(buffer) >= flush_every:
+            yield ''.join(buffer).encode('utf-8')
+            buffer = []
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+    yield _SHEET_FOOTER
+
+
+def stream_xlsx(rows, sheet_name='Feuille1', flush_every=100):
+    """Générer un fichier XLSX par morceaux à partir d'un itérable de lignes"""
+    entries = [
+        ('[Content_Types].xml', _CONTENT_TYPES),
+        ('_rels/.rels', _RELS),
+        ('xl/workbook.xml', _WORKBOOK.format(name=escape(sheet_name, {'"': '&quot;'})).encode('utf-8')),
+        ('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS),
+        ('xl/worksheets/sheet1.xml', _sheet(rows, flush_every)),
+    ]
+    return stream_zip(entries)
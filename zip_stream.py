@@ -0,0 +1,168 @@
+import os
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Formats déjà compressés: les dégonfler coûte du CPU pour un gain nul
+STORED_EXTENSIONS = {
+    'pdf', 'docx', 'xlsx', 'pptx', 'zip',
+    'jpg', 'jpeg', 'png', 'gif', 'webp'
+}
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _StreamBuffer:
+    """Tampon d'écriture non positionnable vidé à chaque morceau produit"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def compress_type_for(filename):
+    """Choisir la méthode de compression d'après l'extension"""
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    return zipfile.ZIP_STORED if extension in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+
+def iter_file_chunks(path, chunk_size=CHUNK_SIZE):
+    """Lire un fichier morceau par morceau"""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def stream_zip(entries, chunk_size=CHUNK_SIZE):
+    """Générer une archive ZIP par morceaux, sans jamais la garder en mémoire.
+
+    `entries` produit des tuples (nom_dans_archive, source) où source est soit
+    un contenu en bytes, soit un chemin de fichier, soit un fichier préchargé
+    par `prefetch_entries`, soit un itérable de bytes généré à la volée.
+    """
+    buffer = _StreamBuffer()
+
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        for arcname, source in entries:
+            if isinstance(source, bytes):
+                zinfo = zipfile.ZipInfo(arcname, time.localtime()[:6])
+                zinfo.compress_type = zipfile.ZIP_DEFLATED
+                chunks = (source,)
+            else:
+                if isinstance(source, PrefetchedFile):
+                    zinfo = zipfile.ZipInfo.from_file(source.path, arcname)
+                    chunks = source
+                elif isinstance(source, (str, os.PathLike)):
+                    zinfo = zipfile.ZipInfo.from_file(source, arcname)
+                    chunks = iter_file_chunks(source, chunk_size)
+                else:
+                    # Contenu généré à la volée (taille inconnue à l'avance)
+                    zinfo = zipfile.ZipInfo(arcname, time.localtime()[:6])
+                    chunks = source
+                zinfo.compress_type = compress_type_for(arcname)
+
+            with zf.open(zinfo, 'w') as dest:
+                for chunk in chunks:
+                    dest.write(chunk)
+                    data = buffer.drain()
+                    if data:
+                        yield data
+
+            data = buffer.drain()
+            if data:
+                yield data
+
+    # Répertoire central
+    data = buffer.drain()
+    if data:
+        yield data
+
+
+class PrefetchedFile:
+    """Fichier ouvert et dont le début a déjà été lu par un thread de préchargement"""
+
+    def __init__(self, path, chunk_size=CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._file = open(path, 'rb')
+        try:
+            # Demander au noyau de lire la suite en arrière-plan
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(self._file.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            self._head = self._file.read(chunk_size)
+        except Exception:
+            self._file.close()
+            raise
+
+    def __iter__(self):
+        try:
+            chunk = self._head
+            self._head = None
+            while chunk:
+                yield chunk
+                chunk = self._file.read(self.chunk_size)
+        finally:
+            self.close()
+
+    def close(self):
+        self._file.close()
+
+
+def prefetch_entries(entries, workers=4, window=8, chunk_size=CHUNK_SIZE):
+    """Précharger en parallèle les fichiers des prochaines entrées.
+
+    Au plus `window` fichiers sont ouverts d'avance, chacun avec un seul
+    morceau en mémoire: la consommation reste bornée quel que soit le nombre
+    d'entrées.
+    """
+    pending = deque()
+    entries = iter(entries)
+
+    def _fill(executor):
+        while len(pending) < window:
+            try:
+                arcname, source = next(entries)
+            except StopIteration:
+                return
+            if isinstance(source, bytes):
+                pending.append((arcname, source))
+            else:
+                pending.append((arcname, executor.submit(PrefetchedFile, source, chunk_size)))
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='zip-prefetch')
+    try:
+        _fill(executor)
+        while pending:
+            arcname, source = pending.popleft()
+            if not isinstance(source, bytes):
+                try:
+                    source = source.result()
+                except OSError:
+                    # Fichier disparu entre la sélection et la lecture
+                    _fill(executor)
+                    continue
+            _fill(executor)
+            yield arcname, source
+    finally:
+        # Archive interrompue: fermer les fichiers déjà ouverts
+        for _, source in pending:
+            if not isinstance(source, bytes):
+                source.cancel()
+                if source.done() and not source.cancelled() and source.exception() is None:
+                    source.result().close()
+        executor.shutdown(wait=False)